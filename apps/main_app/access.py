@@ -0,0 +1,90 @@
+import hmac
+import ipaddress
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.http import HttpResponseForbidden, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# API TOKENLARI (mashina mijozlari uchun, cookie/sessiyasiz)
+# ============================================================================
+# Token "Authorization: Bearer <token>" sarlavhasida yuboriladi. Sessiya
+# ishlatilmaydi - shu sabab bunday view'lar CSRF'siz xavfsiz bo'ladi.
+
+def bearer_token(request):
+    """Authorization sarlavhasidagi token (bo'lmasa None)"""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token.strip():
+        return None
+    return token.strip()
+
+
+def token_allowed(request, tokens):
+    """So'rov tokeni ruxsat etilganlar orasidami (vaqt bo'yicha sizib chiqmasdan)"""
+    token = bearer_token(request)
+    if token is None:
+        return False
+    return any(hmac.compare_digest(token.encode(), allowed.encode()) for allowed in tokens)
+
+
+def require_api_token(setting_name):
+    """
+    View faqat ``settings.<setting_name>`` ro'yxatidagi token bilan ochiladi.
+
+    Ro'yxat bo'sh bo'lsa endpoint o'chirilgan (404). Tekshiruv so'rov tanasi
+    o'qilishidan oldin - token'siz so'rov fayllari diskka yozilmaydi.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            tokens = getattr(settings, setting_name)
+            if not tokens:
+                return JsonResponse({'success': False, 'error': "Endpoint o'chirilgan"}, status=404)
+            if not token_allowed(request, tokens):
+                logger.warning("⚠️ Noto'g'ri API token: %s", request.path)
+                response = JsonResponse({'success': False, 'error': "API token noto'g'ri"}, status=401)
+                response['WWW-Authenticate'] = 'Bearer'
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# MONITORING ENDPOINTLARI (metrikalar, model holati)
+# ============================================================================
+# Ochiq emas: staff sessiyasi, MONITORING_TOKENS dagi Bearer token (masalan,
+# Prometheus scrape_config'dagi authorization) yoki MONITORING_ALLOWED_IPS
+# dagi manzil/tarmoq. IP REMOTE_ADDR bo'yicha tekshiriladi: reverse proksi
+# (nginx) ortida barcha so'rovlar proksi manzilidan keladi - bu holda proksi
+# manzilini ro'yxatga qo'shmang, token ishlating.
+
+def ip_allowed(request, networks):
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in networks)
+
+
+def monitoring_allowed(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    if settings.MONITORING_TOKENS and token_allowed(request, settings.MONITORING_TOKENS):
+        return True
+    return bool(settings.MONITORING_ALLOWED_IPS) and ip_allowed(request, settings.MONITORING_ALLOWED_IPS)
+
+
+def monitoring_access(view):
+    """Staff, monitoring tokeni yoki ruxsat etilgan IP bo'lmasa 403"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not monitoring_allowed(request):
+            return HttpResponseForbidden()
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -1,8 +1,56 @@
+import string
+import uuid
+
 from django.contrib import admin
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
-from .models import ThyroidDiagnosis
+from .models import DailyStat, DriftSketch, ThyroidDiagnosis
+from .paginators import EstimatedCountPaginator
+from .registry import candidate_registry, registry
+from . import drift, listing, stats
+
+
+# ============================================================================
+# FILTRLAR (katta jadvalda SELECT DISTINCT'siz - qiymatlar oldindan ma'lum)
+# ============================================================================
+class RiskLevelFilter(admin.SimpleListFilter):
+    title = _('Xavf darajasi')
+    parameter_name = 'risk_level'
+
+    def lookups(self, request, model_admin):
+        return [(level, level) for level in listing.RISK_LEVELS]
+
+    def queryset(self, request, queryset):
+        if self.value() in listing.RISK_LEVELS:
+            return queryset.filter(risk_level=self.value())
+        return queryset
+
+
+class ModelVersionFilter(admin.SimpleListFilter):
+    """Versiyalar DailyStat yig'indilaridan va yuklangan modellardan olinadi"""
+
+    title = _('Model versiyasi')
+    parameter_name = 'model_version'
+
+    def lookups(self, request, model_admin):
+        versions = set(
+            DailyStat.objects.filter(dimension='model_version')
+            .order_by().values_list('value', flat=True).distinct()
+        )
+        versions.update(
+            model_registry.version for model_registry in (registry, candidate_registry)
+            if model_registry is not None and model_registry.is_loaded
+        )
+        versions.discard(None)
+        versions.discard('')
+        return [(version, version) for version in sorted(versions, reverse=True)]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(model_version=self.value())
+        return queryset
 
 
 @admin.register(ThyroidDiagnosis)
@@ -26,17 +74,38 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
         'gender',
         'is_downloaded',
         'created_at',
-        'risk_level',
+        RiskLevelFilter,
         'country',
-        'ethnicity'
+        'ethnicity',
+        ModelVersionFilter
     ]
 
+    # uuid bo'yicha qidiruv get_search_results da (PK indeksi orqali)
     search_fields = [
-        'uuid',
         'diagnosis',
         'notes'
     ]
 
+    # Katta jadvalda har sahifada COUNT(*) qilmaslik
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    # Ro'yxat uchun kerakli ustunlar (notes, recommendations va h.k. yuklanmaydi)
+    list_columns = [
+        'uuid',
+        'age',
+        'gender',
+        'ethnicity',
+        'thyroid_image',
+        'diagnosis',
+        'diagnosis_class',
+        'confidence',
+        'risk_level',
+        'is_downloaded',
+        'download_count',
+        'created_at'
+    ]
+
     readonly_fields = [
         'uuid',
         'created_at',
@@ -44,6 +113,13 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
         'image_display',
         'download_count',
         'last_downloaded_at',
+        'derived_at',
+        'model_version',
+        'shadow_model_version',
+        'shadow_prediction_value',
+        'report_file',
+        'report_hash',
+        'report_fingerprint',
         'detailed_info'
     ]
 
@@ -52,7 +128,7 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
             'fields': ('uuid', 'created_at', 'updated_at')
         }),
         (_('Rasm'), {
-            'fields': ('thyroid_image', 'image_display')
+            'fields': ('thyroid_image', 'image_display', 'derived_at')
         }),
         (_('Shaxsiy Malumotlar'), {
             'fields': ('age', 'gender', 'country', 'ethnicity')
@@ -82,12 +158,21 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
                 'risk_level',
                 'diagnosis_class',
                 'prediction_value',
+                'model_version',
                 'recommendations'
             )
         }),
+        (_('Nomzod Model'), {
+            'fields': ('shadow_model_version', 'shadow_prediction_value'),
+            'classes': ('collapse',)
+        }),
         (_('Yuklab Olish'), {
             'fields': ('is_downloaded', 'download_count', 'last_downloaded_at')
         }),
+        (_('Xulosa Fayli'), {
+            'fields': ('report_file', 'report_hash', 'report_fingerprint'),
+            'classes': ('collapse',)
+        }),
         (_('Batafsil Malumot'), {
             'fields': ('detailed_info',),
             'classes': ('collapse',)
@@ -113,22 +198,23 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
     patient_info.short_description = _('Bemor')
 
     def image_preview(self, obj):
-        """Rasm ko'rinishi"""
+        """Rasm ko'rinishi (thumbnail)"""
         if obj.thyroid_image:
             return format_html(
-                '<img src="{}" width="50" height="50" style="border-radius: 8px; object-fit: cover;" />',
-                obj.thyroid_image.url
+                '<img src="{}" width="50" height="50" loading="lazy" style="border-radius: 8px; object-fit: cover;" />',
+                reverse('diagnosis_image', kwargs={'uuid': obj.uuid, 'rendition': 'thumb'})
             )
         return '-'
 
     image_preview.short_description = _('Rasm')
 
     def image_display(self, obj):
-        """Katta rasm ko'rinishi"""
+        """Katta rasm ko'rinishi (web nusxa, asl faylga havola)"""
         if obj.thyroid_image:
             return format_html(
-                '<img src="{}" style="max-width: 400px; border-radius: 12px;" />',
-                obj.thyroid_image.url
+                '<a href="{}" target="_blank"><img src="{}" style="max-width: 400px; border-radius: 12px;" /></a>',
+                obj.thyroid_image.url,
+                reverse('diagnosis_image', kwargs={'uuid': obj.uuid, 'rendition': 'web'})
             )
         return '-'
 
@@ -265,11 +351,100 @@ class ThyroidDiagnosisAdmin(admin.ModelAdmin):
     detailed_info.short_description = _('Batafsil Malumot')
 
     def get_queryset(self, request):
-        """Optimizatsiya"""
+        """Ro'yxat sahifasida faqat ko'rsatiladigan ustunlar"""
         qs = super().get_queryset(request)
-        return qs.select_related()
+        match = request.resolver_match
+        if match and match.url_name and match.url_name.endswith('_changelist'):
+            qs = qs.only(*self.list_columns)
+        return qs
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        To'liq UUID - faqat PK indeksi bo'yicha. UUID boshiga o'xshagan so'z
+        (8+ hex belgi, masalan "deadbeef") - UUID diapazoni YOKI matn qidiruvi.
+        """
+        term = search_term.strip().replace('-', '').lower()
+        if not (8 <= len(term) <= 32 and all(char in string.hexdigits for char in term)):
+            return super().get_search_results(request, queryset, search_term)
+
+        if len(term) == 32:
+            return queryset.filter(uuid=uuid.UUID(term)), False
+
+        low = uuid.UUID(term.ljust(32, '0'))
+        high = uuid.UUID(term.ljust(32, 'f'))
+        text_results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        return queryset.filter(uuid__range=(low, high)) | text_results, may_have_duplicates
 
     class Media:
         css = {
             'all': ('admin/css/custom_admin.css',)
-        }
\ No newline at end of file
+        }
+
+
+@admin.register(DailyStat)
+class DailyStatAdmin(admin.ModelAdmin):
+    """Statistika dashboardi: faqat DailyStat yig'indilaridan o'qiladi"""
+
+    change_list_template = 'admin/daily_stats.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        days = stats.parse_days(request.GET.get('days'))
+        summary = stats.dashboard(days)
+        titles = dict(DailyStat.DIMENSION_CHOICES)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': _('Kunlik Statistika'),
+            'summary': summary,
+            'sections': [
+                {'dimension': dimension, 'title': titles[dimension], 'rows': rows}
+                for dimension, rows in summary['breakdown'].items()
+            ],
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, self.change_list_template, context)
+
+
+@admin.register(DriftSketch)
+class DriftSketchAdmin(admin.ModelAdmin):
+    """Drift hisoboti: kunlik gistogrammalar mos yozuv bilan solishtiriladi"""
+
+    change_list_template = 'admin/drift_report.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        report = drift.drift_report(
+            days=stats.parse_days(request.GET.get('days')),
+            model_version=request.GET.get('model_version')
+        )
+        versions = DriftSketch.objects.filter(day__isnull=False).values_list(
+            'model_version', flat=True
+        ).distinct().order_by('model_version')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': _('Drift Monitoringi'),
+            'report': report,
+            'versions': versions,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, self.change_list_template, context)
@@ -4,4 +4,28 @@ from django.apps import AppConfig
 class MainAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.main_app'
-    verbose_name = 'Asosiy'
\ No newline at end of file
+    verbose_name = 'Asosiy'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_delete, post_save
+
+        from . import page_cache, stats
+        from .models import ThyroidDiagnosis
+
+        post_save.connect(page_cache.invalidate_on_save, sender=ThyroidDiagnosis)
+        post_delete.connect(page_cache.invalidate_on_save, sender=ThyroidDiagnosis)
+        post_save.connect(stats.mark_dirty_on_save, sender=ThyroidDiagnosis)
+        post_delete.connect(stats.mark_dirty_on_save, sender=ThyroidDiagnosis)
+
+        if settings.INFERENCE_WARMUP:
+            from .registry import candidate_registry, registry
+            registry.warm_up()
+            if candidate_registry is not None:
+                candidate_registry.warm_up()
+
+        if settings.MODEL_RELOAD_WATCH:
+            from django.core.signals import request_started
+
+            from .reloading import start_on_request
+            request_started.connect(start_on_request, dispatch_uid='model_watcher')
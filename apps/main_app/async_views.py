@@ -0,0 +1,141 @@
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+
+from .executor import BoundedExecutor, ExecutorBusy
+from .metrics import metrics
+from .models import ThyroidDiagnosis
+from .registry import registry
+from . import jobs, page_cache
+from .views import (
+    create_pending_diagnosis,
+    download_response,
+    image_error_response,
+    infer,
+    model_unavailable_response,
+    record_outcome,
+    validate_diagnosis_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# ASGI (ASYNC) VIEWS
+# ============================================================================
+# uvicorn/daphne ostida event loop bloklanmasligi uchun: ORM - async API
+# orqali, OpenCV va model.predict - cheklangan thread pool'da. Pool to'lsa
+# so'rov 503 + Retry-After bilan rad etiladi.
+
+inference_executor = BoundedExecutor(
+    max_workers=settings.INFERENCE_EXECUTOR_WORKERS,
+    max_queue=settings.INFERENCE_EXECUTOR_QUEUE
+)
+
+metrics.register_collector(lambda: [
+    ('thyroid_inference_executor_in_flight', 'gauge', {}, inference_executor.in_flight),
+])
+
+
+def busy_response():
+    response = JsonResponse({
+        'success': False,
+        'error': 'Server band. Birozdan keyin qayta urinib ko\'ring.'
+    }, status=503)
+    response['Retry-After'] = str(settings.INFERENCE_RETRY_AFTER)
+    return response
+
+
+async def diagnose_thyroid(request):
+    """Tashxis qo'yish va saqlash (async)"""
+    if request.method != 'POST':
+        return render(request, 'home.html')
+
+    started = time.perf_counter()
+    response = await _diagnose_thyroid(request)
+    metrics.observe('thyroid_stage_latency_seconds', time.perf_counter() - started, stage='request')
+
+    return record_outcome(response)
+
+
+async def _diagnose_thyroid(request):
+    try:
+        logger.info("🏥 Yangi tashxis so'rovi (async)")
+
+        # Multipart parse diskka yozishi mumkin - loop'dan tashqarida
+        await sync_to_async(lambda: request.FILES, thread_sensitive=False)()
+
+        # Arzon tekshiruvlar birinchi (faqat sarlavhalar, xotiradagi fayl)
+        form, error = validate_diagnosis_request(request)
+        if error is not None:
+            return error
+
+        uploaded_file = form.cleaned_data['thyroid_image']
+        patient = form.patient_data()
+        notes = form.cleaned_data['notes']
+
+        if not settings.DIAGNOSIS_ASYNC:
+            model = await inference_executor.run(registry.get_model)
+            if model is None:
+                return model_unavailable_response()
+
+        if settings.DIAGNOSIS_ASYNC:
+            diagnosis_record = await sync_to_async(create_pending_diagnosis)(uploaded_file, patient, notes)
+            return redirect('diagnosis_detail', uuid=diagnosis_record.uuid)
+
+        result = await inference_executor.run(infer, uploaded_file, patient)
+        if result is None:
+            return image_error_response()
+
+        with metrics.span('db_save'):
+            diagnosis_record = await ThyroidDiagnosis.objects.acreate(
+                thyroid_image=uploaded_file,
+                notes=notes,
+                **patient,
+                **result
+            )
+
+        logger.info(
+            "✅ Ma'lumotlar saqlandi: %s (%.4f)",
+            diagnosis_record.uuid, diagnosis_record.prediction_value
+        )
+        await sync_to_async(jobs.schedule_derivatives)(diagnosis_record)
+        await sync_to_async(jobs.schedule_report)(diagnosis_record)
+        await sync_to_async(jobs.schedule_shadow)(diagnosis_record)
+        await sync_to_async(page_cache.warm)(diagnosis_record)
+        return redirect('diagnosis_detail', uuid=diagnosis_record.uuid)
+
+    except ExecutorBusy:
+        logger.warning("⚠️ Inference navbati to'la - 503")
+        return busy_response()
+
+    except Exception as e:
+        logger.exception("❌ Xatolik: %s", e)
+
+        return JsonResponse({
+            'success': False,
+            'error': f'Xatolik: {str(e)}'
+        }, status=500)
+
+
+async def diagnosis_detail(request, uuid):
+    """Tashxis detali (async)"""
+    entry = await page_cache.aget_entry(uuid)
+    if entry is None:
+        diagnosis = await aget_object_or_404(ThyroidDiagnosis, uuid=uuid)
+        job = await sync_to_async(jobs.job_status)(diagnosis) if not diagnosis.diagnosis else None
+        entry = await sync_to_async(page_cache.render_entry)(diagnosis, job)
+
+    return page_cache.page_response(request, entry)
+
+
+async def download_diagnosis(request, uuid):
+    """Tashxisni yuklab olish (async)"""
+    diagnosis = await aget_object_or_404(ThyroidDiagnosis, uuid=uuid)
+
+    # Birinchi yuklab olishda render qilish mumkin - thread'da
+    return await sync_to_async(download_response)(request, diagnosis)
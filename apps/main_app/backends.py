@@ -0,0 +1,147 @@
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# INFERENCE BACKENDLARI
+# ============================================================================
+# Har bir backend bir xil interfeysga ega: predict(images, features) -> (N, 1)
+# massiv. Registry sozlamalarga qarab kerakli backendni yuklaydi.
+
+
+class KerasBackend:
+    """To'liq Keras modeli (.h5) orqali bashorat"""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        self.model = model
+
+    @classmethod
+    def load(cls, path):
+        import keras
+
+        try:
+            model = keras.models.load_model(path)
+            logger.info("✅ Model yuklandi: %s", path)
+        except ValueError as ve:
+            logger.warning("⚠️ Model arxitektura xatoligi: %s", ve)
+            logger.info("🔄 Custom loading orqali yuklashga harakat qilinmoqda...")
+            model = keras.models.load_model(path, compile=False)
+            model.compile(
+                optimizer='adam',
+                loss='binary_crossentropy',
+                metrics=['accuracy']
+            )
+            logger.info("✅ Model custom loading bilan yuklandi")
+
+        return cls(model)
+
+    def predict(self, images, features):
+        return self.model.predict([images, features], verbose=0)
+
+
+def _load_tflite_interpreter(path):
+    """Eng yengil mavjud TFLite runtime'ni tanlash"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+
+    return Interpreter(model_path=str(path))
+
+
+class TFLiteBackend:
+    """
+    Eksport qilingan .tflite artefakt orqali bashorat.
+
+    ``ai-edge-litert`` yoki ``tflite-runtime`` o'rnatilgan bo'lsa, worker
+    TensorFlow/Keras'ni umuman import qilmaydi. Kvantlangan (int8) kirishlar
+    avtomatik ravishda kvantlanadi va chiqish dekvantlanadi.
+    """
+
+    name = 'tflite'
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self._lock = threading.Lock()
+        self._batch_size = None
+
+        inputs = interpreter.get_input_details()
+        # Kirishlar tartibi kafolatlanmagan - rank bo'yicha aniqlaymiz
+        self.image_input = next(d for d in inputs if len(d['shape']) == 4)
+        self.features_input = next(d for d in inputs if len(d['shape']) == 2)
+        self.output = interpreter.get_output_details()[0]
+
+    @classmethod
+    def load(cls, path):
+        backend = cls(_load_tflite_interpreter(path))
+        logger.info("✅ TFLite model yuklandi: %s", path)
+        return backend
+
+    def _resize(self, batch_size):
+        """Batch o'lchami o'zgarganda tensorlarni qayta ajratish"""
+        if batch_size == self._batch_size:
+            return
+
+        interpreter = self.interpreter
+        interpreter.resize_tensor_input(
+            self.image_input['index'], [batch_size, *self.image_input['shape'][1:]]
+        )
+        interpreter.resize_tensor_input(
+            self.features_input['index'], [batch_size, *self.features_input['shape'][1:]]
+        )
+        interpreter.allocate_tensors()
+        self._batch_size = batch_size
+
+    @staticmethod
+    def _quantize(detail, values):
+        dtype = detail['dtype']
+        scale, zero_point = detail['quantization']
+        if scale and np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            values = np.round(values / scale + zero_point)
+            return np.clip(values, info.min, info.max).astype(dtype)
+        return values.astype(dtype)
+
+    def predict(self, images, features):
+        with self._lock:
+            self._resize(images.shape[0])
+            interpreter = self.interpreter
+
+            interpreter.set_tensor(
+                self.image_input['index'], self._quantize(self.image_input, images)
+            )
+            interpreter.set_tensor(
+                self.features_input['index'], self._quantize(self.features_input, features)
+            )
+            interpreter.invoke()
+
+            output = interpreter.get_tensor(self.output['index'])
+            scale, zero_point = self.output['quantization']
+            if scale and np.issubdtype(output.dtype, np.integer):
+                output = (output.astype(np.float32) - zero_point) * scale
+
+            return np.array(output, dtype=np.float32)
+
+
+BACKENDS = {
+    KerasBackend.name: KerasBackend,
+    TFLiteBackend.name: TFLiteBackend,
+}
+
+
+def get_backend_class(name):
+    """Nomi bo'yicha backend klassi"""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Noma'lum inference backend: {name} ({', '.join(BACKENDS)})")
@@ -0,0 +1,196 @@
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+import numpy as np
+
+
+# ============================================================================
+# QAYTA ISHLATILADIGAN BATCH BUFERLARI
+# ============================================================================
+class BatchBuffers:
+    """
+    Batch tensorlarini yig'ish uchun oldindan ajratilgan massivlar.
+
+    Har bir oqim o'z buferlariga ega (mikro-batcher oqimi, qayta baholash),
+    shuning uchun har bir batch uchun yangi (N, 128, 128, 3) massiv
+    ajratilmaydi. Qaytarilgan massiv keyingi chaqiruvgacha amal qiladi.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(1, int(capacity))
+        self._local = threading.local()
+
+    def _buffer(self, name, size, shape, dtype):
+        buffers = self._local.__dict__.setdefault('buffers', {})
+        buffer = buffers.get(name)
+        if buffer is None or buffer.shape[0] < size or buffer.shape[1:] != shape or buffer.dtype != dtype:
+            buffer = np.empty((max(size, self.capacity), *shape), dtype=dtype)
+            buffers[name] = buffer
+        return buffer
+
+    def concatenate(self, name, arrays):
+        """Massivlarni birinchi o'q bo'yicha bufer ichiga birlashtirish"""
+        if len(arrays) == 1:
+            return arrays[0]
+
+        first = arrays[0]
+        size = sum(array.shape[0] for array in arrays)
+        buffer = self._buffer(name, size, first.shape[1:], first.dtype)
+        return np.concatenate(arrays, axis=0, out=buffer[:size])
+
+
+# ============================================================================
+# DINAMIK MIKRO-BATCHING
+# ============================================================================
+# Jarayondagi barcha batcher'lar (fork'dan keyin holatini tiklash uchun)
+_batchers = weakref.WeakSet()
+
+
+class MicroBatcher:
+    """
+    Parallel tashxis so'rovlarini bitta model chaqiruviga yig'uvchi dvigatel.
+
+    Har bir so'rov (rasm, features) juftligini navbatga qo'yadi va natijani
+    kutadi. Fon oqimi navbatdan ``max_batch_size`` tagacha elementni yig'adi
+    (birinchi elementdan keyin ko'pi bilan ``max_wait_ms`` kutadi), ularni
+    bitta batchga birlashtirib ``predict_fn`` ni bir marta chaqiradi va har
+    bir natijani o'z so'roviga qaytaradi.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=16, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._closed = False
+        self._buffers = BatchBuffers(self.max_batch_size)
+        _batchers.add(self)
+
+    def _ensure_worker(self):
+        """Fon oqimini ishga tushirish (fork'dan keyin qayta yaratiladi, self._lock ostida)"""
+        pid = os.getpid()
+        if self._worker is None or self._pid != pid or not self._worker.is_alive():
+            self._queue = queue.Queue()
+            self._pid = pid
+            self._worker = threading.Thread(
+                target=self._run,
+                args=(self._queue,),
+                name='thyroid-micro-batcher',
+                daemon=True
+            )
+            self._worker.start()
+
+    @property
+    def queue_depth(self):
+        """Navbatda kutayotgan so'rovlar soni"""
+        if self._queue is None or self._pid != os.getpid():
+            return 0
+        return self._queue.qsize()
+
+    def submit(self, image, features):
+        """So'rovni navbatga qo'yish va Future qaytarish"""
+        future = Future()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._ensure_worker()
+                self._queue.put((image, features, future))
+
+        if closed:
+            # Yopilgan batcher (almashtirilgan model) - to'g'ridan-to'g'ri hisoblash
+            try:
+                future.set_result(np.asarray(self.predict_fn(image, features)))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+
+    def close(self):
+        """
+        Yangi so'rovlarni qabul qilishni to'xtatish.
+
+        Navbatdagi so'rovlar oxirigacha bajariladi, keyin fon oqimi tugaydi
+        va ``predict_fn`` (model) xotiradan bo'shatilishi mumkin bo'ladi.
+        """
+        with self._lock:
+            self._closed = True
+            if self._worker is not None and self._pid == os.getpid() and self._worker.is_alive():
+                self._queue.put(None)
+
+    def predict(self, image, features, timeout=None):
+        """Bitta namuna uchun bashorat (batch ichida hisoblanadi)"""
+        return self.submit(image, features).result(timeout=timeout)
+
+    def _collect(self, work_queue):
+        """Navbatdan bitta batch yig'ish: (batch, yopilganmi)"""
+        item = work_queue.get()
+        if item is None:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = work_queue.get(timeout=remaining)
+                else:
+                    item = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _run(self, work_queue):
+        """Fon oqimi: batch yig'ish -> bitta forward pass -> natijalarni tarqatish"""
+        while True:
+            batch, closed = self._collect(work_queue)
+            if batch:
+                self._process(batch)
+            if closed:
+                return
+
+    def _after_fork(self):
+        """Fork'dan keyin: ota jarayonning lock'i, navbati va oqimi bolaga o'tmaydi"""
+        self._lock = threading.Lock()
+        self._queue = None
+        self._worker = None
+        self._pid = None
+
+    def _process(self, batch):
+        futures = [item[2] for item in batch]
+
+        try:
+            images = self._buffers.concatenate('images', [item[0] for item in batch])
+            features = self._buffers.concatenate('features', [item[1] for item in batch])
+            predictions = np.asarray(self.predict_fn(images, features))
+
+            offset = 0
+            for image, _, future in batch:
+                size = image.shape[0]
+                future.set_result(predictions[offset:offset + size])
+                offset += size
+
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def _after_fork_in_child():
+    for batcher in list(_batchers):
+        batcher._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django import forms
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .forms import PatientForm, validate_image_header
+from .preprocessing import preprocess_image
+
+
+# ============================================================================
+# KO'P BEMORLI (BULK) SO'ROV
+# ============================================================================
+# Bitta so'rovda ko'p bemor ("Authorization: Bearer <token>" bilan,
+# BULK_API_TOKENS):
+#   images   - bir nechta rasm fayli, yoki
+#   archive  - rasmlar ZIP arxivi
+#   patients - CSV yoki JSON (maydon yoki fayl): har bir qator bemor
+#              ma'lumotlari; "image" ustuni rasm nomini ko'rsatadi, bo'lmasa
+#              qatorlar rasmlarga tartib bo'yicha mos keladi
+# Barcha qatorlar avval tekshiriladi; bitta xato bo'lsa ham hech narsa
+# saqlanmaydi (javobda qator bo'yicha xatolar).
+
+class BulkError(Exception):
+    """So'rov tuzilishi noto'g'ri (qatorlar yoki rasmlar o'qilmadi)"""
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Rasmlarni parallel qayta ishlash pool'i (fork'dan keyin qayta yaratiladi)"""
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BULK_PREPROCESS_WORKERS,
+                    thread_name_prefix='bulk-preprocess'
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def _normalize(row):
+    """JSON qiymatlarini forma ko'rinishiga: true/false -> 'Ha'/"Yo'q" """
+    return {
+        key: ('Ha' if value else "Yo'q") if isinstance(value, bool) else value
+        for key, value in row.items()
+    }
+
+
+def read_rows(request):
+    """Bemor qatorlari (CSV yoki JSON; maydon yoki fayl)"""
+    upload = request.FILES.get('patients')
+    if upload is not None:
+        text = upload.read().decode('utf-8-sig')
+    else:
+        text = request.POST.get('patients', '')
+
+    text = text.strip()
+    if not text:
+        raise BulkError("Bemorlar ro'yxati (patients) bo'sh")
+
+    if text[0] in '[{':
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise BulkError(f"patients JSON o'qilmadi: {e}")
+        if isinstance(rows, dict):
+            rows = rows.get('patients', [])
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise BulkError("patients - obyektlar ro'yxati bo'lishi kerak")
+    else:
+        rows = list(csv.DictReader(io.StringIO(text)))
+
+    if not rows:
+        raise BulkError("Bemorlar ro'yxati (patients) bo'sh")
+    if len(rows) > settings.BULK_DIAGNOSIS_MAX_ROWS:
+        raise BulkError(f"Bir so'rovda ko'pi bilan {settings.BULK_DIAGNOSIS_MAX_ROWS} ta bemor")
+    return [_normalize(row) for row in rows]
+
+
+def read_images(request):
+    """Rasmlar: [(nom, fayl), ...] - yuklangan fayllar yoki ZIP arxiv ichidan"""
+    archive = request.FILES.get('archive')
+    if archive is None:
+        return [(upload.name, upload) for upload in request.FILES.getlist('images')]
+
+    images = []
+    try:
+        with zipfile.ZipFile(archive) as zf:
+            members = [info for info in zf.infolist() if not info.is_dir()]
+            if len(members) > settings.BULK_DIAGNOSIS_MAX_ROWS:
+                raise BulkError(f"Arxivda ko'pi bilan {settings.BULK_DIAGNOSIS_MAX_ROWS} ta rasm")
+            for info in members:
+                # Ochilgan hajm e'lon qilingandan oshmaydi (zipfile cheklaydi)
+                if info.file_size > settings.UPLOAD_MAX_SIZE:
+                    raise BulkError(f"{info.filename}: rasm juda katta")
+                name = os.path.basename(info.filename)
+                images.append((name, ContentFile(zf.read(info), name=name)))
+    except zipfile.BadZipFile as e:
+        raise BulkError(f"ZIP arxiv o'qilmadi: {e}")
+    return images
+
+
+def validate_rows(rows, images):
+    """
+    Qatorlarni tekshirish: (yozuvlar, xatolar).
+
+    Yozuv - (bemor, izoh, rasm fayli); xatolar - [{'row': i, 'errors': {...}}].
+    """
+    by_name = dict(images)
+    by_image_column = any(row.get('image') for row in rows)
+    if not by_image_column and len(rows) != len(images):
+        raise BulkError(f"Qatorlar soni ({len(rows)}) rasmlar soniga ({len(images)}) teng emas")
+
+    entries, errors, used = [], [], set()
+    for index, row in enumerate(rows):
+        row_errors = {}
+
+        form = PatientForm(row)
+        if not form.is_valid():
+            row_errors.update({field: [str(e) for e in messages] for field, messages in form.errors.items()})
+
+        image = by_name.get(row.get('image')) if by_image_column else images[index][1]
+        if image is None:
+            row_errors['image'] = [f"Rasm topilmadi: {row.get('image')}"]
+        elif id(image) in used:
+            row_errors['image'] = [f"Rasm bir necha qatorda: {row.get('image')}"]
+        else:
+            used.add(id(image))
+            try:
+                validate_image_header(image)
+            except forms.ValidationError as e:
+                row_errors['image'] = e.messages
+
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+        else:
+            entries.append((form.patient_data(), form.cleaned_data['notes'], image))
+
+    return entries, errors
+
+
+def preprocess_all(files):
+    """Rasmlarni parallel qayta ishlash (OpenCV GIL'ni bo'shatadi)"""
+    return list(get_executor().map(preprocess_image, files))
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+
+# ============================================================================
+# BASHORAT KESHI
+# ============================================================================
+class PredictionCache:
+    """
+    Takroriy so'rovlar uchun bashorat keshi.
+
+    Kalit - dekodlangan rasm tensori, aniq features vektori va model
+    versiyasining SHA-256 xeshi. Ikki qatlam: jarayon ichidagi cheklangan
+    LRU va (ixtiyoriy) Django cache backend - workerlar orasida umumiy.
+    """
+
+    def __init__(self, max_size=1024, backend_alias=None, timeout=None):
+        self.max_size = max_size
+        self.backend_alias = backend_alias
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        if not self.backend_alias:
+            return None
+        from django.core.cache import caches
+        return caches[self.backend_alias]
+
+    @staticmethod
+    def make_key(image, features, model_version):
+        digest = hashlib.sha256()
+        digest.update(str(model_version).encode())
+        for array in (image, features):
+            array = np.ascontiguousarray(array)
+            digest.update(str(array.dtype).encode())
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        return f'thyroid:prediction:{digest.hexdigest()}'
+
+    def get(self, key):
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                self.hits += 1
+                return self._local[key]
+
+        backend = self.backend
+        if backend is not None:
+            value = backend.get(key)
+            if value is not None:
+                self._store_local(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store_local(self, key, value):
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+
+    def set(self, key, value):
+        if self.max_size > 0:
+            self._store_local(key, value)
+
+        backend = self.backend
+        if backend is not None:
+            backend.set(key, value, self.timeout)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._local),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+prediction_cache = PredictionCache(
+    max_size=settings.PREDICTION_CACHE_SIZE,
+    backend_alias=settings.PREDICTION_CACHE_BACKEND,
+    timeout=settings.PREDICTION_CACHE_TIMEOUT
+)
@@ -0,0 +1,121 @@
+import io
+import logging
+import os
+
+import cv2
+import numpy as np
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .models import ThyroidDiagnosis
+from .preprocessing import MODEL_INPUT_SIZE, decode_image_bytes, resize_for_model
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# HOSILA RASMLAR (THUMBNAIL, WEB, MODEL KIRISHI)
+# ============================================================================
+# Yuklangan rasmdan bir marta (fon rejimida) kichik nusxalar va model kirishi
+# tensori yaratiladi. Ular asl rasm yonida deterministik nom bilan saqlanadi:
+#   thyroid_images/2025/01/31/abc.jpg -> thyroid_images/2025/01/31/abc.thumb96.jpg
+#                                     -> thyroid_images/2025/01/31/abc.web1024.jpg
+#                                     -> thyroid_images/2025/01/31/abc.input128.npy
+# O'lcham nom ichida bo'lgani uchun fayl mazmuni o'zgarmaydi - uzoq muddat
+# keshlanadi.
+
+RENDITIONS = {
+    'thumb': {'size': 96, 'crop': True, 'quality': 80},
+    'web': {'size': 1024, 'crop': False, 'quality': 85},
+}
+
+
+def derived_name(name, suffix, extension='jpg'):
+    """Asl fayl nomidan hosila fayl nomi"""
+    root, _ = os.path.splitext(name)
+    return f"{root}.{suffix}.{extension}"
+
+
+def rendition_name(image_name, rendition):
+    return derived_name(image_name, f"{rendition}{RENDITIONS[rendition]['size']}")
+
+
+def tensor_name(image_name):
+    return derived_name(image_name, f'input{MODEL_INPUT_SIZE}', 'npy')
+
+
+def render_rendition(img, size, crop, quality):
+    """BGR rasmdan JPEG: crop=True - markazdan kvadrat, aks holda proporsional"""
+    if crop:
+        height, width = img.shape[:2]
+        side = min(height, width)
+        top, left = (height - side) // 2, (width - side) // 2
+        img = cv2.resize(img[top:top + side, left:left + side], (size, size), interpolation=cv2.INTER_AREA)
+    else:
+        scale = size / max(img.shape[:2])
+        if scale < 1:
+            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    ok, encoded = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return encoded.tobytes() if ok else None
+
+
+def encode_tensor(img):
+    """Model kirishi (128x128 RGB uint8) - .npy baytlari"""
+    buffer = io.BytesIO()
+    np.save(buffer, resize_for_model(img), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _save(storage, name, content, force):
+    if storage.exists(name):
+        if not force:
+            return
+        storage.delete(name)
+    saved = storage.save(name, ContentFile(content))
+    if saved != name:
+        logger.warning("⚠️ Hosila fayl boshqa nom bilan saqlandi: %s", saved)
+
+
+def generate_derivatives(diagnosis, force=False):
+    """Barcha hosila fayllarni yaratish va derived_at ni belgilash"""
+    image = diagnosis.thyroid_image
+    with image.storage.open(image.name, 'rb') as f:
+        img = decode_image_bytes(f.read())
+    if img is None:
+        raise ValueError(f"Rasm o'qilmadi: {image.name}")
+
+    for rendition, spec in RENDITIONS.items():
+        content = render_rendition(img, **spec)
+        _save(image.storage, rendition_name(image.name, rendition), content, force)
+    _save(image.storage, tensor_name(image.name), encode_tensor(img), force)
+
+    diagnosis.derived_at = timezone.now()
+    ThyroidDiagnosis.objects.filter(pk=diagnosis.pk).update(derived_at=diagnosis.derived_at)
+    return diagnosis
+
+
+def generate_for(diagnosis_id):
+    """Fon worker uchun: yangi yuklangan rasm hosilalarini yaratish"""
+    diagnosis = ThyroidDiagnosis.objects.only('uuid', 'thyroid_image').filter(pk=diagnosis_id).first()
+    if diagnosis is None:
+        return None
+
+    try:
+        return generate_derivatives(diagnosis)
+    except Exception as e:
+        logger.exception("❌ Hosila rasmlar yaratilmadi (%s): %s", diagnosis_id, e)
+        return None
+
+
+def load_tensor(diagnosis):
+    """Saqlangan model kirishi (uint8); yo'q bo'lsa None"""
+    if not diagnosis.derived_at:
+        return None
+
+    image = diagnosis.thyroid_image
+    try:
+        with image.storage.open(tensor_name(image.name), 'rb') as f:
+            return np.load(io.BytesIO(f.read()), allow_pickle=False)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,135 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, DateTimeField, F, IntegerField, Value, When
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# BUFERLANGAN YUKLAB OLISH HISOBLAGICHI
+# ============================================================================
+# Ko'p yuklab olinadigan yozuvlar uchun har bir yuklab olish alohida UPDATE
+# (va PostgreSQL'da qator qulfi) bo'lmasligi uchun hisoblar jarayon xotirasida
+# yig'iladi va davriy ravishda bitta UPDATE bilan bazaga yoziladi.
+
+FLUSH_CHUNK_SIZE = 500
+
+
+class DownloadCounter:
+    """Yuklab olishlarni yig'ib, F() orqali guruhlab yozish"""
+
+    def __init__(self, flush_interval, max_pending):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def record(self, pk, when):
+        """Yuklab olishni buferga qo'shish (kerak bo'lsa flush)"""
+        with self._lock:
+            count, _ = self._pending.get(pk, (0, None))
+            self._pending[pk] = (count + 1, when)
+            due = len(self._pending) >= self.max_pending
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='download-counter', daemon=True
+                )
+                self._thread.start()
+
+        if due:
+            self.flush()
+
+    def _run(self):
+        """Yuklab olishlar to'xtab qolsa ham bufer intervalda yoziladi"""
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore(self, pending):
+        """Yozilmagan hisoblarni buferga qaytarish"""
+        with self._lock:
+            for pk, (count, when) in pending.items():
+                current, current_when = self._pending.get(pk, (0, None))
+                self._pending[pk] = (current + count, max(filter(None, [when, current_when])))
+
+    def flush(self):
+        """Buferdagi hisoblarni bazaga yozish; yozilgan yozuvlar sonini qaytaradi"""
+        from .models import ThyroidDiagnosis
+
+        pending = self._take()
+        if not pending:
+            return 0
+
+        pks = sorted(pending)
+        first_downloaded = set()
+        try:
+            with transaction.atomic():
+                for start in range(0, len(pks), FLUSH_CHUNK_SIZE):
+                    chunk = pks[start:start + FLUSH_CHUNK_SIZE]
+                    # Birinchi marta yuklab olinganlar kuni DailyStat'da qayta hisoblanadi
+                    first_downloaded.update(
+                        ThyroidDiagnosis.objects.filter(pk__in=chunk, is_downloaded=False)
+                        .values_list('created_at', flat=True)
+                    )
+                    ThyroidDiagnosis.objects.filter(pk__in=chunk).update(
+                        is_downloaded=True,
+                        download_count=F('download_count') + Case(
+                            *[When(pk=pk, then=Value(pending[pk][0])) for pk in chunk],
+                            output_field=IntegerField()
+                        ),
+                        last_downloaded_at=Case(
+                            *[When(pk=pk, then=Value(pending[pk][1])) for pk in chunk],
+                            output_field=DateTimeField()
+                        )
+                    )
+        except Exception as e:
+            logger.exception("❌ Yuklab olish hisoblarini yozishda xatolik: %s", e)
+            self._restore(pending)
+            return 0
+
+        if first_downloaded:
+            from . import stats
+            try:
+                stats.mark_days_dirty({timezone.localtime(created).date() for created in first_downloaded})
+            except Exception as e:
+                logger.exception("❌ Statistika kunlarini belgilashda xatolik: %s", e)
+
+        logger.debug("Yuklab olish hisoblari yozildi: %s ta yozuv", len(pks))
+        return len(pks)
+
+    def _after_fork(self):
+        # Ota jarayon hisoblari ota jarayonda yoziladi
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+
+download_counter = DownloadCounter(
+    flush_interval=settings.DOWNLOAD_COUNTER_FLUSH_INTERVAL,
+    max_pending=settings.DOWNLOAD_COUNTER_MAX_PENDING
+)
+
+atexit.register(download_counter.flush)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=download_counter._after_fork)
@@ -0,0 +1,344 @@
+import atexit
+import datetime
+import logging
+import math
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# DRIFT MONITORINGI: OQIMLI GISTOGRAMMALAR
+# ============================================================================
+# Har bir tashxisda laboratoriya belgilari (scaler bo'yicha z-fazoda) va
+# bashorat qiymati qat'iy bin'li gistogrammalarga qo'shiladi - O(1) vaqt,
+# o'zgarmas xotira. Gistogrammalar qo'shish orqali birlashadi: worker
+# buferi davriy ravishda kunlik DriftSketch qatoriga qo'shiladi, hisobot esa
+# oxirgi kunlar qatorlarini birlashtiradi (jadval skanerlanmaydi).
+#
+# Mos yozuv (reference): manage.py drift_reference bilan saqlangan taqsimot,
+# u bo'lmasa belgilar uchun scaler o'qitilgan taqsimot - z-fazoda N(0, 1).
+
+# Belgi -> features matritsasidagi ustun (services.build_feature_matrix tartibi)
+DRIFT_FEATURES = {
+    'tsh_level': 10,
+    't3_level': 11,
+    't4_level': 12,
+    'nodule_size': 13,
+}
+PREDICTION = 'prediction_value'
+
+# z-fazo: [-4, 4] oralig'ida 32 bin + ikki chetki (overflow) bin
+Z_RANGE = (-4.0, 4.0, 32)
+PREDICTION_RANGE = (0.0, 1.0, 20)
+
+# PSI hisoblashda bo'sh bin'lar uchun
+PSI_EPSILON = 1e-4
+
+
+class Sketch:
+    """Teng kenglikdagi bin'lar gistogrammasi (+ chetki bin'lar), birlashtiriladigan"""
+
+    def __init__(self, low, high, bins, counts=None, count=0, value_sum=0.0, value_sum_sq=0.0):
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.width = (high - low) / bins
+        self.counts = np.zeros(bins + 2, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        self.count = count
+        self.value_sum = value_sum
+        self.value_sum_sq = value_sum_sq
+
+    @classmethod
+    def for_feature(cls, feature, **state):
+        low, high, bins = PREDICTION_RANGE if feature == PREDICTION else Z_RANGE
+        return cls(low, high, bins, **state)
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def add(self, value):
+        """Bitta qiymat (O(1))"""
+        if value < self.low:
+            index = 0
+        elif value >= self.high:
+            index = self.bins + 1
+        else:
+            index = int((value - self.low) / self.width) + 1
+        self.counts[index] += 1
+        self.count += 1
+        self.value_sum += value
+        self.value_sum_sq += value * value
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.count += other.count
+        self.value_sum += other.value_sum
+        self.value_sum_sq += other.value_sum_sq
+        return self
+
+    def probabilities(self):
+        return self.counts / self.count if self.count else None
+
+    @property
+    def mean(self):
+        return self.value_sum / self.count if self.count else None
+
+    @property
+    def std(self):
+        if not self.count:
+            return None
+        variance = self.value_sum_sq / self.count - self.mean ** 2
+        return math.sqrt(max(variance, 0.0))
+
+
+def normal_probabilities(sketch):
+    """N(0, 1) taqsimotining sketch bin'laridagi ehtimolliklari"""
+    cdf = [0.5 * (1 + math.erf(edge / math.sqrt(2))) for edge in sketch.edges]
+    return np.diff([0.0, *cdf, 1.0])
+
+
+def psi(observed, expected):
+    """Population Stability Index"""
+    observed = np.clip(observed, PSI_EPSILON, None)
+    expected = np.clip(expected, PSI_EPSILON, None)
+    return float(np.sum((observed - expected) * np.log(observed / expected)))
+
+
+def ks_statistic(observed, expected):
+    """Kolmogorov-Smirnov D (bin chegaralarida - aniq qiymatning pastki bahosi)"""
+    return float(np.max(np.abs(np.cumsum(observed) - np.cumsum(expected))))
+
+
+def drift_status(value):
+    if value is None:
+        return None
+    if value >= settings.DRIFT_PSI_ALERT:
+        return 'drift'
+    if value >= settings.DRIFT_PSI_WARNING:
+        return 'warning'
+    return 'ok'
+
+
+# ============================================================================
+# WORKER BUFERI
+# ============================================================================
+class DriftMonitor:
+    """Tashxislarni xotiradagi gistogrammalarga yig'ib, davriy ravishda DB'ga qo'shish"""
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    def _sketch(self, key):
+        sketch = self._pending.get(key)
+        if sketch is None:
+            sketch = self._pending[key] = Sketch.for_feature(key[1])
+        return sketch
+
+    def record(self, features, pred_value, bundle):
+        """Bitta tashxis: features (1, 15) massivi, bashorat va uni bergan bundle"""
+        day = timezone.localdate()
+        version = bundle.version or ''
+        mean, scale = bundle.scaler_mean, bundle.scaler_scale
+        row = features[0]
+
+        with self._lock:
+            if mean is not None and scale is not None:
+                for feature, column in DRIFT_FEATURES.items():
+                    z = (float(row[column]) - float(mean[column])) / float(scale[column])
+                    self._sketch((day, feature, version)).add(z)
+            self._sketch((day, PREDICTION, version)).add(float(pred_value))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='drift-monitor', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore(self, pending):
+        with self._lock:
+            for key, sketch in pending.items():
+                current = self._pending.get(key)
+                self._pending[key] = sketch if current is None else sketch.merge(current)
+
+    def flush(self):
+        """Buferni kunlik qatorlarga qo'shish (qator qulfi ostida); qatorlar soni"""
+        from .models import DriftSketch
+
+        pending = self._take()
+        if not pending:
+            return 0
+
+        try:
+            with transaction.atomic():
+                # Bir xil tartib - workerlar orasida deadlock bo'lmaydi
+                for day, feature, version in sorted(pending):
+                    sketch = pending[(day, feature, version)]
+                    row, _ = DriftSketch.objects.select_for_update().get_or_create(
+                        day=day, feature=feature, model_version=version,
+                        defaults={'counts': [0] * len(sketch.counts)}
+                    )
+                    merged = load_sketch(row).merge(sketch)
+                    save_sketch(row, merged)
+        except Exception as e:
+            logger.exception("❌ Drift gistogrammalarini yozishda xatolik: %s", e)
+            self._restore(pending)
+            return 0
+
+        return len(pending)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+
+def load_sketch(row):
+    """DriftSketch qatoridan Sketch"""
+    return Sketch.for_feature(
+        row.feature,
+        counts=row.counts or None,
+        count=row.count,
+        value_sum=row.value_sum,
+        value_sum_sq=row.value_sum_sq,
+    )
+
+
+def save_sketch(row, sketch):
+    row.counts = sketch.counts.tolist()
+    row.count = sketch.count
+    row.value_sum = sketch.value_sum
+    row.value_sum_sq = sketch.value_sum_sq
+    row.save()
+
+
+drift_monitor = DriftMonitor(flush_interval=settings.DRIFT_FLUSH_INTERVAL)
+
+atexit.register(drift_monitor.flush)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=drift_monitor._after_fork)
+
+
+# ============================================================================
+# HISOBOT
+# ============================================================================
+def merged_sketches(queryset):
+    """Qatorlarni belgi bo'yicha birlashtirish: {belgi: Sketch}"""
+    sketches = {}
+    for row in queryset:
+        sketch = load_sketch(row)
+        if row.feature in sketches:
+            sketches[row.feature].merge(sketch)
+        else:
+            sketches[row.feature] = sketch
+    return sketches
+
+
+def latest_version():
+    """Oxirgi gistogrammalar yozilgan model versiyasi (model yuklanmagan jarayonlar uchun)"""
+    from .models import DriftSketch
+
+    return DriftSketch.objects.filter(day__isnull=False).order_by(
+        '-day', '-updated_at'
+    ).values_list('model_version', flat=True).first() or ''
+
+
+def _raw_moments(feature, sketch, bundle):
+    """z-fazodagi o'rtacha/og'ishni asl birliklarga qaytarish"""
+    if sketch.mean is None:
+        return None, None
+    if feature == PREDICTION:
+        return sketch.mean, sketch.std
+    if bundle is None or bundle.scaler_mean is None or bundle.scaler_scale is None:
+        return None, None
+    column = DRIFT_FEATURES[feature]
+    mean, scale = float(bundle.scaler_mean[column]), float(bundle.scaler_scale[column])
+    return sketch.mean * scale + mean, sketch.std * scale
+
+
+def drift_report(days=None, model_version=None):
+    """
+    Oxirgi ``days`` kun taqsimotining mos yozuvdan og'ishi (PSI, KS).
+
+    Standart bo'yicha joriy model versiyasi; faqat kunlik gistogrammalar
+    o'qiladi - O(kunlar x belgilar). Faqat o'qiydi: workerlar buferidagi
+    so'nggi DRIFT_FLUSH_INTERVAL soniya tashxislari hisobotga keyin qo'shiladi.
+    """
+    from .models import DriftSketch
+    from .registry import registry
+
+    days = days or settings.DRIFT_WINDOW_DAYS
+    bundle = registry.bundle if registry.is_loaded else None
+    if model_version is None:
+        model_version = (bundle.version or '') if bundle is not None else latest_version()
+    if bundle is not None and (bundle.version or '') != model_version:
+        bundle = None
+
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    queryset = DriftSketch.objects.filter(model_version=model_version)
+    current = merged_sketches(queryset.filter(day__gte=since))
+    references = merged_sketches(queryset.filter(day__isnull=True))
+
+    features = {}
+    for feature in [*DRIFT_FEATURES, PREDICTION]:
+        sketch = current.get(feature)
+        reference = references.get(feature)
+
+        expected, reference_name = None, None
+        if reference is not None and reference.count:
+            expected, reference_name = reference.probabilities(), 'captured'
+        elif feature != PREDICTION:
+            expected, reference_name = normal_probabilities(Sketch.for_feature(feature)), 'scaler'
+
+        observed = sketch.probabilities() if sketch is not None else None
+        psi_value = ks_value = None
+        if observed is not None and expected is not None and sketch.count >= settings.DRIFT_MIN_SAMPLES:
+            psi_value = psi(observed, expected)
+            ks_value = ks_statistic(observed, expected)
+
+        mean, std = _raw_moments(feature, sketch, bundle) if sketch is not None else (None, None)
+        features[feature] = {
+            'count': sketch.count if sketch is not None else 0,
+            'mean': mean,
+            'std': std,
+            'z_mean': sketch.mean if sketch is not None and feature != PREDICTION else None,
+            'reference': reference_name,
+            'psi': psi_value,
+            'ks': ks_value,
+            'status': drift_status(psi_value),
+        }
+
+    statuses = [item['status'] for item in features.values() if item['status']]
+    overall = 'drift' if 'drift' in statuses else 'warning' if 'warning' in statuses else (
+        'ok' if statuses else None
+    )
+    return {
+        'model_version': model_version,
+        'days': days,
+        'since': since,
+        'status': overall,
+        'features': features,
+    }
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============================================================================
+# CHEKLANGAN INFERENCE EXECUTOR
+# ============================================================================
+class ExecutorBusy(Exception):
+    """Navbat to'lgan - so'rovni keyinroq qayta yuborish kerak"""
+
+
+class BoundedExecutor:
+    """
+    CPU og'ir ishlar (OpenCV, predict) uchun cheklangan thread pool.
+
+    Bir vaqtda ko'pi bilan ``max_workers`` ta vazifa bajariladi va yana
+    ``max_queue`` tasi kutadi. Undan ortig'i darhol ``ExecutorBusy`` bilan
+    rad etiladi - event loop cheksiz navbat bilan to'lib qolmaydi.
+    """
+
+    def __init__(self, max_workers, max_queue):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._slots = None
+
+    def _ensure_pool(self):
+        pid = os.getpid()
+        if self._pool is not None and self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pool is None or self._pid != pid:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='thyroid-inference'
+                )
+                self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+                self._pid = pid
+
+    @property
+    def in_flight(self):
+        """Bajarilayotgan va kutayotgan vazifalar soni"""
+        if self._slots is None or self._pid != os.getpid():
+            return 0
+        return self.max_workers + self.max_queue - self._slots._value
+
+    async def run(self, func, *args, **kwargs):
+        """Funksiyani pool'da bajarish; joy bo'lmasa ExecutorBusy"""
+        self._ensure_pool()
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy()
+
+        try:
+            future = self._pool.submit(func, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+
+        # Joy vazifa haqiqatan tugaganda bo'shaydi (mijoz uzilib, coroutine
+        # bekor qilinsa ham thread ishlashda davom etadi)
+        slots = self._slots
+        future.add_done_callback(lambda _: slots.release())
+        return await asyncio.wrap_future(future)
@@ -0,0 +1,164 @@
+import csv
+import datetime
+import io
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# TASHXISLARNI EKSPORT QILISH (ANALITIKA UCHUN)
+# ============================================================================
+# Queryset .values_list().iterator() orqali EXPORT_CHUNK_SIZE qatorlik
+# bo'laklarda o'qiladi: PostgreSQL'da server tomonidagi (named) kursor,
+# SQLite'da fetchmany. Butun jadval hech qachon xotiraga yuklanmaydi -
+# millionlab qatorlar ham o'zgarmas xotirada eksport qilinadi.
+
+# Model monitoringi uchun ustunlar (rasm yo'li, izohlar va tavsiyalarsiz)
+EXPORT_FIELDS = [
+    'uuid', 'created_at',
+    'age', 'gender', 'country', 'ethnicity', 'family_history',
+    'radiation_exposure', 'iodine_deficiency', 'smoking', 'obesity',
+    'diabetes', 'tsh_level', 't3_level', 't4_level', 'nodule_size',
+    'diagnosis', 'diagnosis_class', 'risk_level', 'confidence',
+    'prediction_value', 'model_version',
+    'shadow_model_version', 'shadow_prediction_value',
+]
+
+EXPORT_FORMATS = ['csv', 'parquet', 'arrow']
+
+# CSV oqimi shu hajmdagi bo'laklar bilan yuboriladi (har qator uchun emas)
+CSV_FLUSH_SIZE = 64 * 1024
+
+
+def export_rows(queryset, chunk_size=None):
+    """Eksport qatorlari (kortejlar) - eskilaridan yangilariga, bo'laklab"""
+    return (
+        queryset.order_by('created_at', 'uuid')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+    )
+
+
+def _csv_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(rows):
+    """CSV matni bo'laklari (sarlavha + qatorlar); StreamingHttpResponse uchun"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= CSV_FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def write_csv(rows, path):
+    """CSV faylga yozish: yozilgan qatorlar soni"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            count += 1
+    return count
+
+
+# ============================================================================
+# USTUNLI FORMATLAR (PARQUET / ARROW IPC)
+# ============================================================================
+def get_pyarrow():
+    """pyarrow (o'rnatilmagan bo'lsa - None)"""
+    try:
+        import pyarrow
+    except ImportError as e:
+        logger.warning("⚠️ pyarrow mavjud emas, Parquet/Arrow eksport ishlamaydi: %s", e)
+        return None
+    return pyarrow
+
+
+def arrow_schema(pa):
+    """EXPORT_FIELDS tartibidagi Arrow sxemasi"""
+    types = {
+        'uuid': pa.string(),
+        'created_at': pa.timestamp('us', tz='UTC'),
+        'age': pa.int32(),
+        'gender': pa.string(),
+        'country': pa.int8(),
+        'ethnicity': pa.int8(),
+        'tsh_level': pa.float64(),
+        't3_level': pa.float64(),
+        't4_level': pa.float64(),
+        'nodule_size': pa.float64(),
+        'diagnosis': pa.string(),
+        'diagnosis_class': pa.string(),
+        'risk_level': pa.string(),
+        'confidence': pa.float64(),
+        'prediction_value': pa.float64(),
+        'model_version': pa.string(),
+        'shadow_model_version': pa.string(),
+        'shadow_prediction_value': pa.float64(),
+    }
+    return pa.schema([(field, types.get(field, pa.bool_())) for field in EXPORT_FIELDS])
+
+
+def _record_batches(pa, schema, rows, chunk_size):
+    """Qatorlarni chunk_size hajmli RecordBatch'larga yig'ish"""
+    uuid_index = EXPORT_FIELDS.index('uuid')
+    chunk = []
+
+    def make_batch():
+        columns = list(zip(*chunk))
+        columns[uuid_index] = [str(value) for value in columns[uuid_index]]
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield make_batch()
+            chunk = []
+    if chunk:
+        yield make_batch()
+
+
+def write_columnar(rows, path, file_format='parquet', chunk_size=None):
+    """
+    Parquet yoki Arrow IPC faylga bo'laklab yozish: yozilgan qatorlar soni.
+
+    Har bir bo'lak alohida RecordBatch (Parquet'da row group) - xotirada
+    bir vaqtda faqat bitta bo'lak turadi.
+    """
+    pa = get_pyarrow()
+    if pa is None:
+        raise RuntimeError("Parquet/Arrow eksport uchun pyarrow o'rnating")
+
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    schema = arrow_schema(pa)
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+    else:
+        import pyarrow.ipc
+        writer = pyarrow.ipc.new_file(path, schema)
+
+    count = 0
+    with writer:
+        for batch in _record_batches(pa, schema, rows, chunk_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
@@ -0,0 +1,119 @@
+from django import forms
+from django.conf import settings
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.utils.translation import gettext_lazy as _
+
+from .models import ThyroidDiagnosis
+from .preprocessing import read_image_header
+from .services import PATIENT_FIELDS
+
+
+YES_NO_CHOICES = [
+    ('Ha', _('Ha')),
+    ("Yo'q", _("Yo'q")),
+]
+
+
+def yes_no_field():
+    """'Ha' -> True, "Yo'q" yoki bo'sh -> False"""
+    return forms.TypedChoiceField(
+        choices=YES_NO_CHOICES,
+        coerce=lambda value: value == 'Ha',
+        required=False,
+        empty_value=False
+    )
+
+
+class LabValueField(forms.FloatField):
+    """Ixtiyoriy laboratoriya ko'rsatkichi: bo'sh yoki yuborilmagan -> 0.0"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return 0.0 if value is None else value
+
+
+def validate_image_header(uploaded_file):
+    """Rasmni dekodlamasdan tekshirish: hajm, magic baytlar, o'lchamlar"""
+    if uploaded_file.size > settings.UPLOAD_MAX_SIZE:
+        raise forms.ValidationError(
+            _("Rasm %(size)sMB dan kichik bo'lishi kerak"),
+            code='file_too_large',
+            params={'size': settings.UPLOAD_MAX_SIZE // (1024 * 1024)}
+        )
+
+    header = read_image_header(uploaded_file)
+    if header is None:
+        raise forms.ValidationError(
+            _("Fayl rasm emas yoki buzilgan (JPEG, PNG, BMP, WEBP)"),
+            code='invalid_image'
+        )
+
+    width, height = header[1]
+    if min(width, height) < settings.IMAGE_MIN_DIMENSION:
+        raise forms.ValidationError(
+            _("Rasm juda kichik: %(width)sx%(height)s (kamida %(min)spx)"),
+            code='image_too_small',
+            params={'width': width, 'height': height, 'min': settings.IMAGE_MIN_DIMENSION}
+        )
+    if max(width, height) > settings.IMAGE_MAX_DIMENSION:
+        raise forms.ValidationError(
+            _("Rasm juda katta: %(width)sx%(height)s (ko'pi bilan %(max)spx)"),
+            code='image_too_large',
+            params={'width': width, 'height': height, 'max': settings.IMAGE_MAX_DIMENSION}
+        )
+
+
+# ============================================================================
+# TASHXIS FORMASI
+# ============================================================================
+class PatientForm(forms.Form):
+    """
+    Bemor ma'lumotlari: model kutayotgan 14 ta maydon (15-belgi - thyroid
+    cancer risk - shulardan hisoblanadi). Diapazonlar fiziologik chegaralar
+    bo'yicha - undan tashqaridagi qiymatlar xato kiritilgan deb hisoblanadi.
+    """
+
+    age = forms.IntegerField(min_value=1, max_value=120)
+    gender = forms.ChoiceField(choices=ThyroidDiagnosis.GENDER_CHOICES)
+    country = forms.TypedChoiceField(choices=ThyroidDiagnosis.COUNTRY_CHOICES, coerce=int)
+    ethnicity = forms.TypedChoiceField(choices=ThyroidDiagnosis.ETHNICITY_CHOICES, coerce=int)
+
+    family_history = yes_no_field()
+    radiation_exposure = yes_no_field()
+    iodine_deficiency = yes_no_field()
+    smoking = yes_no_field()
+    obesity = yes_no_field()
+    diabetes = yes_no_field()
+
+    # mIU/L, ng/dL, μg/dL, sm. Asosiy sahifa formasida T3, T4 va tugun
+    # o'lchami yo'q - ular kiritilmasa 0 deb olinadi
+    tsh_level = forms.FloatField(min_value=0, max_value=500)
+    t3_level = LabValueField(min_value=0, max_value=1000)
+    t4_level = LabValueField(min_value=0, max_value=50)
+    nodule_size = LabValueField(min_value=0, max_value=20)
+
+    notes = forms.CharField(required=False, max_length=5000)
+
+    def patient_data(self):
+        """Tozalangan ma'lumotlardan bemor lug'ati (PATIENT_FIELDS tartibida)"""
+        return {field: self.cleaned_data[field] for field in PATIENT_FIELDS}
+
+    def error_message(self):
+        """Birinchi xato: "maydon: xabar" (JSON javob uchun)"""
+        field, errors = next(iter(self.errors.items()))
+        if field == NON_FIELD_ERRORS:
+            return errors[0]
+        return f'{field}: {errors[0]}'
+
+
+class DiagnosisForm(PatientForm):
+    """Bitta tashxis so'rovi: bemor ma'lumotlari + ultratovush rasmi"""
+
+    thyroid_image = forms.FileField(
+        validators=[validate_image_header],
+        error_messages={'required': _("Ultratovush rasmini yuklang")}
+    )
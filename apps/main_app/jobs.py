@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import derivatives, reports
+from .models import DiagnosisJob, ThyroidDiagnosis
+from .registry import shadow_registry
+from .services import PATIENT_FIELDS, run_diagnosis, run_shadow
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# ASINXRON TASHXIS NAVBATI
+# ============================================================================
+# Navbat ma'lumotlar bazasida saqlanadi (DiagnosisJob). Yangi vazifa
+# tranzaksiya commit bo'lgach lokal thread pool'ga yuboriladi; worker
+# qayta ishga tushsa yoki pool to'lib qolsa, "run_diagnosis_jobs" buyrug'i
+# navbatda qolgan vazifalarni DB'dan olib bajaradi.
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Lokal worker pool (fork'dan keyin qayta yaratiladi)"""
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DIAGNOSIS_JOB_WORKERS,
+                    thread_name_prefix='diagnosis-job'
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def enqueue(diagnosis):
+    """Yozuv uchun vazifa yaratish va commit'dan keyin pool'ga yuborish"""
+    job = DiagnosisJob.objects.create(diagnosis=diagnosis)
+    transaction.on_commit(lambda: get_executor().submit(process_job, job.pk))
+    return job
+
+
+def _generate_report(diagnosis_id):
+    try:
+        reports.generate_report(diagnosis_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_report(diagnosis):
+    """Xulosani commit'dan keyin fon rejimida oldindan render qilish"""
+    if settings.REPORT_PREGENERATE:
+        transaction.on_commit(lambda: get_executor().submit(_generate_report, diagnosis.pk))
+
+
+def _generate_derivatives(diagnosis_id):
+    try:
+        derivatives.generate_for(diagnosis_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_derivatives(diagnosis):
+    """Thumbnail, web nusxa va model kirishini commit'dan keyin fon rejimida yaratish"""
+    if settings.DERIVED_IMAGES_ENABLED:
+        transaction.on_commit(lambda: get_executor().submit(_generate_derivatives, diagnosis.pk))
+
+
+def _run_shadow(diagnosis_id):
+    model_registry = shadow_registry()
+    if model_registry is None:
+        return
+    try:
+        record = ThyroidDiagnosis.objects.only(
+            'uuid', 'thyroid_image', 'derived_at', 'prediction_value', *PATIENT_FIELDS
+        ).get(pk=diagnosis_id)
+        run_shadow(record, model_registry)
+    except Exception as e:
+        logger.exception("❌ Shadow baholash xatoligi (%s): %s", diagnosis_id, e)
+    finally:
+        close_old_connections()
+
+
+def schedule_shadow(diagnosis):
+    """Shadow rejimida nomzod modelni commit'dan keyin fon rejimida ishlatish"""
+    if shadow_registry() is not None:
+        transaction.on_commit(lambda: get_executor().submit(_run_shadow, diagnosis.pk))
+
+
+def claim(job_id):
+    """Vazifani atomik ravishda egallash (faqat bitta worker oladi)"""
+    return DiagnosisJob.objects.filter(
+        pk=job_id,
+        status=DiagnosisJob.STATUS_PENDING
+    ).update(
+        status=DiagnosisJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+        attempts=F('attempts') + 1,
+        progress=10
+    ) == 1
+
+
+def _set_progress(job_id):
+    def update(value):
+        DiagnosisJob.objects.filter(pk=job_id).update(progress=value)
+    return update
+
+
+def process_job(job_id):
+    """Bitta vazifani bajarish"""
+    try:
+        if not claim(job_id):
+            return
+
+        job = DiagnosisJob.objects.select_related('diagnosis').get(pk=job_id)
+
+        try:
+            run_diagnosis(job.diagnosis, progress=_set_progress(job_id))
+        except Exception as e:
+            logger.exception("❌ Vazifa xatoligi (%s): %s", job.diagnosis_id, e)
+            DiagnosisJob.objects.filter(pk=job_id).update(
+                status=DiagnosisJob.STATUS_FAILED,
+                error=str(e),
+                finished_at=timezone.now()
+            )
+            return
+
+        DiagnosisJob.objects.filter(pk=job_id).update(
+            status=DiagnosisJob.STATUS_DONE,
+            progress=100,
+            error=None,
+            finished_at=timezone.now()
+        )
+        logger.info("✅ Vazifa bajarildi: %s", job.diagnosis_id)
+
+        if settings.REPORT_PREGENERATE:
+            reports.generate_report(job.diagnosis_id)
+        _run_shadow(job.diagnosis_id)
+
+    finally:
+        close_old_connections()
+
+
+def requeue_stale(timeout_seconds, max_attempts):
+    """Uzoq vaqt 'running' holatida qolgan vazifalarni navbatga qaytarish"""
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    stale = DiagnosisJob.objects.filter(
+        status=DiagnosisJob.STATUS_RUNNING,
+        started_at__lt=cutoff
+    )
+    stale.filter(attempts__gte=max_attempts).update(
+        status=DiagnosisJob.STATUS_FAILED,
+        error="Vazifa vaqt chegarasidan oshdi",
+        finished_at=timezone.now()
+    )
+    return stale.filter(attempts__lt=max_attempts).update(
+        status=DiagnosisJob.STATUS_PENDING,
+        progress=0
+    )
+
+
+def pending_job_ids(limit):
+    """Navbatdagi vazifalar (eng eskisidan)"""
+    return list(
+        DiagnosisJob.objects.filter(status=DiagnosisJob.STATUS_PENDING)
+        .order_by('created_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+
+def job_status(diagnosis):
+    """Tashxis holati (status endpoint uchun)"""
+    job = DiagnosisJob.objects.filter(diagnosis=diagnosis).first()
+
+    if job is None:
+        status = DiagnosisJob.STATUS_DONE if diagnosis.diagnosis else DiagnosisJob.STATUS_PENDING
+        return {
+            'status': status,
+            'progress': 100 if diagnosis.diagnosis else 0,
+            'error': None,
+        }
+
+    return {
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+    }
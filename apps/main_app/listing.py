@@ -0,0 +1,222 @@
+import base64
+import datetime
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import DailyStat, ThyroidDiagnosis
+
+
+# ============================================================================
+# TASHXISLAR RO'YXATI: KEYSET PAGINATION VA STATISTIKA
+# ============================================================================
+# OFFSET o'rniga (created_at, uuid) kursori ishlatiladi: har bir sahifa
+# -created_at indeksi bo'yicha oldingi sahifa oxiridan davom etadi, shuning
+# uchun chuqur sahifalar ham birinchi sahifa kabi tez.
+
+LIST_FIELDS = [
+    'uuid', 'created_at', 'age', 'gender', 'diagnosis', 'diagnosis_class',
+    'confidence', 'risk_level', 'is_downloaded', 'download_count',
+]
+
+RISK_LEVELS = ['Past', "O'rta", 'Yuqori']
+
+
+def encode_cursor(diagnosis):
+    """Yozuvdan URL uchun xavfsiz kursor"""
+    raw = f"{diagnosis.created_at.isoformat()}|{diagnosis.uuid}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Kursorni (created_at, uuid) ga aylantirish; yaroqsiz bo'lsa None"""
+    if not value:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+        created_at, pk = raw.split('|')
+        created_at = parse_datetime(created_at)
+        return (created_at, uuid.UUID(pk)) if created_at else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def _day_start(value):
+    """Sanani joriy vaqt zonasidagi kun boshiga aylantirish"""
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def parse_filters(params):
+    """GET parametrlaridan tekshirilgan filtrlar"""
+    filters = {}
+
+    diagnosis_class = params.get('diagnosis_class')
+    if diagnosis_class in dict(ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES):
+        filters['diagnosis_class'] = diagnosis_class
+
+    risk_level = params.get('risk_level')
+    if risk_level in RISK_LEVELS:
+        filters['risk_level'] = risk_level
+
+    for name in ('date_from', 'date_to'):
+        try:
+            value = parse_date(params.get(name) or '')
+        except ValueError:
+            value = None
+        if value:
+            filters[name] = value
+
+    return filters
+
+
+def filter_diagnoses(filters):
+    """Filtrlangan queryset (sana oralig'i indeksdan foydalanadigan ko'rinishda)"""
+    queryset = ThyroidDiagnosis.objects.all()
+
+    if 'diagnosis_class' in filters:
+        queryset = queryset.filter(diagnosis_class=filters['diagnosis_class'])
+    if 'risk_level' in filters:
+        queryset = queryset.filter(risk_level=filters['risk_level'])
+    if 'date_from' in filters:
+        queryset = queryset.filter(created_at__gte=_day_start(filters['date_from']))
+    if 'date_to' in filters:
+        next_day = filters['date_to'] + datetime.timedelta(days=1)
+        queryset = queryset.filter(created_at__lt=_day_start(next_day))
+
+    return queryset
+
+
+def keyset_page(queryset, after=None, before=None, page_size=50):
+    """
+    Bitta sahifa (yangi yozuvlardan eskilariga).
+
+    ``after`` - keyingi sahifa, ``before`` - oldingi sahifa kursori.
+    Qaytaradi: (yozuvlar, keyingi kursor, oldingi kursor).
+    """
+    queryset = queryset.only(*LIST_FIELDS)
+    after, before = decode_cursor(after), decode_cursor(before)
+
+    if before:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, uuid__gt=pk))
+            .order_by('created_at', 'uuid')[:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_next, has_prev = True, has_more
+    else:
+        if after:
+            created_at, pk = after
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, uuid__lt=pk)
+            )
+        rows = list(queryset.order_by('-created_at', '-uuid')[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_prev = after is not None
+
+    next_cursor = encode_cursor(rows[-1]) if rows and has_next else None
+    prev_cursor = encode_cursor(rows[0]) if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
+
+
+def summary_window(filters):
+    """Kunlik panel oynasi: oxirgi DIAGNOSIS_SUMMARY_DAYS kun (sana filtrlari ichida)"""
+    today = timezone.localdate()
+    last = min(filters.get('date_to') or today, today)
+    first = last - datetime.timedelta(days=settings.DIAGNOSIS_SUMMARY_DAYS - 1)
+    if 'date_from' in filters:
+        first = max(first, filters['date_from'])
+    return first, last
+
+
+def class_totals(filters, window_start):
+    """
+    Klasslar bo'yicha soni: (by_class, since).
+
+    Yig'ilgan kunlar (watermark'dan oldingi) DailyStat'dan, qolgani - jonli
+    so'rov bilan, faqat oxirgi kun(lar) qatorlari o'qiladi. DailyStat'da
+    klass x xavf darajasi kesimi yo'q, shuning uchun xavf filtri bilan (yoki
+    rollup hali ishlamagan bo'lsa) hisob panel oynasi bilan cheklanadi -
+    ``since`` shu oyna boshi, aks holda None.
+    """
+    by_class = {value: 0 for value, _ in ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES}
+    live = filter_diagnoses(filters).filter(diagnosis__isnull=False)
+
+    watermark = DailyStat.objects.aggregate(day=Max('day'))['day']
+    since = None
+    if 'risk_level' in filters or watermark is None:
+        since = window_start
+        live = live.filter(created_at__gte=_day_start(since))
+    else:
+        stored = DailyStat.objects.filter(dimension='diagnosis_class', day__lt=watermark)
+        if 'diagnosis_class' in filters:
+            stored = stored.filter(value=filters['diagnosis_class'])
+        if 'date_from' in filters:
+            stored = stored.filter(day__gte=filters['date_from'])
+        if 'date_to' in filters:
+            stored = stored.filter(day__lte=filters['date_to'])
+        for row in stored.values('value').annotate(count=Sum('diagnosed')).order_by():
+            by_class[row['value']] = by_class.get(row['value'], 0) + row['count']
+
+        # Watermark kuni rollup'dan keyin ham to'lib boradi - u jonli hisoblanadi
+        live = live.filter(created_at__gte=_day_start(max(watermark, filters.get('date_from', watermark))))
+
+    for row in live.values('diagnosis_class').annotate(count=Count('uuid')).order_by():
+        by_class[row['diagnosis_class']] = by_class.get(row['diagnosis_class'], 0) + row['count']
+    return by_class, since
+
+
+def diagnosis_summary(filters):
+    """
+    Statistika paneli: klasslar bo'yicha soni va kunlik o'rtacha ishonch.
+
+    Kunlik qatorlar faqat ko'rsatiladigan oyna (created_at indeksi bo'yicha
+    chegaralangan) GROUP BY (kun, klass) so'rovi bilan, jami soni
+    ``class_totals`` orqali hisoblanadi; natija filtrlar kombinatsiyasi
+    bo'yicha DIAGNOSIS_SUMMARY_CACHE_TIMEOUT soniya keshlanadi.
+    """
+    key_data = json.dumps(filters, sort_keys=True, default=str)
+    cache_key = 'diagnosis_summary:' + hashlib.md5(key_data.encode()).hexdigest()
+
+    summary = cache.get(cache_key)
+    if summary is not None:
+        return summary
+
+    first, last = summary_window(filters)
+    rows = (
+        filter_diagnoses(filters)
+        .filter(diagnosis__isnull=False, created_at__gte=_day_start(first))
+        .annotate(day=TruncDate('created_at'))
+        .values('day')
+        .annotate(count=Count('uuid'), mean_confidence=Avg('confidence'))
+        .order_by('-day')
+    ) if first <= last else []
+
+    per_day = [
+        {
+            'day': row['day'],
+            'count': row['count'],
+            'mean_confidence': row['mean_confidence'] or 0,
+        }
+        for row in rows
+    ]
+
+    by_class, since = class_totals(filters, first)
+    summary = {
+        'total': sum(by_class.values()),
+        'since': since,
+        'by_class': by_class,
+        'per_day': per_day,
+    }
+    cache.set(cache_key, summary, settings.DIAGNOSIS_SUMMARY_CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,286 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from apps.main_app.preprocessing import preprocess_image_bytes
+from apps.main_app.registry import registry
+from apps.main_app.services import (
+    build_feature_matrix,
+    build_features,
+    scale_features,
+)
+
+
+SAMPLE_PATIENT = {
+    'age': 45,
+    'gender': 'Ayol',
+    'country': 0,
+    'ethnicity': 0,
+    'family_history': True,
+    'radiation_exposure': False,
+    'iodine_deficiency': True,
+    'smoking': False,
+    'obesity': False,
+    'diabetes': False,
+    'tsh_level': 3.1,
+    't3_level': 120.0,
+    't4_level': 8.0,
+    'nodule_size': 1.2,
+}
+
+SAMPLE_FORM = {
+    'age': '45',
+    'gender': 'Ayol',
+    'country': '0',
+    'ethnicity': '0',
+    'family_history': 'Ha',
+    'iodine_deficiency': 'Ha',
+    'tsh_level': '3.1',
+    't3_level': '120',
+    't4_level': '8',
+    'nodule_size': '1.2',
+}
+
+
+class SyntheticModel:
+    """
+    Haqiqiy .h5 bo'lmaganda ishlatiladigan kichik o'rinbosar model.
+
+    Ikki kirishli modelning shakllarini takrorlaydi (rasm pooling + chiziqli
+    qatlam + sigmoid), shuning uchun pipeline'ning qolgan qismi real
+    sharoitdagidek o'lchanadi.
+    """
+
+    name = 'synthetic'
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.image_weights = rng.standard_normal((3, 1)).astype(np.float32)
+        self.feature_weights = rng.standard_normal((15, 1)).astype(np.float32) / 15
+
+    def predict(self, images, features):
+        pooled = np.asarray(images, dtype=np.float32).mean(axis=(1, 2))
+        logits = pooled @ self.image_weights + np.asarray(features, dtype=np.float32) @ self.feature_weights
+        return 1 / (1 + np.exp(-logits))
+
+
+def summarize(latencies, elapsed=None):
+    """Kechikishlar ro'yxatidan p50/p95/p99 va throughput"""
+    values = np.asarray(latencies) * 1000
+    summary = {
+        'count': int(values.size),
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+    }
+    total = elapsed if elapsed is not None else float(np.sum(latencies))
+    summary['per_second'] = values.size / total if total else 0.0
+    return summary
+
+
+def timed(func, iterations):
+    """Funksiyani bir necha marta chaqirib kechikishlarni yig'ish"""
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+class Command(BaseCommand):
+    help = (
+        "Tashxis pipeline'i uchun benchmark: preprocessing, features, turli batch "
+        "o'lchamlarida predict va diagnose/ endpointiga parallel POST so'rovlar. "
+        "Natija JSON hisobotga yoziladi va oldingi hisobot bilan solishtiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200,
+                            help="Mikro-benchmarklar uchun takrorlar soni")
+        parser.add_argument('--batch-sizes', default='1,4,16,64',
+                            help="predict uchun batch o'lchamlari (vergul bilan)")
+        parser.add_argument('--requests', type=int, default=100,
+                            help="End-to-end POST so'rovlar soni")
+        parser.add_argument('--concurrency', type=int, default=4,
+                            help="End-to-end parallel mijozlar soni")
+        parser.add_argument('--image-size', type=int, default=800,
+                            help="Sintetik JPEG rasm tomoni (px)")
+        parser.add_argument('--synthetic', action='store_true',
+                            help="Haqiqiy model o'rniga doim sintetik modeldan foydalanish")
+        parser.add_argument('--skip-e2e', action='store_true',
+                            help="End-to-end HTTP benchmarkni o'tkazib yuborish")
+        parser.add_argument('--output', default='bench_output.json',
+                            help="JSON hisobot fayli")
+        parser.add_argument('--compare',
+                            help="Solishtirish uchun oldingi JSON hisobot")
+
+    def _sample_jpeg(self, size):
+        rng = np.random.default_rng(0)
+        # Ultratovushga o'xshash silliq kulrang rasm (tasodifiy shovqin JPEG'ni buzadi)
+        noise = rng.random((size // 8, size // 8), dtype=np.float32)
+        img = cv2.resize(noise, (size, size), interpolation=cv2.INTER_CUBIC)
+        img = cv2.cvtColor((np.clip(img, 0, 1) * 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+        return cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+    def _install_model(self, synthetic):
+        if not synthetic and registry.get_model() is not None:
+            return registry.backend
+
+        registry.model = SyntheticModel()
+        registry.version = 'synthetic'
+        registry.state = registry.LOADED
+        if registry.scaler_mean is None or registry.scaler_scale is None:
+            registry.scaler_mean = np.zeros(15, dtype=np.float32)
+            registry.scaler_scale = np.ones(15, dtype=np.float32)
+        return SyntheticModel.name
+
+    def _git_revision(self):
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, stderr=subprocess.DEVNULL, text=True
+            ).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _bench_micro(self, options, image_bytes):
+        iterations = options['iterations']
+        results = {}
+
+        results['preprocess_image'] = summarize(
+            timed(lambda: preprocess_image_bytes(image_bytes), iterations)
+        )
+        results['build_features'] = summarize(
+            timed(lambda: scale_features(build_features(SAMPLE_PATIENT)), iterations)
+        )
+
+        model = registry.get_model()
+        image = preprocess_image_bytes(image_bytes)
+        predict_results = {}
+        for batch_size in [int(size) for size in options['batch_sizes'].split(',') if size]:
+            images = np.repeat(image, batch_size, axis=0)
+            features = scale_features(build_feature_matrix([SAMPLE_PATIENT] * batch_size))
+            model.predict(images, features)  # isitish
+
+            rounds = max(1, iterations // batch_size)
+            latencies = timed(lambda: model.predict(images, features), rounds)
+            summary = summarize(latencies)
+            summary['samples_per_second'] = batch_size * summary['per_second']
+            predict_results[str(batch_size)] = summary
+        results['predict'] = predict_results
+
+        return results
+
+    def _bench_e2e(self, options, image_bytes):
+        """diagnose/ endpointiga parallel POST (test bazasi va vaqtinchalik MEDIA_ROOT)"""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.db import connection
+
+        url = reverse('diagnose')
+        latencies = []
+        statuses = {}
+        lock = threading.Lock()
+
+        def post(_):
+            client = Client()
+            upload = SimpleUploadedFile('bench.jpg', image_bytes, content_type='image/jpeg')
+            started = time.perf_counter()
+            response = client.post(url, {**SAMPLE_FORM, 'thyroid_image': upload})
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, \
+                    override_settings(MEDIA_ROOT=media_root, DIAGNOSIS_ASYNC=False,
+                                      REPORT_PREGENERATE=False, DERIVED_IMAGES_ENABLED=False):
+                post(None)  # isitish
+                latencies.clear()
+                statuses.clear()
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                    list(pool.map(post, range(options['requests'])))
+                elapsed = time.perf_counter() - started
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        summary = summarize(latencies, elapsed)
+        summary['concurrency'] = options['concurrency']
+        summary['status_codes'] = {str(code): count for code, count in statuses.items()}
+        return summary
+
+    def _print_summary(self, name, summary, previous=None):
+        line = (
+            f"{name:<28} p50={summary['p50_ms']:8.2f}ms  p95={summary['p95_ms']:8.2f}ms  "
+            f"p99={summary['p99_ms']:8.2f}ms  {summary['per_second']:9.1f}/s"
+        )
+        if previous:
+            delta = (summary['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100
+            line += f"  (p50 {delta:+.1f}%)"
+        self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        image_bytes = self._sample_jpeg(options['image_size'])
+        model_name = self._install_model(options['synthetic'])
+        self.stdout.write(f"🧪 Benchmark: model={model_name}, rasm={len(image_bytes)} bayt")
+
+        report = {
+            'revision': self._git_revision(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'model': model_name,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'settings': {
+                'INFERENCE_BATCHING_ENABLED': settings.INFERENCE_BATCHING_ENABLED,
+                'INFERENCE_MAX_BATCH_SIZE': settings.INFERENCE_MAX_BATCH_SIZE,
+                'INFERENCE_MAX_WAIT_MS': settings.INFERENCE_MAX_WAIT_MS,
+                'PREDICTION_CACHE_ENABLED': settings.PREDICTION_CACHE_ENABLED,
+            },
+            'results': self._bench_micro(options, image_bytes),
+        }
+        if not options['skip_e2e']:
+            # Har bir so'rov bir xil rasm yuboradi - kesh natijani buzmasligi uchun o'chiriladi
+            with override_settings(PREDICTION_CACHE_ENABLED=False):
+                report['results']['diagnose_e2e'] = self._bench_e2e(options, image_bytes)
+
+        previous = {}
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f).get('results', {})
+
+        results = report['results']
+        self._print_summary('preprocess_image', results['preprocess_image'], previous.get('preprocess_image'))
+        self._print_summary('build_features', results['build_features'], previous.get('build_features'))
+        for batch_size, summary in results['predict'].items():
+            self._print_summary(
+                f'predict[batch={batch_size}]', summary, previous.get('predict', {}).get(batch_size)
+            )
+        if 'diagnose_e2e' in results:
+            self._print_summary(
+                f"diagnose_e2e[c={options['concurrency']}]", results['diagnose_e2e'],
+                previous.get('diagnose_e2e')
+            )
+
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"✅ Hisobot: {options['output']}"))
@@ -0,0 +1,82 @@
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main_app.models import ThyroidDiagnosis
+from apps.main_app.preprocessing import decode_image_bytes, preprocess_image_bytes, resize_for_model
+from apps.main_app.registry import registry
+from apps.main_app.services import (
+    build_feature_matrix,
+    patient_data_from_record,
+    scale_features,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "float32 preprocessing yo'lini eski float64 yo'l bilan solishtiradi: "
+        "model kirishlari va bashoratlar berilgan chegarada bir xil bo'lishi kerak."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=64,
+                            help="Tekshiriladigan yozuvlar soni (eng yangilaridan)")
+        parser.add_argument('--tolerance', type=float, default=1e-5,
+                            help="Bashoratlar orasidagi ruxsat etilgan eng katta farq")
+
+    def _legacy(self, data, patient):
+        """Oldingi yo'l: float64 rasm, float64 scaler"""
+        img = resize_for_model(decode_image_bytes(data)) / 255.0
+        features = build_feature_matrix([patient]).astype(np.float64)
+        mean = registry.scaler_mean.astype(np.float64)
+        scale = registry.scaler_scale.astype(np.float64)
+        return np.expand_dims(img, axis=0), (features - mean) / scale
+
+    def _current(self, data, patient):
+        return preprocess_image_bytes(data), scale_features(build_feature_matrix([patient]))
+
+    def handle(self, *args, **options):
+        model = registry.get_model()
+        if model is None:
+            raise CommandError(f"Model yuklanmagan: {registry.error}")
+
+        records = ThyroidDiagnosis.objects.order_by('-created_at')[:options['samples']]
+        legacy_images, legacy_features, images, features = [], [], [], []
+        for record in records:
+            with record.thyroid_image.open('rb') as f:
+                data = f.read()
+            if decode_image_bytes(data) is None:
+                continue
+
+            patient = patient_data_from_record(record)
+            image, feature = self._legacy(data, patient)
+            legacy_images.append(image)
+            legacy_features.append(feature)
+            image, feature = self._current(data, patient)
+            images.append(image)
+            features.append(feature)
+
+        if not images:
+            raise CommandError("Tekshirish uchun rasmli yozuvlar topilmadi")
+
+        legacy_images = np.concatenate(legacy_images)
+        images = np.concatenate(images)
+        features = np.concatenate(features)
+
+        input_diff = float(np.max(np.abs(legacy_images - images)))
+        expected = np.asarray(model.predict(legacy_images, np.concatenate(legacy_features))).reshape(-1)
+        actual = np.asarray(model.predict(images, features)).reshape(-1)
+        prediction_diff = float(np.max(np.abs(expected - actual)))
+
+        self.stdout.write(
+            f"🔍 {len(images)} namuna: kirish dtype={images.dtype} "
+            f"({images.nbytes / len(images) / 1024:.0f} KB/namuna, oldin "
+            f"{legacy_images.nbytes / len(images) / 1024:.0f} KB)"
+        )
+        self.stdout.write(f"   kirishlar max farqi: {input_diff:.2e}")
+        self.stdout.write(f"   bashoratlar max farqi: {prediction_diff:.2e}")
+
+        if prediction_diff > options['tolerance']:
+            raise CommandError(
+                f"Bashoratlar farqi {prediction_diff:.2e} > {options['tolerance']:.0e}"
+            )
+        self.stdout.write(self.style.SUCCESS("✅ Paritet tasdiqlandi"))
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, F, Max, Q
+from django.db.models.functions import Abs
+from django.utils import timezone
+
+from apps.main_app.models import ThyroidDiagnosis
+
+
+class Command(BaseCommand):
+    help = (
+        "Jonli ma'lumotlarda modellarni solishtiradi: model versiyalari bo'yicha "
+        "taqsimot (split) va asosiy/nomzod bashoratlari kelishuvi (shadow)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7,
+                            help="Oxirgi necha kunlik yozuvlar")
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        queryset = ThyroidDiagnosis.objects.filter(
+            created_at__gte=since, prediction_value__isnull=False
+        )
+        malignant = Q(prediction_value__gt=0.5)
+
+        self.stdout.write(f"📊 Model versiyalari (oxirgi {options['days']} kun):")
+        rows = (
+            queryset.values('model_version')
+            .annotate(
+                total=Count('pk'),
+                malignant=Count('pk', filter=malignant),
+                avg_prediction=Avg('prediction_value'),
+            )
+            .order_by('-total')
+        )
+        for row in rows:
+            self.stdout.write(
+                f"   {row['model_version'] or '-':<14} {row['total']:>8} yozuv, "
+                f"xavfli {row['malignant'] / row['total']:.1%}, "
+                f"o'rtacha {row['avg_prediction']:.4f}"
+            )
+
+        shadow = queryset.filter(shadow_prediction_value__isnull=False)
+        self.stdout.write("🌓 Shadow baholash:")
+        rows = (
+            shadow.values('model_version', 'shadow_model_version')
+            .annotate(
+                total=Count('pk'),
+                agree=Count('pk', filter=(
+                    malignant & Q(shadow_prediction_value__gt=0.5)
+                ) | (
+                    ~malignant & Q(shadow_prediction_value__lte=0.5)
+                )),
+                mean_diff=Avg(Abs(F('prediction_value') - F('shadow_prediction_value'))),
+                max_diff=Max(Abs(F('prediction_value') - F('shadow_prediction_value'))),
+            )
+            .order_by('-total')
+        )
+        found = False
+        for row in rows:
+            found = True
+            self.stdout.write(
+                f"   {row['model_version'] or '-'} -> {row['shadow_model_version']}: "
+                f"{row['total']} yozuv, klass kelishuvi {row['agree'] / row['total']:.1%}, "
+                f"o'rtacha farq {row['mean_diff']:.4f}, max farq {row['max_diff']:.4f}"
+            )
+        if not found:
+            self.stdout.write("   shadow natijalari yo'q (MODEL_CANDIDATE_MODE=shadow)")
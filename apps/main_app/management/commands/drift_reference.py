@@ -0,0 +1,74 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.main_app import drift
+from apps.main_app.models import DriftSketch
+
+
+class Command(BaseCommand):
+    help = (
+        "Drift monitoringi uchun mos yozuv taqsimotini saqlaydi: tanlangan "
+        "kunlarning gistogrammalari birlashtiriladi (jadval skanerlanmaydi). "
+        "Mos yozuv bo'lmasa belgilar scaler taqsimoti - N(0, 1) bilan solishtiriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date-from', help="Boshlanish sanasi (YYYY-MM-DD)")
+        parser.add_argument('--date-to', help="Tugash sanasi (YYYY-MM-DD)")
+        parser.add_argument('--days', type=int, default=30,
+                            help="--date-from berilmasa: oxirgi N kun")
+        parser.add_argument('--model-version',
+                            help="Model versiyasi (standart: oxirgi gistogrammalar versiyasi)")
+        parser.add_argument('--clear', action='store_true',
+                            help="Mos yozuvni o'chirish (scaler taqsimotiga qaytish)")
+
+    def _date(self, value, name):
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f"{name} noto'g'ri: {value}")
+        return parsed
+
+    def handle(self, *args, **options):
+        model_version = options['model_version']
+        if model_version is None:
+            model_version = drift.latest_version()
+        references = DriftSketch.objects.filter(day__isnull=True, model_version=model_version)
+
+        if options['clear']:
+            deleted, _ = references.delete()
+            self.stdout.write(self.style.SUCCESS(f"🗑️ Mos yozuv o'chirildi ({model_version or '-'}): {deleted}"))
+            return
+
+        date_to = self._date(options['date_to'], '--date-to') if options['date_to'] else timezone.localdate()
+        if options['date_from']:
+            date_from = self._date(options['date_from'], '--date-from')
+        else:
+            date_from = date_to - datetime.timedelta(days=options['days'] - 1)
+
+        sketches = drift.merged_sketches(DriftSketch.objects.filter(
+            model_version=model_version, day__gte=date_from, day__lte=date_to
+        ))
+        if not sketches:
+            raise CommandError(f"{date_from} - {date_to} uchun gistogrammalar yo'q ({model_version or '-'})")
+
+        try:
+            with transaction.atomic():
+                references.delete()
+                for feature, sketch in sketches.items():
+                    drift.save_sketch(DriftSketch(day=None, feature=feature, model_version=model_version), sketch)
+        except IntegrityError:
+            # drift_sketch_unique_reference: parallel ishga tushirilgan boshqa buyruq yozib ulgurdi
+            raise CommandError("Mos yozuv bir vaqtda boshqa jarayon tomonidan saqlanmoqda, qayta urinib ko'ring")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Mos yozuv saqlandi ({model_version or '-'}, {date_from} - {date_to}): " + ", ".join(
+                f"{feature}={sketch.count}" for feature, sketch in sketches.items()
+            )
+        ))
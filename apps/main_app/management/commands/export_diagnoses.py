@@ -0,0 +1,70 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main_app import exports, listing
+from apps.main_app.models import ThyroidDiagnosis
+
+
+class Command(BaseCommand):
+    help = (
+        "ThyroidDiagnosis jadvalini analitika uchun CSV, Parquet yoki Arrow faylga "
+        "eksport qiladi (server kursori bilan bo'laklab, o'zgarmas xotirada)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Natija fayli yo'li")
+        parser.add_argument(
+            '--format',
+            choices=exports.EXPORT_FORMATS,
+            help="Fayl formati (berilmasa fayl kengaytmasidan aniqlanadi)"
+        )
+        parser.add_argument('--date-from', help="Boshlanish sanasi (YYYY-MM-DD)")
+        parser.add_argument('--date-to', help="Tugash sanasi (YYYY-MM-DD, shu kun ham kiradi)")
+        parser.add_argument(
+            '--diagnosis-class',
+            choices=[value for value, _ in ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES]
+        )
+        parser.add_argument('--risk-level', choices=listing.RISK_LEVELS)
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help="Bir bo'lakdagi qatorlar (standart: EXPORT_CHUNK_SIZE)"
+        )
+
+    def handle(self, *args, **options):
+        output = options['output']
+        file_format = options['format'] or os.path.splitext(output)[1].lstrip('.').lower()
+        if file_format == 'feather':
+            file_format = 'arrow'
+        if file_format not in exports.EXPORT_FORMATS:
+            raise CommandError(f"Noma'lum format: {file_format!r} (--format {'|'.join(exports.EXPORT_FORMATS)})")
+
+        params = {
+            'date_from': options['date_from'],
+            'date_to': options['date_to'],
+            'diagnosis_class': options['diagnosis_class'],
+            'risk_level': options['risk_level'],
+        }
+        filters = listing.parse_filters(params)
+        for name in ('date_from', 'date_to'):
+            if params[name] and name not in filters:
+                raise CommandError(f"Sana noto'g'ri: {params[name]}")
+
+        rows = exports.export_rows(listing.filter_diagnoses(filters), options['chunk_size'])
+        started = time.perf_counter()
+
+        if file_format == 'csv':
+            count = exports.write_csv(rows, output)
+        else:
+            try:
+                count = exports.write_columnar(rows, output, file_format, options['chunk_size'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {count} ta yozuv eksport qilindi: {output} ({file_format}, {elapsed:.1f}s)"
+        ))
@@ -0,0 +1,206 @@
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main_app.backends import KerasBackend, TFLiteBackend
+from apps.main_app.models import ThyroidDiagnosis
+from apps.main_app.services import (
+    PATIENT_FIELDS,
+    build_feature_matrix,
+    patient_data_from_record,
+    scale_features,
+)
+from apps.main_app.tensors import load_model_input
+
+
+class Command(BaseCommand):
+    help = (
+        "Keras modelini (.h5) yengil TFLite artefaktiga eksport qiladi va "
+        "Keras modeli bilan aniqlik mosligini (parity) tekshiradi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=settings.TFLITE_MODEL_PATH,
+            help="Natija .tflite fayli (default: settings.TFLITE_MODEL_PATH)"
+        )
+        parser.add_argument(
+            '--quantize',
+            choices=['none', 'float16', 'dynamic', 'int8'],
+            default='none',
+            help="Kvantlash turi"
+        )
+        parser.add_argument(
+            '--samples',
+            type=int,
+            default=64,
+            help="Kalibratsiya va parity tekshiruvi uchun namunalar soni"
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.02,
+            help="Ruxsat etilgan maksimal absolyut farq (bashorat qiymati bo'yicha)"
+        )
+        parser.add_argument(
+            '--skip-parity',
+            action='store_true',
+            help="Parity tekshiruvini o'tkazib yuborish"
+        )
+
+    def _load_scaler(self):
+        """Scaler fayllari (registry'ni yuklamasdan); topilmasa None"""
+        paths = (settings.SCALER_MEAN_PATH, settings.SCALER_SCALE_PATH)
+        if not all(os.path.exists(path) for path in paths):
+            return None
+        mean, scale = (np.load(path).astype(np.float32) for path in paths)
+        return SimpleNamespace(scaler_mean=mean, scaler_scale=scale)
+
+    def _record_inputs(self, count, offset=0):
+        """
+        Saqlangan tashxislardan kirishlar (eng yangilaridan, ``offset`` tasi
+        o'tkazib yuboriladi): rasm tensorlari va scaler'dan o'tgan features -
+        servisdagi bilan bir xil yo'l. Yozuvlar bo'lmasa None.
+        """
+        records = ThyroidDiagnosis.objects.only(
+            'uuid', 'thyroid_image', 'derived_at', *PATIENT_FIELDS
+        ).order_by('-created_at')
+
+        images, patients, skipped = [], [], 0
+        for record in records.iterator(chunk_size=count):
+            try:
+                image = load_model_input(record)
+            except OSError:
+                continue
+            if image is None:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            images.append(image)
+            patients.append(patient_data_from_record(record))
+            if len(images) >= count:
+                break
+
+        if not images:
+            return None
+        features = build_feature_matrix(patients)
+        if self.scaler is not None:
+            features = scale_features(features, self.scaler)
+        return np.concatenate(images), features.astype(np.float32)
+
+    def _sample_inputs(self, count, seed=0):
+        """Sintetik kirishlar: [0, 1] rasmlar va standartlashtirilgan features"""
+        rng = np.random.default_rng(seed)
+        images = rng.random((count, 128, 128, 3), dtype=np.float32)
+        features = rng.standard_normal((count, 15)).astype(np.float32)
+        return images, features
+
+    def _inputs(self, count, offset=0, purpose=''):
+        """Yozuvlardan kirishlar; jadval bo'sh bo'lsa ogohlantirish bilan sintetik"""
+        inputs = self._record_inputs(count, offset)
+        if inputs is None and offset:
+            inputs = self._record_inputs(count)
+        if inputs is not None:
+            self.stdout.write(f"📥 {purpose}: {len(inputs[0])} ta saqlangan tashxis")
+            return inputs
+
+        self.stdout.write(self.style.WARNING(
+            f"⚠️ {purpose}: saqlangan tashxislar yo'q - sintetik shovqin ishlatiladi, "
+            "natija haqiqiy aniqlikni ko'rsatmaydi"
+        ))
+        return self._sample_inputs(count, seed=1 if offset else 0)
+
+    def _convert(self, keras_model, quantize, samples):
+        import tensorflow as tf
+
+        with tempfile.TemporaryDirectory() as saved_model_dir:
+            keras_model.export(saved_model_dir, format='tf_saved_model')
+            converter = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir)
+
+            if quantize != 'none':
+                converter.optimizations = [tf.lite.Optimize.DEFAULT]
+
+            if quantize == 'float16':
+                converter.target_spec.supported_types = [tf.float16]
+            elif quantize == 'int8':
+                # Kirish nomlarini rank bo'yicha aniqlash (tartib kafolatlanmagan)
+                signature = tf.saved_model.load(saved_model_dir).signatures['serving_default']
+                names = {
+                    len(spec.shape): name
+                    for name, spec in signature.structured_input_signature[1].items()
+                }
+                # Parity to'plamidan keyingi (eskiroq) yozuvlar - kalibratsiya va tekshiruv ajratilgan
+                images, features = self._inputs(samples, offset=samples, purpose="int8 kalibratsiya")
+
+                def representative_dataset():
+                    for i in range(len(images)):
+                        yield {
+                            names[4]: images[i:i + 1],
+                            names[2]: features[i:i + 1],
+                        }
+
+                converter.representative_dataset = representative_dataset
+                converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+            return converter.convert()
+
+    def handle(self, *args, **options):
+        model_path = settings.MODEL_PATH
+        output = options['output']
+
+        if not os.path.exists(model_path):
+            raise CommandError(f"Model topilmadi: {model_path}")
+
+        for path in (settings.SCALER_MEAN_PATH, settings.SCALER_SCALE_PATH):
+            if not os.path.exists(path):
+                self.stdout.write(self.style.WARNING(f"⚠️ Scaler topilmadi: {path}"))
+        self.scaler = self._load_scaler()
+
+        keras_backend = KerasBackend.load(model_path)
+
+        self.stdout.write(f"🔄 Eksport: {model_path} -> {output} (quantize={options['quantize']})")
+        tflite_bytes = self._convert(keras_backend.model, options['quantize'], options['samples'])
+
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'wb') as f:
+            f.write(tflite_bytes)
+
+        h5_size = os.path.getsize(model_path) / 1024 / 1024
+        tflite_size = len(tflite_bytes) / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Saqlandi: {output} ({h5_size:.1f} MB -> {tflite_size:.1f} MB)"
+        ))
+
+        if options['skip_parity']:
+            return
+
+        # Parity: Keras va TFLite bashoratlarini solishtirish
+        images, features = self._inputs(options['samples'], purpose="Parity")
+        expected = np.asarray(keras_backend.predict(images, features)).reshape(-1)
+
+        tflite_backend = TFLiteBackend.load(output)
+        actual = np.concatenate([
+            tflite_backend.predict(images[i:i + 1], features[i:i + 1]).reshape(-1)
+            for i in range(len(images))
+        ])
+
+        max_diff = float(np.max(np.abs(expected - actual)))
+        agreement = float(np.mean((expected > 0.5) == (actual > 0.5))) * 100
+
+        self.stdout.write(
+            f"📊 Parity: max |Δ| = {max_diff:.5f}, tashxis mosligi = {agreement:.1f}% "
+            f"({len(images)} namuna)"
+        )
+
+        if max_diff > options['tolerance']:
+            raise CommandError(
+                f"Parity tekshiruvi o'tmadi: {max_diff:.5f} > {options['tolerance']}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Parity tekshiruvi o'tdi"))
@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.main_app import derivatives
+from apps.main_app.models import ThyroidDiagnosis
+
+
+class Command(BaseCommand):
+    help = (
+        "Mavjud yozuvlar uchun hosila rasmlarni (thumbnail, web nusxa, model "
+        "kirishi) yaratadi. Avval yaratilganlar o'tkazib yuboriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2,
+                            help="Parallel oqimlar soni")
+        parser.add_argument('--limit', type=int,
+                            help="Ko'pi bilan shuncha yozuvni qayta ishlash")
+        parser.add_argument('--force', action='store_true',
+                            help="Mavjud hosila fayllarni ham qayta yaratish")
+
+    def _generate(self, diagnosis, force):
+        try:
+            derivatives.generate_derivatives(diagnosis, force=force)
+            return True
+        except Exception as e:
+            self.stderr.write(f"❌ {diagnosis.uuid}: {e}")
+            return False
+        finally:
+            close_old_connections()
+
+    def handle(self, *args, **options):
+        queryset = ThyroidDiagnosis.objects.only('uuid', 'thyroid_image').order_by('created_at')
+        if not options['force']:
+            queryset = queryset.filter(derived_at__isnull=True)
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='derivatives') as pool:
+            for ok in pool.map(
+                lambda diagnosis: self._generate(diagnosis, options['force']),
+                queryset.iterator(chunk_size=200)
+            ):
+                if ok:
+                    done += 1
+                else:
+                    failed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Yaratildi: {done}, xatolik: {failed}"))
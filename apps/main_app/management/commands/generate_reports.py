@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.main_app import reports
+from apps.main_app.models import ThyroidDiagnosis
+
+
+class Command(BaseCommand):
+    help = (
+        "Tayyor tashxislar uchun PDF xulosalarni oldindan render qiladi. "
+        "Ma'lumotlari yoki shablon versiyasi o'zgarmagan xulosalar o'tkazib yuboriladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2,
+                            help="Parallel render oqimlari soni")
+        parser.add_argument('--limit', type=int,
+                            help="Ko'pi bilan shuncha yozuvni ko'rib chiqish")
+        parser.add_argument('--force', action='store_true',
+                            help="Yangi xulosalarni ham qayta render qilish")
+
+    def _render(self, diagnosis, force):
+        try:
+            if not force and reports.is_fresh(diagnosis):
+                return 'skipped'
+            reports.ensure_report(diagnosis, force=force)
+            return 'rendered'
+        except Exception as e:
+            self.stderr.write(f"❌ {diagnosis.uuid}: {e}")
+            return 'failed'
+        finally:
+            close_old_connections()
+
+    def handle(self, *args, **options):
+        queryset = ThyroidDiagnosis.objects.filter(diagnosis__isnull=False).order_by('created_at')
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        counts = {'rendered': 0, 'skipped': 0, 'failed': 0}
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='report') as pool:
+            for outcome in pool.map(
+                lambda diagnosis: self._render(diagnosis, options['force']),
+                queryset.iterator(chunk_size=200)
+            ):
+                counts[outcome] += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Render qilindi: {counts['rendered']}, o'tkazildi: {counts['skipped']}, "
+            f"xatolik: {counts['failed']}"
+        ))
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.main_app import derivatives
+from apps.main_app.models import ThyroidDiagnosis
+from apps.main_app.preprocessing import decode_image_bytes, resize_for_model
+from apps.main_app.tensors import tensor_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Model kirishi tensorlarini (128x128x3 uint8) memmap shardlarga yig'adi. "
+        "Faqat shardlarda hali yo'q yozuvlar qo'shiladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shard-size', type=int, default=1024,
+                            help="Bitta sharddagi tensorlar soni (1024 ~ 48 MB)")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Tensorlarni parallel o'qish oqimlari soni")
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Mavjud shardlarni o'chirib, hammasini qaytadan yozish")
+
+    def _tensor(self, record):
+        """Yozuv yonidagi .npy, bo'lmasa asl rasmdan"""
+        try:
+            tensor = derivatives.load_tensor(record)
+            if tensor is None:
+                image = record.thyroid_image
+                with image.storage.open(image.name, 'rb') as f:
+                    img = decode_image_bytes(f.read())
+                tensor = resize_for_model(img) if img is not None else None
+            return record, tensor
+        except OSError as e:
+            self.stderr.write(f"❌ {record.uuid}: {e}")
+            return record, None
+        finally:
+            close_old_connections()
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            tensor_store.clear()
+
+        records = [
+            record
+            for record in ThyroidDiagnosis.objects.only('uuid', 'thyroid_image', 'derived_at')
+            .order_by('created_at').iterator(chunk_size=1000)
+            if not tensor_store.contains(record.pk, record.thyroid_image.name)
+        ]
+        self.stdout.write(f"📦 Shardda yo'q yozuvlar: {len(records)} (mavjud: {len(tensor_store)})")
+
+        shard_size = options['shard_size']
+        written = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='pack-tensors') as pool:
+            for start in range(0, len(records), shard_size):
+                items = []
+                for record, tensor in pool.map(self._tensor, records[start:start + shard_size]):
+                    if tensor is None:
+                        failed += 1
+                        continue
+                    items.append((record.pk, record.thyroid_image.name, tensor))
+
+                if items:
+                    path = tensor_store.write_shard(items)
+                    written += len(items)
+                    self.stdout.write(f"💾 {path}: {len(items)} tensor")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Yozildi: {written}, xatolik: {failed}"))
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main_app.registry import candidate_registry, registry
+from apps.main_app.reloading import ModelValidationError, reload_model, trigger_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Model katalogidagi artefaktlarni yuklab, canary to'plamida tekshiradi va "
+        "reload.trigger faylini yangilaydi: MODEL_RELOAD_WATCH yoqilgan workerlar "
+        "modelni qayta ishga tushmasdan almashtiradi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidate', action='store_true',
+                            help="Nomzod modelni (MODEL_CANDIDATE_DIR) qayta yuklash")
+        parser.add_argument('--samples', type=int, default=settings.MODEL_RELOAD_CANARY_SAMPLES,
+                            help="Canary tekshiruvi uchun oxirgi tashxislar soni")
+        parser.add_argument('--max-diff', type=float, default=settings.MODEL_RELOAD_MAX_DIFF,
+                            help="Saqlangan bashoratlardan ruxsat etilgan eng katta farq")
+        parser.add_argument('--check-only', action='store_true',
+                            help="Faqat tekshirish, workerlarga signal yubormaslik")
+
+    def handle(self, *args, **options):
+        model_registry = candidate_registry if options['candidate'] else registry
+        if model_registry is None:
+            raise CommandError("Nomzod model sozlanmagan (MODEL_CANDIDATE_DIR)")
+
+        try:
+            _, report = reload_model(
+                model_registry,
+                samples=options['samples'],
+                max_diff=options['max_diff'],
+                force=True
+            )
+        except (ModelValidationError, RuntimeError) as e:
+            raise CommandError(f"Model tekshiruvdan o'tmadi: {e}")
+
+        self.stdout.write(
+            f"🔍 {model_registry.name} {report['version']}: {report['samples']} namuna, "
+            f"predict {report['predict_time'] * 1000:.0f} ms"
+        )
+        if report['max_diff'] is not None:
+            self.stdout.write(
+                f"   saqlangan bashoratlardan max farq: {report['max_diff']:.4f}, "
+                f"klassi o'zgargan: {report['class_changes']}"
+            )
+
+        if options['check_only']:
+            self.stdout.write(self.style.SUCCESS("✅ Tekshiruv o'tdi"))
+            return
+
+        path = trigger_path(model_registry)
+        with open(path, 'w') as f:
+            f.write(f"{report['version']}\n")
+        self.stdout.write(self.style.SUCCESS(f"✅ Workerlarga signal yuborildi: {path}"))
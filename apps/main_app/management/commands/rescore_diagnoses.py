@@ -0,0 +1,183 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.main_app import page_cache, stats
+from apps.main_app.batching import BatchBuffers
+from apps.main_app.models import ThyroidDiagnosis
+from apps.main_app.registry import registry
+from apps.main_app.services import (
+    PATIENT_FIELDS,
+    build_feature_matrix,
+    interpret_prediction,
+    patient_data_from_record,
+    scale_features,
+)
+from apps.main_app.tensors import load_model_input
+
+
+RESULT_FIELDS = [
+    'diagnosis',
+    'diagnosis_detail',
+    'confidence',
+    'risk_level',
+    'diagnosis_class',
+    'prediction_value',
+    'model_version',
+    'recommendations',
+    'updated_at',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Barcha ThyroidDiagnosis yozuvlarini joriy model bilan qayta baholaydi "
+        "(batch predict + bulk_update, to'xtatilgan joyidan davom ettirish mumkin)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=256,
+            help="Bitta model.predict chaqiruvidagi yozuvlar soni"
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 4,
+            help="Rasmlarni parallel o'qish uchun oqimlar soni"
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default='rescore_diagnoses.checkpoint',
+            help="Oxirgi qayta ishlangan UUID saqlanadigan fayl"
+        )
+        parser.add_argument(
+            '--after',
+            help="Shu UUID dan keyingi yozuvlardan boshlash (checkpoint'dan ustun)"
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help="Checkpoint'ni e'tiborsiz qoldirib boshidan boshlash"
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help="Ko'pi bilan shuncha yozuvni qayta baholash"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Natijalarni bazaga yozmaslik"
+        )
+
+    def _read_checkpoint(self, path):
+        if os.path.exists(path):
+            with open(path) as f:
+                return f.read().strip() or None
+        return None
+
+    def _write_checkpoint(self, path, last_pk):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(last_pk))
+        os.replace(tmp_path, path)
+
+    def _score_batch(self, records, pool):
+        """Bitta batch: tensorlar (shard/.npy, bo'lmasa rasm) -> features -> predict"""
+        images = list(pool.map(load_model_input, records))
+
+        valid = [i for i, image in enumerate(images) if image is not None]
+        if not valid:
+            return [], len(records)
+
+        records = [records[i] for i in valid]
+        patients = [patient_data_from_record(record) for record in records]
+
+        image_batch = self.buffers.concatenate('images', [images[i] for i in valid])
+        features = scale_features(build_feature_matrix(patients))
+        predictions = np.asarray(registry.get_model().predict(image_batch, features)).reshape(-1)
+
+        now = timezone.now()
+        for record, patient, pred_value in zip(records, patients, predictions):
+            for field, value in interpret_prediction(float(pred_value), patient).items():
+                setattr(record, field, value)
+            record.model_version = registry.version
+            record.updated_at = now
+
+        return records, len(images) - len(valid)
+
+    def handle(self, *args, **options):
+        if registry.get_model() is None:
+            raise CommandError(f"Model yuklanmagan: {registry.error}")
+
+        batch_size = options['batch_size']
+        self.buffers = BatchBuffers(batch_size)
+        checkpoint = options['checkpoint']
+
+        after = options['after']
+        if after is None and not options['restart']:
+            after = self._read_checkpoint(checkpoint)
+
+        queryset = ThyroidDiagnosis.objects.only(
+            'uuid', 'created_at', 'thyroid_image', 'derived_at', *PATIENT_FIELDS
+        ).order_by('uuid')
+        if after:
+            queryset = queryset.filter(uuid__gt=after)
+            self.stdout.write(f"↪️ Davom ettirish: {after} dan keyin")
+        if options['limit']:
+            queryset = queryset[:options['limit']]
+
+        processed = skipped = 0
+        affected_days = set()
+        started = time.perf_counter()
+
+        def flush(batch):
+            nonlocal processed, skipped
+            scored, failed = self._score_batch(batch, pool)
+            if scored and not options['dry_run']:
+                ThyroidDiagnosis.objects.bulk_update(scored, RESULT_FIELDS, batch_size=batch_size)
+                # bulk_update signal yubormaydi - natija sahifalari keshini qo'lda o'chiramiz
+                page_cache.invalidate(*[record.pk for record in scored])
+                affected_days.update(timezone.localtime(record.created_at).date() for record in scored)
+            if not options['dry_run']:
+                self._write_checkpoint(checkpoint, batch[-1].pk)
+
+            processed += len(scored)
+            skipped += failed
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"📊 {processed} qayta baholandi, {skipped} o'tkazib yuborildi "
+                f"({processed / elapsed:.1f} yozuv/s)"
+            )
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            batch = []
+            for record in queryset.iterator(chunk_size=batch_size):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+
+        # bulk_update'dan keyin DailyStat eskirgan - o'zgargan kunlarni qayta yig'ish
+        if affected_days:
+            rows = stats.rollup_days(affected_days)
+            self.stdout.write(f"📊 Statistika yangilandi: {len(affected_days)} kun, {rows} qator")
+
+        # To'liq o'tildi - keyingi model versiyasi boshidan boshlaydi
+        if not options['limit'] and not options['dry_run'] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Tayyor: {processed} yozuv, {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed else 0:.1f} yozuv/s)"
+        ))
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.main_app import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Kunlik yig'ma statistikani (DailyStat) yangilaydi: watermark'dan keyingi "
+        "yangi yozuvlar qo'shiladi, o'zgargan yozuvlar kunlari qayta hisoblanadi; "
+        "oxirgi N kunni qayta hisoblash uchun --days, butun tarix uchun --full. "
+        "Cron orqali yoki --loop bilan yagona fon jarayoni sifatida ishlatiladi "
+        "(web workerlar statistikani yangilamaydi)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Oxirgi N kunni qayta hisoblash")
+        parser.add_argument('--full', action='store_true', help="Butun tarixni qayta hisoblash")
+        parser.add_argument('--loop', action='store_true',
+                            help="To'xtatilguncha har --interval soniyada yangilash")
+        parser.add_argument('--interval', type=float, default=settings.STATS_ROLLUP_INTERVAL,
+                            help="--loop rejimida yangilashlar orasidagi vaqt (soniya)")
+
+    def _refresh(self, full=False, days=None):
+        started = time.perf_counter()
+        if full or days is not None:
+            day_count, rows = stats.refresh_daily_stats(full=full, days=days)
+            result = f"{day_count} kun qayta hisoblandi, {rows} qator"
+        else:
+            new_rows, day_count = stats.update_daily_stats()
+            result = f"{new_rows} yangi yozuv, {day_count} kun qayta hisoblandi"
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Statistika yangilandi: {result} ({elapsed:.1f}s), "
+            f"watermark: {stats.watermark() or '-'}"
+        ))
+
+    def handle(self, *args, **options):
+        if options['days'] is not None and options['days'] < 1:
+            raise CommandError("--days kamida 1 bo'lishi kerak")
+        if options['loop'] and options['interval'] <= 0:
+            raise CommandError("--interval 0 dan katta bo'lishi kerak")
+
+        self._refresh(full=options['full'], days=options['days'])
+
+        while options['loop']:
+            time.sleep(options['interval'])
+            close_old_connections()
+            try:
+                self._refresh()
+            except Exception as e:
+                self.stderr.write(f"❌ Statistika yangilash xatoligi: {e}")
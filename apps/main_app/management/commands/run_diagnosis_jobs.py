@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.main_app import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "DB navbatidagi asinxron tashxis vazifalarini bajaradi "
+        "(alohida worker jarayoni yoki qayta tiklash uchun)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.DIAGNOSIS_JOB_WORKERS,
+            help="Parallel worker oqimlari soni"
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help="Navbat bo'sh bo'lganda kutish vaqti (soniya)"
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Navbatni bir marta bo'shatib chiqish"
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        self.stdout.write(f"🚀 Tashxis worker ishga tushdi ({workers} oqim)")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='diagnosis-job') as pool:
+            while True:
+                requeued = jobs.requeue_stale(
+                    settings.DIAGNOSIS_JOB_TIMEOUT,
+                    settings.DIAGNOSIS_JOB_MAX_ATTEMPTS
+                )
+                if requeued:
+                    self.stdout.write(self.style.WARNING(f"🔄 Qayta navbatga: {requeued}"))
+
+                job_ids = jobs.pending_job_ids(limit=workers * 4)
+                if job_ids:
+                    list(pool.map(jobs.process_job, job_ids))
+                    self.stdout.write(f"✅ Bajarildi: {len(job_ids)}")
+                    continue
+
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,176 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ============================================================================
+# METRIKALAR (PROMETHEUS TEXT FORMAT)
+# ============================================================================
+# Har bir worker jarayoni o'z metrikalarini xotirada saqlaydi. Qiymatlar
+# oddiy lock ostida yangilanadi - bitta kuzatuv bir necha mikrosoniya.
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    parts = ','.join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return '{' + parts + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class Histogram:
+    """Bucket'li gistogramma (Prometheus histogram bilan mos)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Bucket'lar bo'yicha chiziqli interpolyatsiya bilan taxminiy kvantil"""
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for upper, bucket_count in zip(self.buckets, self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Counter, gauge va gistogrammalar to'plami"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+
+    def _after_fork(self):
+        """Fork'dan keyin: lock'ni yangilash, ota jarayon qiymatlarini tozalash"""
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def register_collector(self, collector):
+        """/metrics so'ralganda chaqiriladi: [(name, type, labels, value), ...] qaytaradi"""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def span(self, stage):
+        """Bosqich vaqtini o'lchash; xatolik bo'lsa stage bo'yicha hisoblash"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc('thyroid_stage_errors_total', stage=stage)
+            raise
+        finally:
+            self.observe('thyroid_stage_latency_seconds', time.perf_counter() - started, stage=stage)
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        typed = set()
+
+        def header(name, metric_type):
+            if name in typed:
+                return
+            typed.add(name)
+            if name in self._help:
+                lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                ((key, (h.buckets, list(h.counts), h.sum, h.count, [h.quantile(q) for q in QUANTILES]))
+                 for key, h in self._histograms.items()),
+                key=lambda item: item[0]
+            )
+
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(f'{name}{_format_labels(dict(labels))} {_format_value(value)}')
+
+        for (name, labels), (buckets, counts, total, count, _) in histograms:
+            labels = dict(labels)
+            header(name, 'histogram')
+            cumulative = 0
+            for upper, bucket_count in zip((*buckets, float('inf')), counts):
+                cumulative += bucket_count
+                bucket_labels = {**labels, 'le': _format_value(upper)}
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+            lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+        # Taxminiy kvantillar alohida gauge sifatida (p50/p95/p99)
+        for (name, labels), (_, _, _, _, quantiles) in histograms:
+            quantile_name = f'{name.removesuffix("_seconds")}_quantile_seconds'
+            header(quantile_name, 'gauge')
+            for q, value in zip(QUANTILES, quantiles):
+                quantile_labels = {**dict(labels), 'quantile': q}
+                lines.append(f'{quantile_name}{_format_labels(quantile_labels)} {_format_value(value)}')
+
+        for collector in self._collectors:
+            for name, metric_type, labels, value in collector():
+                header(name, metric_type)
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metrics._after_fork)
+
+metrics.describe('thyroid_diagnosis_requests_total', "Tashxis so'rovlari soni (natija bo'yicha)")
+metrics.describe('thyroid_stage_errors_total', "Bosqichlar bo'yicha xatoliklar soni")
+metrics.describe('thyroid_stage_latency_seconds', "Tashxis bosqichlari davomiyligi")
+metrics.describe(
+    'thyroid_stage_latency_quantile_seconds',
+    "Bosqichlar davomiyligining taxminiy kvantillari (bucket interpolyatsiyasi)"
+)
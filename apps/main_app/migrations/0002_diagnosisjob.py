@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DiagnosisJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Navbatda'), ('running', 'Bajarilmoqda'), ('done', 'Tayyor'), ('failed', 'Xatolik')], default='pending', max_length=20, verbose_name='Holat')),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Foizda (0-100)', verbose_name='Jarayon')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Urinishlar soni')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Xatolik')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqti')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Boshlangan vaqti')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan vaqti')),
+                ('diagnosis', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job', to='main_app.thyroiddiagnosis', verbose_name='Tashxis')),
+            ],
+            options={
+                'verbose_name': 'Tashxis Vazifasi',
+                'verbose_name_plural': 'Tashxis Vazifalari',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='main_app_di_status_bb9782_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_diagnosisjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='report_file',
+            field=models.FileField(blank=True, null=True, upload_to='reports/%Y/%m/', verbose_name='Xulosa fayli'),
+        ),
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='report_fingerprint',
+            field=models.CharField(blank=True, help_text="Ma'lumotlar va shablon versiyasi kaliti", max_length=32, null=True, verbose_name='Xulosa versiyasi'),
+        ),
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='report_hash',
+            field=models.CharField(blank=True, help_text='Fayl mazmunining SHA-256 qiymati (ETag)', max_length=64, null=True, verbose_name='Xulosa hash'),
+        ),
+    ]
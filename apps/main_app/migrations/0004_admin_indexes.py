@@ -0,0 +1,80 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:29
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+# Admin qidiruvi (icontains -> UPPER(...) LIKE '%...%') uchun trigram indekslar.
+# Faqat PostgreSQL; pg_trgm kengaytmasini yaratishga huquq bo'lmasa o'tkaziladi.
+TRIGRAM_INDEXES = [
+    ('main_app_th_notes_trgm_idx', 'UPPER("notes")'),
+    ('main_app_th_diagnosis_trgm_idx', 'UPPER("diagnosis"::text)'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        return
+
+    for name, expression in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "main_app_thyroiddiagnosis" '
+            f'USING gin ({expression} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_diagnosis_report'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='thyroiddiagnosis',
+            name='main_app_th_diagnos_fdb6a9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='thyroiddiagnosis',
+            name='main_app_th_is_down_ca2cb0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['diagnosis_class', '-created_at'], name='main_app_th_diagnos_f8eab0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['is_downloaded', '-created_at'], name='main_app_th_is_down_5bd772_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['risk_level', '-created_at'], name='main_app_th_risk_le_407ec4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['gender', '-created_at'], name='main_app_th_gender_aad045_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['country', '-created_at'], name='main_app_th_country_440cf9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['ethnicity', '-created_at'], name='main_app_th_ethnici_ab1f0b_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
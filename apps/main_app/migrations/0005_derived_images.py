@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='derived_at',
+            field=models.DateTimeField(blank=True, help_text="Thumbnail, web nusxa va model kirishi tayyor bo'lgan vaqt", null=True, verbose_name='Hosila rasmlar yaratilgan vaqti'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_derived_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='model_version',
+            field=models.CharField(blank=True, help_text="Bashoratni bergan model va scaler fayllari hash'i", max_length=32, null=True, verbose_name='Model versiyasi'),
+        ),
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='shadow_model_version',
+            field=models.CharField(blank=True, help_text='Shadow rejimida baholagan nomzod model', max_length=32, null=True, verbose_name='Nomzod model versiyasi'),
+        ),
+        migrations.AddField(
+            model_name='thyroiddiagnosis',
+            name='shadow_prediction_value',
+            field=models.FloatField(blank=True, help_text="Nomzod model qiymati (0-1), foydalanuvchiga ko'rsatilmaydi", null=True, verbose_name='Nomzod model bashorati'),
+        ),
+        migrations.AddIndex(
+            model_name='thyroiddiagnosis',
+            index=models.Index(fields=['model_version', '-created_at'], name='main_app_th_model_v_98c0df_idx'),
+        ),
+    ]
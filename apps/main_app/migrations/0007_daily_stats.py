@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0006_model_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Kun')),
+                ('dimension', models.CharField(choices=[('all', 'Barchasi'), ('diagnosis_class', 'Tashxis klassi'), ('risk_level', 'Xavf darajasi'), ('gender', 'Jinsi'), ('country', 'Mamlakat'), ('ethnicity', 'Milat'), ('age_group', 'Yosh guruhi'), ('model_version', 'Model versiyasi')], max_length=20, verbose_name="O'lcham")),
+                ('value', models.CharField(blank=True, default='', max_length=50, verbose_name='Qiymat')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Jami')),
+                ('diagnosed', models.PositiveIntegerField(default=0, help_text='Model natijasi bor yozuvlar', verbose_name="Tashxis qo'yilgan")),
+                ('malignant', models.PositiveIntegerField(default=0, help_text='Bashorat qiymati 0.5 dan katta', verbose_name='Xavfli')),
+                ('confidence_sum', models.FloatField(default=0, help_text="O'rtacha ishonch = confidence_sum / diagnosed", verbose_name="Ishonch yig'indisi")),
+                ('downloaded', models.PositiveIntegerField(default=0, verbose_name='Yuklab olingan')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')),
+            ],
+            options={
+                'verbose_name': 'Kunlik Statistika',
+                'verbose_name_plural': 'Kunlik Statistika',
+                'ordering': ['-day', 'dimension', 'value'],
+                'indexes': [models.Index(fields=['dimension', '-day'], name='main_app_da_dimensi_649873_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'dimension', 'value'), name='daily_stat_unique_key')],
+            },
+        ),
+    ]
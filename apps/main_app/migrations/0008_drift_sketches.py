@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriftSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(blank=True, null=True, verbose_name='Kun')),
+                ('feature', models.CharField(max_length=30, verbose_name='Belgi')),
+                ('model_version', models.CharField(blank=True, default='', max_length=32, verbose_name='Model versiyasi')),
+                ('counts', models.JSONField(default=list, verbose_name="Bin'lar")),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Soni')),
+                ('value_sum', models.FloatField(default=0, verbose_name="Qiymatlar yig'indisi")),
+                ('value_sum_sq', models.FloatField(default=0, verbose_name="Kvadratlar yig'indisi")),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')),
+            ],
+            options={
+                'verbose_name': 'Drift Gistogrammasi',
+                'verbose_name_plural': 'Drift Monitoringi',
+                'ordering': ['-day', 'feature'],
+                'indexes': [models.Index(fields=['model_version', 'feature', '-day'], name='main_app_dr_model_v_b1831d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'feature', 'model_version'), name='drift_sketch_unique_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+def remove_duplicate_references(apps, schema_editor):
+    """Har bir (belgi, versiya) uchun eng oxirgi saqlangan mos yozuv qoladi"""
+    DriftSketch = apps.get_model('main_app', 'DriftSketch')
+    seen = set()
+    duplicates = []
+    for pk, feature, model_version in DriftSketch.objects.filter(day__isnull=True).order_by(
+        'feature', 'model_version', '-updated_at', '-pk'
+    ).values_list('pk', 'feature', 'model_version'):
+        if (feature, model_version) in seen:
+            duplicates.append(pk)
+        seen.add((feature, model_version))
+    if duplicates:
+        DriftSketch.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0008_drift_sketches'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_references, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='driftsketch',
+            constraint=models.UniqueConstraint(condition=models.Q(('day__isnull', True)), fields=('feature', 'model_version'), name='drift_sketch_unique_reference'),
+        ),
+    ]
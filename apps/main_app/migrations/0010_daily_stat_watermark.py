@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0009_drift_reference_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStatDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='Kun')),
+                ('marked_at', models.DateTimeField(auto_now_add=True, verbose_name='Belgilangan vaqti')),
+            ],
+            options={
+                'verbose_name': 'Qayta hisoblanadigan kun',
+                'verbose_name_plural': 'Qayta hisoblanadigan kunlar',
+                'ordering': ['day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStatState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rows_until', models.DateTimeField(blank=True, null=True, verbose_name="Yig'ilgan yozuvlar chegarasi")),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan vaqti')),
+            ],
+            options={
+                'verbose_name': 'Statistika holati',
+                'verbose_name_plural': 'Statistika holati',
+            },
+        ),
+    ]
@@ -195,6 +195,29 @@ class ThyroidDiagnosis(models.Model):
         help_text=_("AI model chiqargan qiymat (0-1)")
     )
 
+    model_version = models.CharField(
+        _("Model versiyasi"),
+        max_length=32,
+        blank=True,
+        null=True,
+        help_text=_("Bashoratni bergan model va scaler fayllari hash'i")
+    )
+
+    shadow_model_version = models.CharField(
+        _("Nomzod model versiyasi"),
+        max_length=32,
+        blank=True,
+        null=True,
+        help_text=_("Shadow rejimida baholagan nomzod model")
+    )
+
+    shadow_prediction_value = models.FloatField(
+        _("Nomzod model bashorati"),
+        blank=True,
+        null=True,
+        help_text=_("Nomzod model qiymati (0-1), foydalanuvchiga ko'rsatilmaydi")
+    )
+
     recommendations = models.JSONField(
         _("Tavsiyalar"),
         blank=True,
@@ -223,6 +246,39 @@ class ThyroidDiagnosis(models.Model):
         null=True
     )
 
+    derived_at = models.DateTimeField(
+        _("Hosila rasmlar yaratilgan vaqti"),
+        blank=True,
+        null=True,
+        help_text=_("Thumbnail, web nusxa va model kirishi tayyor bo'lgan vaqt")
+    )
+
+    # ============================================================================
+    # XULOSA FAYLI (oldindan render qilingan)
+    # ============================================================================
+    report_file = models.FileField(
+        _("Xulosa fayli"),
+        upload_to='reports/%Y/%m/',
+        blank=True,
+        null=True
+    )
+
+    report_hash = models.CharField(
+        _("Xulosa hash"),
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text=_("Fayl mazmunining SHA-256 qiymati (ETag)")
+    )
+
+    report_fingerprint = models.CharField(
+        _("Xulosa versiyasi"),
+        max_length=32,
+        blank=True,
+        null=True,
+        help_text=_("Ma'lumotlar va shablon versiyasi kaliti")
+    )
+
     # ============================================================================
     # TIMESTAMPLAR
     # ============================================================================
@@ -240,10 +296,16 @@ class ThyroidDiagnosis(models.Model):
         verbose_name = _("Qalqonsimon Bez Tashxisi")
         verbose_name_plural = _("Qalqonsimon Bez Tashxislari")
         ordering = ['-created_at']
+        # Admin filtrlari + standart tartib (-created_at) uchun kompozit indekslar
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['diagnosis_class']),
-            models.Index(fields=['is_downloaded']),
+            models.Index(fields=['diagnosis_class', '-created_at']),
+            models.Index(fields=['is_downloaded', '-created_at']),
+            models.Index(fields=['risk_level', '-created_at']),
+            models.Index(fields=['gender', '-created_at']),
+            models.Index(fields=['country', '-created_at']),
+            models.Index(fields=['ethnicity', '-created_at']),
+            models.Index(fields=['model_version', '-created_at']),
         ]
 
     def __str__(self):
@@ -254,12 +316,32 @@ class ThyroidDiagnosis(models.Model):
         return reverse('diagnosis_detail', kwargs={'uuid': self.uuid})
 
     def mark_as_downloaded(self):
-        """Yuklab olingan deb belgilash"""
+        """Yuklab olingan deb belgilash (bazada atomik F() bilan)"""
+        from django.conf import settings
+        from django.db.models import F
         from django.utils import timezone
+
+        now = timezone.now()
+        first_download = not self.is_downloaded
         self.is_downloaded = True
         self.download_count += 1
-        self.last_downloaded_at = timezone.now()
-        self.save(update_fields=['is_downloaded', 'download_count', 'last_downloaded_at', 'updated_at'])
+        self.last_downloaded_at = now
+
+        if settings.DOWNLOAD_COUNTER_BUFFERED:
+            from .downloads import download_counter
+            download_counter.record(self.pk, now)
+            return
+
+        ThyroidDiagnosis.objects.filter(pk=self.pk).update(
+            is_downloaded=True,
+            download_count=F('download_count') + 1,
+            last_downloaded_at=now
+        )
+
+        if first_download:
+            # DailyStat.downloaded - yozuv kuni qayta hisoblanadi
+            from . import stats
+            stats.mark_days_dirty([timezone.localtime(self.created_at).date()])
 
     @property
     def is_high_risk(self):
@@ -285,4 +367,270 @@ class ThyroidDiagnosis(models.Model):
         elif self.age < 65:
             return _("Keksa")
         else:
-            return _("Katta yosh")
\ No newline at end of file
+            return _("Katta yosh")
+
+
+class DiagnosisJob(models.Model):
+    """Asinxron tashxis navbati (DB asosidagi, tashqi broker talab qilinmaydi)"""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Navbatda')),
+        (STATUS_RUNNING, _('Bajarilmoqda')),
+        (STATUS_DONE, _('Tayyor')),
+        (STATUS_FAILED, _('Xatolik')),
+    ]
+
+    diagnosis = models.OneToOneField(
+        ThyroidDiagnosis,
+        on_delete=models.CASCADE,
+        related_name='job',
+        verbose_name=_("Tashxis")
+    )
+
+    status = models.CharField(
+        _("Holat"),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+
+    progress = models.PositiveSmallIntegerField(
+        _("Jarayon"),
+        default=0,
+        help_text=_("Foizda (0-100)")
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        _("Urinishlar soni"),
+        default=0
+    )
+
+    error = models.TextField(
+        _("Xatolik"),
+        blank=True,
+        null=True
+    )
+
+    created_at = models.DateTimeField(
+        _("Yaratilgan vaqti"),
+        auto_now_add=True
+    )
+
+    started_at = models.DateTimeField(
+        _("Boshlangan vaqti"),
+        blank=True,
+        null=True
+    )
+
+    finished_at = models.DateTimeField(
+        _("Tugagan vaqti"),
+        blank=True,
+        null=True
+    )
+
+    class Meta:
+        verbose_name = _("Tashxis Vazifasi")
+        verbose_name_plural = _("Tashxis Vazifalari")
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.diagnosis_id} - {self.get_status_display()} ({self.progress}%)"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+
+class DailyStat(models.Model):
+    """
+    Kunlik yig'ma statistika (dashboard uchun): kun + o'lcham + qiymat.
+
+    ThyroidDiagnosis jadvalidan stats.update_daily_stats orqali yangilanadi;
+    dashboard so'rovlari yozuvlar soniga emas, kunlar soniga bog'liq.
+    """
+
+    DIMENSION_CHOICES = [
+        ('all', _('Barchasi')),
+        ('diagnosis_class', _('Tashxis klassi')),
+        ('risk_level', _('Xavf darajasi')),
+        ('gender', _('Jinsi')),
+        ('country', _('Mamlakat')),
+        ('ethnicity', _('Milat')),
+        ('age_group', _('Yosh guruhi')),
+        ('model_version', _('Model versiyasi')),
+    ]
+
+    day = models.DateField(_("Kun"))
+
+    dimension = models.CharField(
+        _("O'lcham"),
+        max_length=20,
+        choices=DIMENSION_CHOICES
+    )
+
+    value = models.CharField(
+        _("Qiymat"),
+        max_length=50,
+        blank=True,
+        default=''
+    )
+
+    total = models.PositiveIntegerField(_("Jami"), default=0)
+
+    diagnosed = models.PositiveIntegerField(
+        _("Tashxis qo'yilgan"),
+        default=0,
+        help_text=_("Model natijasi bor yozuvlar")
+    )
+
+    malignant = models.PositiveIntegerField(
+        _("Xavfli"),
+        default=0,
+        help_text=_("Bashorat qiymati 0.5 dan katta")
+    )
+
+    confidence_sum = models.FloatField(
+        _("Ishonch yig'indisi"),
+        default=0,
+        help_text=_("O'rtacha ishonch = confidence_sum / diagnosed")
+    )
+
+    downloaded = models.PositiveIntegerField(
+        _("Yuklab olingan"),
+        default=0
+    )
+
+    updated_at = models.DateTimeField(
+        _("Yangilangan vaqti"),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _("Kunlik Statistika")
+        verbose_name_plural = _("Kunlik Statistika")
+        ordering = ['-day', 'dimension', 'value']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'dimension', 'value'], name='daily_stat_unique_key'),
+        ]
+        indexes = [
+            models.Index(fields=['dimension', '-day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.dimension}={self.value}: {self.total}"
+
+    @property
+    def malignant_rate(self):
+        return self.malignant / self.diagnosed if self.diagnosed else None
+
+    @property
+    def mean_confidence(self):
+        return self.confidence_sum / self.diagnosed if self.diagnosed else None
+
+
+class DailyStatState(models.Model):
+    """
+    DailyStat yangilash holati (yagona qator).
+
+    ``rows_until`` - qator darajasidagi watermark: shu vaqtgacha yaratilgan
+    yozuvlar DailyStat'ga qo'shilgan, keyingi yangilash faqat undan keyingi
+    yozuvlarni o'qiydi. Qator qulflanadi - rollup'lar ketma-ket bajariladi.
+    """
+
+    rows_until = models.DateTimeField(_("Yig'ilgan yozuvlar chegarasi"), blank=True, null=True)
+
+    updated_at = models.DateTimeField(
+        _("Yangilangan vaqti"),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _("Statistika holati")
+        verbose_name_plural = _("Statistika holati")
+
+    def __str__(self):
+        return f"{self.rows_until or '-'}"
+
+
+class DailyStatDirtyDay(models.Model):
+    """
+    Qayta hisoblanishi kerak bo'lgan kun: watermark'dan oldin yaratilgan yozuv
+    o'zgardi (yuklab olindi, asinxron natija, tahrir yoki o'chirish).
+    """
+
+    day = models.DateField(_("Kun"), unique=True)
+
+    marked_at = models.DateTimeField(
+        _("Belgilangan vaqti"),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _("Qayta hisoblanadigan kun")
+        verbose_name_plural = _("Qayta hisoblanadigan kunlar")
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day}"
+
+
+class DriftSketch(models.Model):
+    """
+    Belgi yoki bashorat qiymatining kunlik gistogrammasi (drift monitoringi).
+
+    Qat'iy bin'lar - o'lchami o'zgarmas va qo'shish orqali birlashtiriladi
+    (workerlar buferlari, kunlar). ``day`` bo'sh bo'lsa - mos yozuv (reference)
+    taqsimoti. Belgilar scaler bo'yicha standartlashtirilgan (z) fazoda saqlanadi.
+    """
+
+    day = models.DateField(_("Kun"), blank=True, null=True)
+
+    feature = models.CharField(_("Belgi"), max_length=30)
+
+    model_version = models.CharField(
+        _("Model versiyasi"),
+        max_length=32,
+        blank=True,
+        default=''
+    )
+
+    counts = models.JSONField(_("Bin'lar"), default=list)
+
+    count = models.PositiveIntegerField(_("Soni"), default=0)
+
+    value_sum = models.FloatField(_("Qiymatlar yig'indisi"), default=0)
+
+    value_sum_sq = models.FloatField(_("Kvadratlar yig'indisi"), default=0)
+
+    updated_at = models.DateTimeField(
+        _("Yangilangan vaqti"),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _("Drift Gistogrammasi")
+        verbose_name_plural = _("Drift Monitoringi")
+        ordering = ['-day', 'feature']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'feature', 'model_version'], name='drift_sketch_unique_key'),
+            # UNIQUE NULL'larni bir xil hisoblamaydi - mos yozuv (day=NULL) uchun alohida
+            models.UniqueConstraint(
+                fields=['feature', 'model_version'],
+                condition=models.Q(day__isnull=True),
+                name='drift_sketch_unique_reference',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['model_version', 'feature', '-day']),
+        ]
+
+    def __str__(self):
+        return f"{self.day or 'reference'} {self.feature} ({self.model_version or '-'}): {self.count}"
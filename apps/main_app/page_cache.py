@@ -0,0 +1,139 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.safestring import mark_safe
+
+
+# ============================================================================
+# NATIJA SAHIFASI KESHI VA SHARTLI GET
+# ============================================================================
+# Tayyor tashxis o'zgarmaydi (yuklab olish hisobi sahifada ko'rinmaydi), shu
+# sabab sahifa mazmuni uuid + til bo'yicha keshlanadi: keshdan topilsa DB
+# so'rovi ham, 17 KB shablon render'i ham bo'lmaydi. Sahifaning qolgan qismi
+# (header/footer - CSRF tokeni bilan) har so'rovda arzon render qilinadi.
+# ETag/Last-Modified updated_at'dan - brauzer qayta ochganda 304 oladi.
+# Yozuv sahifada ko'rinadigan maydonlari bilan saqlansa kesh o'chiriladi.
+
+CONTENT_TEMPLATE = 'includes/diagnosis_result_content.html'
+
+# get_detail_context ishlatadigan maydonlar
+PAGE_FIELDS = {
+    'diagnosis', 'diagnosis_detail', 'confidence', 'risk_level',
+    'diagnosis_class', 'recommendations', 'age', 'gender', 'tsh_level',
+    't3_level', 't4_level', 'nodule_size', 'created_at',
+}
+
+
+def get_detail_context(diagnosis, job=None):
+    """Natija sahifasi konteksti (DB so'rovlarisiz)"""
+    return {
+        'success': True,
+        'uuid': str(diagnosis.uuid),
+        'diagnosis': diagnosis.diagnosis,
+        'diagnosis_detail': diagnosis.diagnosis_detail,
+        'confidence': diagnosis.confidence,
+        'risk_level': diagnosis.risk_level,
+        'diagnosis_class': diagnosis.diagnosis_class,
+        'recommendations': diagnosis.recommendations,
+        'patient_data': {
+            'age': diagnosis.age,
+            'gender': diagnosis.gender,
+            'tsh': diagnosis.tsh_level,
+            't3': diagnosis.t3_level,
+            't4': diagnosis.t4_level,
+            'nodule_size': diagnosis.nodule_size
+        },
+        'created_at': diagnosis.created_at,
+        'pending': not diagnosis.diagnosis,
+        'job': job
+    }
+
+
+def cache_key(pk, language=None):
+    return f'diagnosis_page:{pk}:{language or translation.get_language()}'
+
+
+def get_entry(pk):
+    """Keshlangan sahifa mazmuni (joriy til uchun) yoki None"""
+    if not settings.RESULT_PAGE_CACHE_TIMEOUT:
+        return None
+    return cache.get(cache_key(pk))
+
+
+async def aget_entry(pk):
+    if not settings.RESULT_PAGE_CACHE_TIMEOUT:
+        return None
+    return await cache.aget(cache_key(pk))
+
+
+def render_entry(diagnosis, job=None):
+    """Sahifa mazmunini render qilish; tayyor tashxis bo'lsa keshga yozish"""
+    context = get_detail_context(diagnosis, job)
+    entry = {
+        'uuid': context['uuid'],
+        'html': render_to_string(CONTENT_TEMPLATE, context),
+        'updated_at': diagnosis.updated_at,
+        'pending': context['pending'],
+        'job': job,
+    }
+    if not entry['pending'] and settings.RESULT_PAGE_CACHE_TIMEOUT:
+        cache.set(cache_key(diagnosis.pk), entry, settings.RESULT_PAGE_CACHE_TIMEOUT)
+    return entry
+
+
+def warm(diagnosis):
+    """Yangi yozuv sahifasini redirect'dan oldin keshga tayyorlash (joriy til)"""
+    if settings.RESULT_PAGE_CACHE_TIMEOUT and diagnosis.diagnosis:
+        render_entry(diagnosis)
+
+
+def invalidate(*pks):
+    """Barcha tillar bo'yicha keshni o'chirish"""
+    cache.delete_many([cache_key(pk, code) for pk in pks for code, _ in settings.LANGUAGES])
+
+
+def invalidate_on_save(sender, instance, update_fields=None, **kwargs):
+    """post_save/post_delete: sahifada ko'rinmaydigan maydonlar saqlansa kesh qoladi"""
+    if update_fields is not None and not PAGE_FIELDS.intersection(update_fields):
+        return
+    invalidate(instance.pk)
+
+
+def make_etag(request, entry):
+    # CSRF cookie ham kiradi: header'dagi formalar tokeni eskirmasligi uchun
+    raw = '|'.join([
+        entry['uuid'],
+        entry['updated_at'].isoformat(),
+        translation.get_language() or '',
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    ])
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def page_response(request, entry):
+    """Natija sahifasi: tayyor tashxis uchun ETag/Last-Modified va 304"""
+    etag = last_modified = response = None
+    if not entry['pending']:
+        etag = make_etag(request, entry)
+        last_modified = int(entry['updated_at'].timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    if response is None:
+        response = render(request, 'diagnosis_result.html', {
+            'content_html': mark_safe(entry['html']),
+            'uuid': entry['uuid'],
+            'pending': entry['pending'],
+            'job': entry['job'],
+        })
+    if etag is not None:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Brauzer saqlaydi, lekin har safar tekshiradi (umumiy keshlarda emas)
+        response['Cache-Control'] = 'private, no-cache'
+    return response
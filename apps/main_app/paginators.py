@@ -0,0 +1,68 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# TAXMINIY COUNT (KATTA JADVALLAR UCHUN)
+# ============================================================================
+# Admin har sahifada COUNT(*) bajaradi - PostgreSQL'da bu butun jadvalni
+# o'qishni talab qiladi. Filtrsiz ro'yxat uchun pg_class statistikasi,
+# filtrli ro'yxat uchun vaqt chegarali aniq COUNT, u ulgurmasa EXPLAIN
+# bahosi ishlatiladi. Boshqa bazalarda oddiy COUNT.
+
+
+class EstimatedCountPaginator(Paginator):
+    """Katta jadvallarda COUNT(*) o'rniga taxminiy son"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        try:
+            if not queryset.query.where:
+                estimate = self._table_estimate(queryset, connection)
+                if estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                    return estimate
+            return self._bounded_count(queryset, connection)
+        except DatabaseError as e:
+            logger.warning("⚠️ Taxminiy count xatoligi: %s", e)
+            return self._explain_estimate(queryset, connection)
+
+    def _table_estimate(self, queryset, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return max(int(row[0]), 0) if row else 0
+
+    def _bounded_count(self, queryset, connection):
+        """statement_timeout bilan aniq COUNT; vaqt tugasa EXPLAIN bahosi"""
+        timeout = int(settings.ADMIN_COUNT_TIMEOUT_MS)
+        try:
+            with transaction.atomic(using=queryset.db):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {timeout}")
+                return queryset.count()
+        except DatabaseError:
+            return self._explain_estimate(queryset, connection)
+
+    def _explain_estimate(self, queryset, connection):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
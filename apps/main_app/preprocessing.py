@@ -0,0 +1,152 @@
+import logging
+
+import cv2
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# RASM QAYTA ISHLASH
+# ============================================================================
+# Dekodlashdan model kirishigacha yagona yo'l: uint8 RGB 128x128 -> float32
+# (0-1). float64 oraliq massivlar yaratilmaydi; Keras/TFLite kirishni qayta
+# konvertatsiya qilmaydi.
+
+MODEL_INPUT_SIZE = 128
+INPUT_DTYPE = np.float32
+
+_PIXEL_SCALE = INPUT_DTYPE(255)
+
+# cv2.imdecode kichraytirilgan dekodlash bayroqlari (JPEG'da DCT darajasida
+# 1/2, 1/4, 1/8 o'lchamda dekodlanadi - to'liq rasm xotiraga olinmaydi)
+_REDUCED_DECODE_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+]
+
+
+# Qabul qilinadigan formatlar: fayl boshidagi "magic" baytlar
+IMAGE_SIGNATURES = [
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'BM', 'BMP'),
+]
+
+
+def sniff_image_format(header):
+    """Fayl boshidagi baytlardan format nomi (dekodlashsiz); tanilmasa None"""
+    for signature, name in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return name
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def read_image_header(file):
+    """
+    Fayl obyektidan (format, (eni, bo'yi)) - faqat sarlavha o'qiladi.
+
+    Avval magic baytlar tekshiriladi, keyin PIL sarlavhani o'qiydi (piksellar
+    dekodlanmaydi). Rasm bo'lmasa yoki sarlavha buzilgan bo'lsa None.
+    """
+    from PIL import Image
+
+    try:
+        file.seek(0)
+        image_format = sniff_image_format(file.read(16))
+        if image_format is None:
+            return None
+
+        file.seek(0)
+        with Image.open(file) as img:
+            return image_format, img.size
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+
+
+def get_image_size(data):
+    """Rasm o'lchamini faqat sarlavhadan o'qish (to'liq dekodlashsiz)"""
+    from io import BytesIO
+    from PIL import Image
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def _decode_flag(data):
+    """Rasm o'lchamiga qarab eng kichik yetarli dekodlash darajasini tanlash"""
+    if not settings.IMAGE_REDUCED_DECODE:
+        return cv2.IMREAD_COLOR
+
+    size = get_image_size(data)
+    if size is None:
+        return cv2.IMREAD_COLOR
+
+    # Kichraytirilgan rasm model kirishidan kamida 2 barobar katta qolishi kerak
+    shortest = min(size)
+    for factor, flag in _REDUCED_DECODE_FLAGS:
+        if shortest // factor >= MODEL_INPUT_SIZE * 2:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image_bytes(data):
+    """Baytlardan BGR rasm (katta JPEG'lar kichraytirilgan holda); o'qilmasa None"""
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    return cv2.imdecode(buffer, _decode_flag(data))
+
+
+def resize_for_model(img):
+    """BGR rasmdan model kirishi o'lchamidagi RGB uint8 massiv (normalizatsiyasiz)"""
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    return cv2.resize(img, (MODEL_INPUT_SIZE, MODEL_INPUT_SIZE))
+
+
+def to_model_input(pixels, out=None):
+    """uint8 (H, W, 3) yoki (N, H, W, 3) -> float32 0-1, batch o'qi bilan"""
+    if pixels.ndim == 3:
+        pixels = pixels[np.newaxis]
+    return np.divide(pixels, _PIXEL_SCALE, out=out, dtype=INPUT_DTYPE)
+
+
+def preprocess_image_bytes(data):
+    """Rasmni xotiradagi baytlardan model uchun tayyorlash (diskka yozmasdan)"""
+    try:
+        img = decode_image_bytes(data)
+        if img is None:
+            logger.warning("❌ Rasm o'qilmadi")
+            return None
+
+        img = to_model_input(resize_for_model(img))
+
+        logger.debug("✅ Rasm qayta ishlandi: %s", img.shape)
+        return img
+
+    except Exception as e:
+        logger.warning("❌ Rasm qayta ishlashda xatolik: %s", e)
+        return None
+
+
+def preprocess_image(image_file):
+    """Saqlangan fayldan (FieldFile/UploadedFile) model uchun tayyorlash"""
+    was_closed = image_file.closed
+    image_file.open('rb')
+    try:
+        image_file.seek(0)
+        data = image_file.read()
+    finally:
+        # Yuklangan fayl keyin ImageField orqali saqlanadi - boshiga qaytaramiz
+        if was_closed:
+            image_file.close()
+        else:
+            image_file.seek(0)
+    return preprocess_image_bytes(data)
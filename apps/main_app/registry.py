@@ -0,0 +1,301 @@
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .backends import get_backend_class
+from .batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# MODEL BUNDLE
+# ============================================================================
+class ModelBundle:
+    """
+    Bir-biriga mos model, scaler va versiya.
+
+    Registry butun bundle'ni bitta havola orqali almashtiradi, shuning uchun
+    so'rov olgan model va scaler hech qachon turli versiyalardan bo'lmaydi.
+    Har bir bundle o'z mikro-batcher'iga ega: almashtirilgan bundle yopilganda
+    navbatidagi bashoratlar tugaydi va model xotiradan bo'shaydi.
+    """
+
+    def __init__(self, model=None, scaler_mean=None, scaler_scale=None, version=None):
+        self.model = model
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.version = version
+        self.batcher = MicroBatcher(
+            self.predict,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=settings.INFERENCE_MAX_WAIT_MS
+        )
+
+    def predict(self, images, features_scaled):
+        return self.model.predict(images, features_scaled)
+
+    def close(self):
+        self.batcher.close()
+
+
+def _bundle_attribute(name):
+    """Joriy bundle maydoni (registry.model, registry.scaler_mean, ...)"""
+    return property(
+        lambda self: getattr(self.bundle, name),
+        lambda self, value: setattr(self.bundle, name, value)
+    )
+
+
+# ============================================================================
+# MODEL REGISTRY
+# ============================================================================
+class ModelRegistry:
+    """
+    Model va scaler'ni dangasa (lazy) yuklovchi umumiy registry.
+
+    ``model`` - ``backends`` modulidagi backend obyekti (Keras yoki TFLite),
+    ``predict(images, features)`` interfeysi bilan.
+
+    Model modul import qilinganda emas, birinchi tashxisda (yoki
+    ``warm_up()`` orqali oldindan) yuklanadi, shuning uchun ``migrate``,
+    admin va testlar TensorFlow/Keras narxini to'lamaydi. Gunicorn
+    ``--preload`` bilan master jarayonda ``warm_up()`` chaqirilsa, fork
+    qilingan workerlar og'irliklarni copy-on-write orqali bo'lishadi.
+
+    ``reload()`` yangi artefaktlarni worker'ni to'xtatmasdan yuklaydi va
+    joriy ``bundle`` ni atomik almashtiradi.
+    """
+
+    NOT_LOADED = 'not_loaded'
+    LOADING = 'loading'
+    LOADED = 'loaded'
+    FAILED = 'failed'
+
+    model = _bundle_attribute('model')
+    scaler_mean = _bundle_attribute('scaler_mean')
+    scaler_scale = _bundle_attribute('scaler_scale')
+    version = _bundle_attribute('version')
+
+    def __init__(self, model_path, scaler_mean_path, scaler_scale_path, backend='keras', name='primary'):
+        self.name = name
+        self.backend = backend
+        self.model_path = model_path
+        self.scaler_mean_path = scaler_mean_path
+        self.scaler_scale_path = scaler_scale_path
+
+        self.bundle = ModelBundle()
+
+        self.state = self.NOT_LOADED
+        self.error = None
+        self.load_time = None
+        self.loaded_at = None
+        self.loaded_pid = None
+        self.reload_count = 0
+
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self):
+        return self.state == self.LOADED
+
+    def _after_fork(self):
+        """Fork'dan keyin lock'ni yangilash (ota jarayondagi holat meros qolmasin)"""
+        self._lock = threading.Lock()
+
+    def _load_bundle(self):
+        """Artefaktlarni diskdan yangi bundle'ga yuklash (joriy bundle'ga tegmaydi)"""
+        model = None
+        if os.path.exists(self.model_path):
+            model = get_backend_class(self.backend).load(self.model_path)
+        else:
+            logger.error("❌ Model topilmadi: %s", self.model_path)
+
+        scaler_mean = None
+        if os.path.exists(self.scaler_mean_path):
+            scaler_mean = np.load(self.scaler_mean_path).astype(np.float32)
+            logger.info("✅ Scaler mean yuklandi: %s", scaler_mean.shape)
+        else:
+            logger.error("❌ Scaler mean topilmadi: %s", self.scaler_mean_path)
+
+        scaler_scale = None
+        if os.path.exists(self.scaler_scale_path):
+            scaler_scale = np.load(self.scaler_scale_path).astype(np.float32)
+            logger.info("✅ Scaler scale yuklandi: %s", scaler_scale.shape)
+        else:
+            logger.error("❌ Scaler scale topilmadi: %s", self.scaler_scale_path)
+
+        version = self._compute_version() if model is not None else None
+        return ModelBundle(model, scaler_mean, scaler_scale, version)
+
+    def _swap(self, bundle):
+        """Joriy bundle'ni almashtirish; eskisi navbati tugagach bo'shaydi"""
+        previous, self.bundle = self.bundle, bundle
+        if previous is not bundle:
+            previous.close()
+
+    def load(self, force=False):
+        """Model va scaler'ni yuklash (thread-safe, bir marta)"""
+        if self.state == self.LOADED and not force:
+            return self.model
+
+        with self._lock:
+            if self.state == self.LOADED and not force:
+                return self.model
+
+            self.state = self.LOADING
+            started = time.perf_counter()
+
+            try:
+                logger.info("🚀 Model yuklash boshlandi (%s, %s)", self.name, self.backend)
+
+                bundle = self._load_bundle()
+                self._swap(bundle)
+                self.error = None
+                self.state = self.LOADED if bundle.model is not None else self.FAILED
+                if bundle.model is None:
+                    self.error = f'Model topilmadi: {self.model_path}'
+
+            except Exception as e:
+                logger.exception("❌ Model yuklashda xatolik: %s", e)
+                self._swap(ModelBundle())
+                self.error = str(e)
+                self.state = self.FAILED
+
+            self.load_time = time.perf_counter() - started
+            self.loaded_at = time.time()
+            self.loaded_pid = os.getpid()
+
+            logger.info("⏱ Yuklash vaqti: %.2fs", self.load_time)
+
+            return self.model
+
+    def reload(self, validate=None, force=False):
+        """
+        Artefaktlarni qayta yuklab, joriy bundle'ni atomik almashtirish.
+
+        Yangi model joriysiga tegmasdan yuklanadi va ``validate(bundle)``
+        bilan tekshiriladi (xatolik ko'tarsa almashtirilmaydi). Shu vaqtda
+        so'rovlar eski model bilan bajarilaveradi. Fayllar o'zgarmagan bo'lsa
+        (``force=False``) hech narsa qilinmaydi. Almashtirilsa True qaytaradi.
+        """
+        with self._lock:
+            if not force and self.is_loaded and self._compute_version() == self.version:
+                logger.info("ℹ️ Model o'zgarmagan (%s, %s)", self.name, self.version)
+                return False
+
+            started = time.perf_counter()
+            logger.info("🔄 Modelni qayta yuklash (%s)", self.name)
+
+            bundle = self._load_bundle()
+            if bundle.model is None:
+                raise RuntimeError(f'Model topilmadi: {self.model_path}')
+            if validate is not None:
+                validate(bundle)
+
+            previous = self.version
+            self._swap(bundle)
+            self.error = None
+            self.state = self.LOADED
+            self.load_time = time.perf_counter() - started
+            self.loaded_at = time.time()
+            self.loaded_pid = os.getpid()
+            self.reload_count += 1
+
+            logger.info(
+                "✅ Model almashtirildi (%s): %s -> %s (%.2fs)",
+                self.name, previous, bundle.version, self.load_time
+            )
+            return True
+
+    def _compute_version(self):
+        """Model va scaler fayllari mazmunidan qisqa versiya (SHA-256)"""
+        digest = hashlib.sha256()
+        for path in (self.model_path, self.scaler_mean_path, self.scaler_scale_path):
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(hashlib.file_digest(f, 'sha256').digest())
+        return digest.hexdigest()[:12]
+
+    def get_model(self):
+        """Modelni olish (kerak bo'lsa yuklab)"""
+        if self.state in (self.NOT_LOADED, self.LOADING):
+            self.load()
+        return self.model
+
+    def warm_up(self):
+        """Oldindan yuklash (AppConfig.ready yoki gunicorn --preload uchun)"""
+        return self.load()
+
+    def status(self):
+        """Yuklash holati"""
+        return {
+            'name': self.name,
+            'state': self.state,
+            'backend': self.backend,
+            'version': self.version,
+            'model_path': str(self.model_path),
+            'load_time': self.load_time,
+            'loaded_at': self.loaded_at,
+            'loaded_pid': self.loaded_pid,
+            'current_pid': os.getpid(),
+            'shared_from_parent': self.loaded_pid is not None and self.loaded_pid != os.getpid(),
+            'reload_count': self.reload_count,
+            'error': self.error,
+        }
+
+
+def registry_for(model_dir, name):
+    """Model katalogidan registry (fayl nomlari asosiy model bilan bir xil)"""
+    model_path = settings.TFLITE_MODEL_PATH if settings.INFERENCE_BACKEND == 'tflite' else settings.MODEL_PATH
+    return ModelRegistry(
+        os.path.join(model_dir, os.path.basename(model_path)),
+        os.path.join(model_dir, os.path.basename(settings.SCALER_MEAN_PATH)),
+        os.path.join(model_dir, os.path.basename(settings.SCALER_SCALE_PATH)),
+        backend=settings.INFERENCE_BACKEND,
+        name=name
+    )
+
+
+registry = registry_for(settings.MODEL_DIR, 'primary')
+
+# Nomzod model (MODEL_CANDIDATE_DIR): "shadow" rejimida har bir so'rov fon
+# rejimida qo'shimcha baholanadi, "split" rejimida trafikning bir ulushi
+# nomzodga yo'naltiriladi
+candidate_registry = (
+    registry_for(settings.MODEL_CANDIDATE_DIR, 'candidate')
+    if settings.MODEL_CANDIDATE_DIR else None
+)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=registry._after_fork)
+    if candidate_registry is not None:
+        os.register_at_fork(after_in_child=candidate_registry._after_fork)
+
+
+# ============================================================================
+# TRAFIKNI TAQSIMLASH
+# ============================================================================
+def select_registry():
+    """So'rov uchun model: split rejimida MODEL_CANDIDATE_TRAFFIC ulushi nomzodga"""
+    if (
+        candidate_registry is not None
+        and settings.MODEL_CANDIDATE_MODE == 'split'
+        and random.random() < settings.MODEL_CANDIDATE_TRAFFIC
+        and candidate_registry.get_model() is not None
+    ):
+        return candidate_registry
+    return registry
+
+
+def shadow_registry():
+    """Shadow rejimida nomzod registry, aks holda None"""
+    if candidate_registry is not None and settings.MODEL_CANDIDATE_MODE == 'shadow':
+        return candidate_registry
+    return None
@@ -0,0 +1,225 @@
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ThyroidDiagnosis
+from .preprocessing import INPUT_DTYPE, MODEL_INPUT_SIZE
+from .registry import candidate_registry, registry
+from .services import PATIENT_FIELDS, build_feature_matrix, patient_data_from_record, scale_features
+from .tensors import load_model_input
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# MODELNI QAYTA YUKLASH (WORKER'NI TO'XTATMASDAN)
+# ============================================================================
+# Yangi artefaktlar fon oqimida yuklanadi, oxirgi tashxislardan olingan
+# kichik "canary" to'plamida tekshiriladi va faqat shundan keyin registry
+# bundle'i almashtiriladi. Workerlar model katalogini kuzatadi
+# (MODEL_RELOAD_WATCH); "manage.py reload_model" artefaktlarni tekshirib,
+# katalogdagi reload.trigger faylini yangilaydi.
+
+TRIGGER_NAME = 'reload.trigger'
+
+
+class ModelValidationError(Exception):
+    """Yangi model canary tekshiruvidan o'tmadi"""
+
+
+def trigger_path(model_registry):
+    return os.path.join(os.path.dirname(model_registry.model_path), TRIGGER_NAME)
+
+
+def canary_inputs(samples):
+    """
+    Tekshiruv to'plami: (rasmlar, features, saqlangan bashoratlar).
+
+    Oxirgi tashxislar saqlangan tensorlardan olinadi; baza bo'sh bo'lsa
+    sintetik kirish ishlatiladi (faqat forward pass tekshiriladi).
+    """
+    records = ThyroidDiagnosis.objects.filter(prediction_value__isnull=False).only(
+        'uuid', 'thyroid_image', 'derived_at', 'prediction_value', *PATIENT_FIELDS
+    ).order_by('-created_at')[:samples]
+
+    images, patients, expected = [], [], []
+    for record in records:
+        try:
+            image = load_model_input(record)
+        except OSError:
+            continue
+        if image is None:
+            continue
+        images.append(image)
+        patients.append(patient_data_from_record(record))
+        expected.append(record.prediction_value)
+
+    if not images:
+        return (
+            np.zeros((1, MODEL_INPUT_SIZE, MODEL_INPUT_SIZE, 3), dtype=INPUT_DTYPE),
+            np.zeros((1, len(PATIENT_FIELDS) + 1), dtype=np.float32),
+            None,
+        )
+
+    return (
+        np.concatenate(images),
+        build_feature_matrix(patients),
+        np.asarray(expected, dtype=np.float32),
+    )
+
+
+def validate_bundle(bundle, inputs, max_diff=None):
+    """Bundle'ni canary to'plamida tekshirish; muammo bo'lsa ModelValidationError"""
+    images, features, expected = inputs
+
+    if bundle.scaler_mean is None or bundle.scaler_scale is None:
+        raise ModelValidationError("Scaler fayllari topilmadi")
+    if bundle.scaler_mean.shape[-1] != features.shape[1]:
+        raise ModelValidationError(
+            f"Scaler o'lchami {bundle.scaler_mean.shape[-1]} != {features.shape[1]} features"
+        )
+
+    started = time.perf_counter()
+    predictions = np.asarray(bundle.predict(images, scale_features(features, bundle))).reshape(-1)
+    elapsed = time.perf_counter() - started
+
+    if predictions.shape[0] != images.shape[0]:
+        raise ModelValidationError(
+            f"Bashoratlar soni {predictions.shape[0]} != {images.shape[0]} namuna"
+        )
+    if not np.all(np.isfinite(predictions)) or predictions.min() < 0 or predictions.max() > 1:
+        raise ModelValidationError("Bashoratlar 0-1 oralig'idan tashqarida yoki NaN")
+
+    report = {
+        'version': bundle.version,
+        'samples': len(predictions),
+        'predict_time': elapsed,
+        'max_diff': None,
+        'class_changes': None,
+    }
+    if expected is not None:
+        report['max_diff'] = float(np.max(np.abs(predictions - expected)))
+        report['class_changes'] = int(np.sum((predictions > 0.5) != (expected > 0.5)))
+        if max_diff is not None and report['max_diff'] > max_diff:
+            raise ModelValidationError(
+                f"Saqlangan bashoratlardan farq {report['max_diff']:.4f} > {max_diff}"
+            )
+    return report
+
+
+def reload_model(model_registry, samples, max_diff=None, force=False):
+    """Canary tekshiruvi bilan qayta yuklash: (almashtirildimi, hisobot)"""
+    inputs = canary_inputs(samples)
+    report = {}
+
+    def validate(bundle):
+        report.update(validate_bundle(bundle, inputs, max_diff))
+
+    return model_registry.reload(validate=validate, force=force), report
+
+
+# ============================================================================
+# MODEL KATALOGINI KUZATISH
+# ============================================================================
+class ModelWatcher:
+    """
+    Har bir worker'da model fayllarini (va reload.trigger) kuzatuvchi oqim.
+
+    O'zgarish ikki ketma-ket tekshiruvda bir xil ko'rinsa (fayl yozib
+    bo'lingan), model shu oqimda qayta yuklanadi; so'rovlar to'xtamaydi.
+    Oqim birinchi so'rovda ishga tushadi (``start_on_request``) - management
+    buyruqlari va gunicorn master jarayoni kuzatuv oqimini ishlatmaydi.
+    """
+
+    def __init__(self, registries, interval):
+        self.registries = registries
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._signatures = {}
+
+    def _signature(self, model_registry):
+        paths = (
+            model_registry.model_path,
+            model_registry.scaler_mean_path,
+            model_registry.scaler_scale_path,
+            trigger_path(model_registry),
+        )
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._signatures = {r.name: self._signature(r) for r in self.registries}
+            self._thread = threading.Thread(target=self._run, name='model-watcher', daemon=True)
+            self._thread.start()
+        logger.info("👀 Model katalogi kuzatilmoqda (%ss)", self.interval)
+
+    def _run(self):
+        changed = {}
+        while True:
+            time.sleep(self.interval)
+            for model_registry in self.registries:
+                signature = self._signature(model_registry)
+                if signature == self._signatures[model_registry.name]:
+                    changed.pop(model_registry.name, None)
+                    continue
+                # Fayl hali nusxalanayotgan bo'lishi mumkin - keyingi tekshiruvni kutamiz
+                if changed.get(model_registry.name) != signature:
+                    changed[model_registry.name] = signature
+                    continue
+
+                changed.pop(model_registry.name)
+                # reload.trigger o'zgargan bo'lsa fayllar bir xil bo'lsa ham qayta yuklanadi
+                force = signature[-1] != self._signatures[model_registry.name][-1]
+                self._signatures[model_registry.name] = signature
+                self._reload(model_registry, force)
+
+    def _reload(self, model_registry, force=False):
+        # Hali yuklanmagan model birinchi so'rovda yangi fayllardan yuklanadi
+        if model_registry.state == model_registry.NOT_LOADED:
+            return
+        try:
+            reload_model(
+                model_registry,
+                samples=settings.MODEL_RELOAD_CANARY_SAMPLES,
+                max_diff=settings.MODEL_RELOAD_MAX_DIFF,
+                force=force
+            )
+        except Exception as e:
+            logger.exception("❌ Qayta yuklash bekor qilindi, eski model qoldi (%s): %s", model_registry.name, e)
+        finally:
+            close_old_connections()
+
+    def _after_fork(self):
+        # Oqim fork'dan o'tmaydi: bola jarayon so'rov olsa start_on_request qayta ishga tushiradi
+        self._lock = threading.Lock()
+        self._thread = None
+
+
+model_watcher = ModelWatcher(
+    [r for r in (registry, candidate_registry) if r is not None],
+    interval=settings.MODEL_RELOAD_INTERVAL
+)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=model_watcher._after_fork)
+
+
+def start_on_request(**kwargs):
+    """request_started signali: kuzatuv faqat so'rovlarga xizmat qiladigan jarayonda"""
+    if model_watcher._thread is None:
+        model_watcher.start()
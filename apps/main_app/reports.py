@@ -0,0 +1,206 @@
+import hashlib
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.cache import get_conditional_response
+
+from .models import ThyroidDiagnosis
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# PDF XULOSALAR OMBORI
+# ============================================================================
+# Xulosa har bir tashxis uchun bir marta render qilinadi va MEDIA ichida
+# saqlanadi. Fingerprint - hisobotga kiruvchi maydonlar + shablon versiyasi;
+# ular o'zgarmaguncha qayta yuklab olish oddiy fayl yuborishdan iborat.
+
+REPORT_TEMPLATE = 'diagnosis_pdf.html'
+
+# Hisobotda ko'rinadigan maydonlar (yuklab olish hisoblagichlari kirmaydi)
+REPORT_FIELDS = [
+    'uuid', 'created_at', 'age', 'gender', 'tsh_level', 't3_level', 't4_level',
+    'nodule_size', 'diagnosis', 'diagnosis_detail', 'confidence', 'risk_level',
+    'recommendations',
+]
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_template_hash = None
+
+
+def _load_pdf_renderer():
+    """WeasyPrint (tizim kutubxonalari bo'lmasa - None)"""
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError) as e:
+        logger.warning("⚠️ WeasyPrint mavjud emas, xulosa HTML sifatida saqlanadi: %s", e)
+        return None
+    return HTML
+
+
+def template_version():
+    """Shablon manbasi va REPORT_TEMPLATE_VERSION dan hosil qilingan versiya"""
+    global _template_hash
+
+    if _template_hash is None:
+        source = get_template(REPORT_TEMPLATE).template.source
+        _template_hash = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+    return f"{settings.REPORT_TEMPLATE_VERSION}-{_template_hash}"
+
+
+def report_fingerprint(diagnosis):
+    """Hisobot mazmuni kaliti: maydonlar yoki shablon o'zgarsa - boshqa qiymat"""
+    payload = {field: getattr(diagnosis, field) for field in REPORT_FIELDS}
+    payload['template'] = template_version()
+    data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:32]
+
+
+def is_fresh(diagnosis):
+    """Saqlangan xulosa joriy ma'lumotlarga mos keladimi"""
+    return bool(
+        diagnosis.report_file
+        and diagnosis.report_fingerprint == report_fingerprint(diagnosis)
+        and diagnosis.report_file.storage.exists(diagnosis.report_file.name)
+    )
+
+
+def render_report(diagnosis):
+    """Xulosani render qilish: (bytes, kengaytma)"""
+    html_string = render_to_string(REPORT_TEMPLATE, {
+        'diagnosis': diagnosis,
+        'patient_data': {
+            'age': diagnosis.age,
+            'gender': diagnosis.gender,
+            'tsh': diagnosis.tsh_level,
+            't3': diagnosis.t3_level,
+            't4': diagnosis.t4_level,
+            'nodule_size': diagnosis.nodule_size
+        }
+    })
+
+    HTML = _load_pdf_renderer()
+    if HTML is None:
+        return html_string.encode('utf-8'), 'html'
+
+    return HTML(string=html_string, base_url=str(settings.STATIC_ROOT)).write_pdf(), 'pdf'
+
+
+def ensure_report(diagnosis, force=False):
+    """Xulosa faylini tayyorlash (eskirgan bo'lsa qayta render qilinadi)"""
+    if not force and is_fresh(diagnosis):
+        return diagnosis
+
+    fingerprint = report_fingerprint(diagnosis)
+    content, extension = render_report(diagnosis)
+    content_hash = hashlib.sha256(content).hexdigest()
+
+    old_name = diagnosis.report_file.name if diagnosis.report_file else None
+    diagnosis.report_file.save(
+        f"tashxis_{diagnosis.uuid}_{fingerprint[:8]}.{extension}",
+        ContentFile(content),
+        save=False
+    )
+    diagnosis.report_hash = content_hash
+    diagnosis.report_fingerprint = fingerprint
+
+    # update() - updated_at va yuklab olish maydonlariga tegmaydi
+    ThyroidDiagnosis.objects.filter(pk=diagnosis.pk).update(
+        report_file=diagnosis.report_file.name,
+        report_hash=content_hash,
+        report_fingerprint=fingerprint
+    )
+
+    if old_name and old_name != diagnosis.report_file.name:
+        diagnosis.report_file.storage.delete(old_name)
+
+    logger.info("📄 Xulosa tayyorlandi: %s (%s bayt)", diagnosis.uuid, len(content))
+    return diagnosis
+
+
+def generate_report(diagnosis_id):
+    """Fon worker uchun: tashxis tayyor bo'lsa xulosani oldindan render qilish"""
+    diagnosis = ThyroidDiagnosis.objects.filter(pk=diagnosis_id).first()
+    if diagnosis is None or not diagnosis.diagnosis:
+        return None
+
+    try:
+        return ensure_report(diagnosis)
+    except Exception as e:
+        logger.exception("❌ Xulosa yaratishda xatolik (%s): %s", diagnosis_id, e)
+        return None
+
+
+def _parse_range(header, size):
+    """Bitta 'bytes=a-b' diapazonini (start, end) ga aylantirish; yaroqsiz - None"""
+    match = _RANGE_RE.match(header.strip())
+    if not match or size == 0:
+        return None
+
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        # bytes=-N: oxirgi N bayt
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def serve_report(request, diagnosis):
+    """
+    Saqlangan xulosani yuborish: ETag/If-None-Match (304) va Range (206).
+
+    Qaytaradi: (response, to'liq yuklab olishmi). 304 va davom ettirilgan
+    diapazon so'rovlari yuklab olish sifatida hisoblanmaydi.
+    """
+    etag = f'"{diagnosis.report_hash}"'
+    conditional = get_conditional_response(request, etag=etag)
+    if conditional is not None:
+        return conditional, False
+
+    report = diagnosis.report_file
+    size = report.size
+    content_type = 'application/pdf' if report.name.endswith('.pdf') else 'text/html'
+    filename = f"tashxis_{diagnosis.uuid}.{report.name.rsplit('.', 1)[-1]}"
+
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response, False
+
+        start, end = byte_range
+        with report.open('rb') as f:
+            f.seek(start)
+            response = HttpResponse(f.read(end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        full_download = start == 0
+    else:
+        response = FileResponse(
+            report.open('rb'),
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type
+        )
+        full_download = True
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response, full_download
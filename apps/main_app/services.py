@@ -0,0 +1,290 @@
+import logging
+
+import numpy as np
+from django.conf import settings
+
+from .cache import prediction_cache
+from .drift import drift_monitor
+from .metrics import metrics
+from .preprocessing import preprocess_image
+from .models import ThyroidDiagnosis
+from .registry import registry, select_registry
+from .tensors import load_model_input
+
+logger = logging.getLogger(__name__)
+
+
+# Model kutayotgan 15 ta belgi (features) tartibi bo'yicha bemor maydonlari
+PATIENT_FIELDS = [
+    'age', 'gender', 'country', 'ethnicity', 'family_history',
+    'radiation_exposure', 'iodine_deficiency', 'smoking', 'obesity',
+    'diabetes', 'tsh_level', 't3_level', 't4_level', 'nodule_size',
+]
+
+
+# ============================================================================
+# BASHORAT
+# ============================================================================
+def predict(processed_image, features_scaled, bundle=None):
+    """Bashorat (yoqilgan bo'lsa bundle'ning mikro-batcher'i orqali)"""
+    bundle = bundle or registry.bundle
+    if settings.INFERENCE_BATCHING_ENABLED:
+        return bundle.batcher.predict(processed_image, features_scaled)
+    return bundle.predict(processed_image, features_scaled)
+
+
+# ============================================================================
+# FEATURES
+# ============================================================================
+def get_thyroid_cancer_risk(tsh_level, nodule_size):
+    """Thyroid Cancer Risk hisoblash"""
+    if tsh_level > 4.0 or nodule_size > 2.0:
+        return 2
+    elif tsh_level > 2.5 or nodule_size > 1.5:
+        return 1
+    return 0
+
+
+def patient_data_from_record(record):
+    """ThyroidDiagnosis yozuvidan bemor ma'lumotlari"""
+    return {field: getattr(record, field) for field in PATIENT_FIELDS}
+
+
+def build_feature_matrix(patients):
+    """Bemorlar ro'yxatidan (N, 15) features matritsasi (vektorlashtirilgan)"""
+    columns = {
+        field: np.array([patient[field] for patient in patients])
+        for field in PATIENT_FIELDS
+    }
+
+    tsh_level = columns['tsh_level'].astype(np.float32)
+    nodule_size = columns['nodule_size'].astype(np.float32)
+    # get_thyroid_cancer_risk bilan bir xil qoida
+    thyroid_cancer_risk = np.select(
+        [(tsh_level > 4.0) | (nodule_size > 2.0), (tsh_level > 2.5) | (nodule_size > 1.5)],
+        [2, 1],
+        default=0
+    )
+
+    return np.column_stack([
+        columns['age'],
+        columns['gender'] == 'Erkak',
+        columns['country'],
+        columns['ethnicity'],
+        columns['family_history'],
+        columns['radiation_exposure'],
+        columns['iodine_deficiency'],
+        columns['smoking'],
+        columns['obesity'],
+        columns['diabetes'],
+        tsh_level,
+        columns['t3_level'],
+        columns['t4_level'],
+        nodule_size,
+        thyroid_cancer_risk,
+    ]).astype(np.float32)
+
+
+def build_features(patient):
+    """Bemor ma'lumotlaridan (1, 15) features massivi"""
+    return build_feature_matrix([patient])
+
+
+def scale_features(features, scaler=registry):
+    """StandardScaler (mean/scale) qo'llash (scaler - registry yoki bundle)"""
+    scaler_mean = scaler.scaler_mean
+    scaler_scale = scaler.scaler_scale
+    if scaler_mean is not None and scaler_scale is not None:
+        return (features - scaler_mean) / scaler_scale
+
+    logger.warning("⚠️ Scaler topilmadi")
+    return features
+
+
+# ============================================================================
+# TAVSIYALAR
+# ============================================================================
+def get_recommendations(pred_score, tsh, t3, t4, nodule_size):
+    """Tavsiyalar"""
+    recs = []
+
+    if pred_score > 0.5:
+        recs = [
+            "🚨 Zudlik bilan onkolog va endokrinolog bilan bog'laning",
+            "📋 Biopsiya va CT/MRI tekshiruvlarini o'tkazing",
+            "🔬 To'liq gistologik tahlil qildiring",
+            "💊 Davolanish rejasini tuzib oling"
+        ]
+    else:
+        recs = [
+            "✅ Yaxshi natija, nazoratda bo'ling",
+            "📅 6-12 oyda ultratovush o'tkazing",
+            "👨‍⚕️ Yillik shifokor ko'rigidan o'ting",
+            "🥗 Sog'lom hayot tarzi"
+        ]
+
+    if tsh > 4.0:
+        recs.append("⚠️ TSH yuqori - Gipotiroidizm")
+    elif tsh < 0.4:
+        recs.append("⚠️ TSH past - Gipertiroidizm")
+
+    if nodule_size > 2.0:
+        recs.append("⚠️ Tugun katta - Biopsiya kerak")
+
+    return recs
+
+
+# ============================================================================
+# NATIJA
+# ============================================================================
+def interpret_prediction(pred_value, patient):
+    """Model qiymatidan ThyroidDiagnosis natija maydonlari"""
+    confidence = pred_value * 100 if pred_value > 0.5 else (1 - pred_value) * 100
+
+    if pred_value > 0.5:
+        result = {
+            'diagnosis': "Malignant (Xavfli)",
+            'diagnosis_detail': "Saraton xavfi - Shifokorga murojaat qiling!",
+            'risk_level': "Yuqori",
+            'diagnosis_class': "danger",
+        }
+    else:
+        result = {
+            'diagnosis': "Benign (Xavfsiz)",
+            'diagnosis_detail': "Yaxshi sifatli - Nazoratda bo'ling",
+            'risk_level': "Past",
+            'diagnosis_class': "success",
+        }
+
+    result.update({
+        'confidence': confidence,
+        'prediction_value': pred_value,
+        'recommendations': get_recommendations(
+            pred_value,
+            patient['tsh_level'],
+            patient['t3_level'],
+            patient['t4_level'],
+            patient['nodule_size']
+        ),
+    })
+    return result
+
+
+def diagnose(processed_image, patient, model_registry=None):
+    """Tayyorlangan rasm va bemor ma'lumotlaridan natija maydonlari"""
+    model_registry = model_registry or select_registry()
+    # Bitta so'rov davomida bitta bundle (qayta yuklash paytida ham mos model + scaler)
+    bundle = model_registry.bundle
+
+    with metrics.span('features'):
+        features = build_features(patient)
+
+    # Bir xil rasm + bir xil features + bir xil model -> keshdan
+    cache_key = None
+    pred_value = None
+    if settings.PREDICTION_CACHE_ENABLED:
+        with metrics.span('cache_lookup'):
+            cache_key = prediction_cache.make_key(processed_image, features, bundle.version)
+            pred_value = prediction_cache.get(cache_key)
+
+    if pred_value is None:
+        with metrics.span('scaling'):
+            features_scaled = scale_features(features, bundle)
+        with metrics.span('predict'):
+            prediction = predict(processed_image, features_scaled, bundle)
+        pred_value = float(prediction[0][0])
+        if cache_key is not None:
+            prediction_cache.set(cache_key, pred_value)
+    else:
+        logger.debug("⚡ Bashorat keshdan olindi")
+
+    logger.debug("✅ Natija: %.4f (%s)", pred_value, bundle.version)
+    metrics.inc('thyroid_model_predictions_total', model=model_registry.name)
+    if settings.DRIFT_MONITOR_ENABLED:
+        drift_monitor.record(features, pred_value, bundle)
+    return {
+        **interpret_prediction(pred_value, patient),
+        'model_version': bundle.version,
+    }
+
+
+def diagnose_batch(processed_images, patients, model_registry=None):
+    """Ko'p bemor uchun bitta forward pass: natija maydonlari ro'yxati"""
+    model_registry = model_registry or select_registry()
+    bundle = model_registry.bundle
+
+    with metrics.span('features'):
+        features = build_feature_matrix(patients)
+    with metrics.span('predict'):
+        predictions = np.asarray(
+            bundle.predict(np.concatenate(processed_images), scale_features(features, bundle))
+        ).reshape(-1)
+
+    metrics.inc('thyroid_model_predictions_total', amount=len(patients), model=model_registry.name)
+    if settings.DRIFT_MONITOR_ENABLED:
+        for index, pred_value in enumerate(predictions):
+            drift_monitor.record(features[index:index + 1], pred_value, bundle)
+    return [
+        {
+            **interpret_prediction(float(pred_value), patient),
+            'model_version': bundle.version,
+        }
+        for pred_value, patient in zip(predictions, patients)
+    ]
+
+
+def run_diagnosis(record, progress=None):
+    """Saqlangan yozuv uchun tashxis qo'yish va natijani saqlash"""
+    progress = progress or (lambda value: None)
+
+    if registry.get_model() is None:
+        raise RuntimeError("Model yuklanmagan")
+
+    progress(20)
+    with metrics.span('preprocess'):
+        processed_image = preprocess_image(record.thyroid_image)
+    if processed_image is None:
+        raise ValueError("Rasmni qayta ishlashda xatolik")
+
+    progress(50)
+    result = diagnose(processed_image, patient_data_from_record(record))
+
+    progress(90)
+    for field, value in result.items():
+        setattr(record, field, value)
+    with metrics.span('db_save'):
+        record.save(update_fields=[*result, 'updated_at'])
+    return record
+
+
+# ============================================================================
+# SHADOW BAHOLASH
+# ============================================================================
+def run_shadow(record, model_registry):
+    """
+    Saqlangan yozuvni nomzod model bilan baholash (javob yo'lidan tashqarida).
+
+    Natija faqat ``shadow_*`` maydonlariga yoziladi; foydalanuvchi ko'radigan
+    tashxis o'zgarmaydi.
+    """
+    if model_registry.get_model() is None:
+        logger.warning("⚠️ Nomzod model yuklanmagan: %s", model_registry.error)
+        return None
+    bundle = model_registry.bundle
+
+    processed_image = load_model_input(record)
+    if processed_image is None:
+        return None
+
+    features = scale_features(build_features(patient_data_from_record(record)), bundle)
+    pred_value = float(predict(processed_image, features, bundle)[0][0])
+
+    ThyroidDiagnosis.objects.filter(pk=record.pk).update(
+        shadow_model_version=bundle.version,
+        shadow_prediction_value=pred_value
+    )
+
+    if record.prediction_value is not None:
+        agreement = 'agree' if (pred_value > 0.5) == (record.prediction_value > 0.5) else 'disagree'
+        metrics.inc('thyroid_shadow_predictions_total', agreement=agreement)
+    return pred_value
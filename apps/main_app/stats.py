@@ -0,0 +1,366 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import DailyStat, DailyStatDirtyDay, DailyStatState, ThyroidDiagnosis
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# KUNLIK YIG'MA STATISTIKA (ROLLUP)
+# ============================================================================
+# Dashboard ThyroidDiagnosis jadvalini skanerlamaydi: DailyStat jadvalida har
+# bir (kun, o'lcham, qiymat) uchun tayyor yig'indilar saqlanadi.
+#
+# Invariant: DailyStat = created_at <= DailyStatState.rows_until bo'lgan
+# yozuvlar yig'indisi. Davriy yangilash faqat watermark'dan keyin yaratilgan
+# yozuvlarni o'qiydi va ularni delta sifatida qo'shadi. Watermark'dan oldingi
+# yozuv o'zgarsa (birinchi yuklab olish, asinxron natija, tahrir, o'chirish)
+# uning kuni DailyStatDirtyDay'ga yoziladi va keyingi yangilashda shu kun
+# to'liq qayta hisoblanadi.
+#
+# Barcha o'lchamlar bitta GROUP BY bilan (kun + barcha o'lcham ustunlari)
+# hisoblanadi va Python'da o'lchamlarga yoyiladi.
+#
+# Yangilashni bitta jarayon bajaradi: manage.py rollup_daily_stats (cron
+# yoki --loop bilan alohida jarayon); holat qatori qulflanadi, shu sabab
+# rescore_diagnoses'dagi rollup_days bilan ham ketma-ket ishlaydi.
+
+# ThyroidDiagnosis.age_group bilan bir xil chegaralar
+AGE_GROUPS = [
+    (18, '0-17'),
+    (30, '18-29'),
+    (50, '30-49'),
+    (65, '50-64'),
+]
+AGE_GROUP_OLDEST = '65+'
+
+# Qayta hisoblash bir so'rovda ko'pi bilan shuncha kunni o'qiydi
+ROLLUP_WINDOW_DAYS = 31
+
+# Watermark hozirgi vaqtdan shuncha orqada - hali commit qilinmagan
+# tranzaksiyalardagi yozuvlar o'tkazib yuborilmasligi uchun
+ROW_WATERMARK_LAG = datetime.timedelta(seconds=10)
+
+STAT_FIELDS = ['total', 'diagnosed', 'malignant', 'confidence_sum', 'downloaded']
+
+DIMENSIONS = [dimension for dimension, _ in DailyStat.DIMENSION_CHOICES]
+
+# Bu maydonlar o'zgarsa yozuv kuni qayta hisoblanadi
+SOURCE_FIELDS = {
+    'created_at', 'age', 'gender', 'country', 'ethnicity', 'confidence', 'risk_level',
+    'diagnosis_class', 'prediction_value', 'model_version', 'is_downloaded',
+}
+
+
+def _as_text(value):
+    return '' if value is None else str(value)
+
+
+def _day_start(value):
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+
+def aggregate(queryset):
+    """
+    Yozuvlar yig'indisi bitta GROUP BY bilan: {(kun, o'lcham, qiymat): {maydon: qiymat}}.
+
+    Guruhlar soni yozuvlar sonidan oshmaydi; har bir guruh barcha
+    o'lchamlarga qo'shiladi.
+    """
+    diagnosed = Q(prediction_value__isnull=False)
+    rows = (
+        queryset.annotate(
+            day=TruncDate('created_at'),
+            age_bucket=Case(
+                *[When(age__lt=limit, then=Value(label)) for limit, label in AGE_GROUPS],
+                default=Value(AGE_GROUP_OLDEST),
+            ),
+        )
+        .values(
+            'day', 'diagnosis_class', 'risk_level', 'gender', 'country', 'ethnicity',
+            'age_bucket', 'model_version',
+        )
+        .annotate(
+            total=Count('pk'),
+            diagnosed=Count('pk', filter=diagnosed),
+            malignant=Count('pk', filter=Q(prediction_value__gt=0.5)),
+            confidence_sum=Coalesce(Sum('confidence', filter=diagnosed), 0.0),
+            downloaded=Count('pk', filter=Q(is_downloaded=True)),
+        )
+        .order_by()
+    )
+
+    stats = {}
+    for row in rows:
+        row['all'] = ''
+        row['age_group'] = row['age_bucket']
+        for dimension in DIMENSIONS:
+            key = (row['day'], dimension, _as_text(row[dimension])[:50])
+            current = stats.setdefault(key, dict.fromkeys(STAT_FIELDS, 0))
+            for field in STAT_FIELDS:
+                current[field] += row[field]
+    return stats
+
+
+def _save(stats):
+    DailyStat.objects.bulk_create(
+        [
+            DailyStat(day=day, dimension=dimension, value=value, **fields)
+            for (day, dimension, value), fields in stats.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['day', 'dimension', 'value'],
+        update_fields=[*STAT_FIELDS, 'updated_at'],
+    )
+
+
+def _lock_state():
+    """Holat qatori (qulflangan; tranzaksiya ichida chaqiriladi)"""
+    state, _ = DailyStatState.objects.select_for_update().get_or_create(pk=1)
+    return state
+
+
+def rollup_range(first_day, last_day, until):
+    """[first_day, last_day] kunlarini ``until``gacha yaratilgan yozuvlardan qayta hisoblash"""
+    stats = aggregate(ThyroidDiagnosis.objects.filter(
+        created_at__gte=_day_start(first_day),
+        created_at__lt=_day_start(last_day + datetime.timedelta(days=1)),
+        created_at__lte=until,
+    ))
+    _save(stats)
+
+    # O'chirilgan yozuvlar tufayli yo'qolgan kalitlar
+    existing = DailyStat.objects.filter(
+        day__gte=first_day, day__lte=last_day
+    ).values_list('pk', 'day', 'dimension', 'value')
+    stale = [pk for pk, *key in existing if tuple(key) not in stats]
+    if stale:
+        DailyStat.objects.filter(pk__in=stale).delete()
+    return len(stats)
+
+
+def _rollup_days(days, until):
+    rows = 0
+    first = last = None
+    for day in sorted(set(days)):
+        if first is not None and (
+            day - last > datetime.timedelta(days=1)
+            or (day - first).days >= ROLLUP_WINDOW_DAYS
+        ):
+            rows += rollup_range(first, last, until)
+            first = None
+        if first is None:
+            first = day
+        last = day
+    if first is not None:
+        rows += rollup_range(first, last, until)
+    return rows
+
+
+def rollup_days(days):
+    """Berilgan kunlarni qayta hisoblash (ketma-ket kunlar bitta oraliqda): qatorlar soni"""
+    with transaction.atomic():
+        state = _lock_state()
+        if state.rows_until is None:
+            # Hali yig'ilmagan - birinchi yangilash butun tarixni hisoblaydi
+            return 0
+        return _rollup_days(days, state.rows_until)
+
+
+def mark_days_dirty(days):
+    """Kunlarni keyingi yangilashda qayta hisoblash uchun belgilash"""
+    DailyStatDirtyDay.objects.bulk_create(
+        [DailyStatDirtyDay(day=day) for day in set(days)],
+        ignore_conflicts=True,
+    )
+
+
+def mark_dirty_on_save(sender, instance, created=False, update_fields=None, **kwargs):
+    """post_save/post_delete: mavjud yozuv o'zgarsa (yoki o'chirilsa) uning kuni"""
+    if created or instance.created_at is None:
+        return
+    if update_fields is not None and not SOURCE_FIELDS.intersection(update_fields):
+        return
+    mark_days_dirty([timezone.localtime(instance.created_at).date()])
+
+
+def _history_days(until):
+    first_created = ThyroidDiagnosis.objects.aggregate(first=Min('created_at'))['first']
+    if first_created is None or first_created > until:
+        return []
+    first = timezone.localtime(first_created).date()
+    last = timezone.localtime(until).date()
+    return [first + datetime.timedelta(days=n) for n in range((last - first).days + 1)]
+
+
+def update_daily_stats():
+    """
+    Davriy yangilash: (yangi yozuvlar, qayta hisoblangan kunlar).
+
+    Watermark'dan keyin yaratilgan yozuvlar delta sifatida qo'shiladi,
+    belgilangan kunlar qayta hisoblanadi. Birinchi ishga tushishda butun
+    tarix hisoblanadi.
+    """
+    until = timezone.now() - ROW_WATERMARK_LAG
+    with transaction.atomic():
+        state = _lock_state()
+        if state.rows_until is None:
+            days = _history_days(until)
+            _rollup_days(days, until)
+            DailyStatDirtyDay.objects.all().delete()
+            state.rows_until = until
+            state.save()
+            new_rows = sum(
+                DailyStat.objects.filter(dimension='all').values_list('total', flat=True)
+            )
+            return new_rows, len(days)
+
+        if until <= state.rows_until:
+            return 0, 0
+
+        delta = aggregate(ThyroidDiagnosis.objects.filter(
+            created_at__gt=state.rows_until, created_at__lte=until,
+        ))
+        new_rows = sum(fields['total'] for (_, dimension, _), fields in delta.items() if dimension == 'all')
+        if delta:
+            current = {
+                (stat.day, stat.dimension, stat.value): stat
+                for stat in DailyStat.objects.filter(day__in={day for day, _, _ in delta})
+            }
+            for key, fields in delta.items():
+                stat = current.get(key)
+                if stat is not None:
+                    for field in STAT_FIELDS:
+                        fields[field] += getattr(stat, field)
+            _save(delta)
+        state.rows_until = until
+        state.save()
+
+        # Belgilangan kunlar: shu paytgacha belgilanganlari olinadi,
+        # tranzaksiya davomida belgilanganlari keyingi yangilashda
+        dirty = list(DailyStatDirtyDay.objects.values_list('pk', 'day'))
+        if dirty:
+            _rollup_days([day for _, day in dirty], until)
+            DailyStatDirtyDay.objects.filter(pk__in=[pk for pk, _ in dirty]).delete()
+
+    logger.debug("📊 Statistika yangilandi: %s yangi yozuv, %s kun qayta hisoblandi", new_rows, len(dirty))
+    return new_rows, len(dirty)
+
+
+def refresh_daily_stats(full=False, days=None):
+    """
+    Qo'lda qayta hisoblash: (qayta hisoblangan kunlar, yangilangan qatorlar).
+
+    ``days`` - oxirgi N kun, ``full`` - butun tarix (oylik oynalar bilan).
+    Faqat watermark'gacha yaratilgan yozuvlar o'qiladi; yangilari keyingi
+    update_daily_stats'da qo'shiladi.
+    """
+    with transaction.atomic():
+        state = _lock_state()
+        if state.rows_until is None:
+            state.rows_until = timezone.now() - ROW_WATERMARK_LAG
+            state.save()
+            full = True
+        if full:
+            refresh = _history_days(state.rows_until)
+        else:
+            last = timezone.localtime(state.rows_until).date()
+            refresh = [last - datetime.timedelta(days=n) for n in range(days)]
+        rows = _rollup_days(refresh, state.rows_until)
+
+    logger.debug("📊 Statistika qayta hisoblandi: %s kun, %s qator", len(refresh), rows)
+    return len(refresh), rows
+
+
+def watermark():
+    """Qator darajasidagi watermark (rollup hali ishlamagan bo'lsa - None)"""
+    return DailyStatState.objects.filter(pk=1).values_list('rows_until', flat=True).first()
+
+
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+def value_labels():
+    """O'lcham qiymatlari uchun o'qiladigan nomlar (model choices'dan)"""
+    return {
+        dimension: {str(key): str(label) for key, label in choices}
+        for dimension, choices in (
+            ('diagnosis_class', ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES),
+            ('gender', ThyroidDiagnosis.GENDER_CHOICES),
+            ('country', ThyroidDiagnosis.COUNTRY_CHOICES),
+            ('ethnicity', ThyroidDiagnosis.ETHNICITY_CHOICES),
+        )
+    }
+
+
+def _summarize(total=0, diagnosed=0, malignant=0, confidence_sum=0.0, downloaded=0):
+    return {
+        'total': total,
+        'diagnosed': diagnosed,
+        'malignant': malignant,
+        'malignant_rate': malignant / diagnosed if diagnosed else None,
+        'mean_confidence': confidence_sum / diagnosed if diagnosed else None,
+        'download_rate': downloaded / total if total else None,
+    }
+
+
+def parse_days(value):
+    """?days= parametri (yaroqsiz yoki bo'sh bo'lsa - None, ya'ni standart)"""
+    try:
+        days = int(value or 0)
+    except ValueError:
+        return None
+    return min(days, 366 * 5) if days > 0 else None
+
+
+def dashboard(days=None):
+    """
+    Oxirgi ``days`` kunlik statistika (faqat DailyStat'dan).
+
+    Qaytaradi: umumiy ko'rsatkichlar, kunlik qatorlar va har bir o'lcham
+    bo'yicha qiymatlar kesimi.
+    """
+    days = days or settings.STATS_DASHBOARD_DAYS
+    since = timezone.localdate() - datetime.timedelta(days=days - 1)
+    stats = DailyStat.objects.filter(day__gte=since)
+
+    per_day = [
+        {'day': row['day'], **_summarize(**{field: row[field] for field in STAT_FIELDS})}
+        for row in stats.filter(dimension='all').order_by('-day').values('day', *STAT_FIELDS)
+    ]
+
+    totals = stats.values('dimension', 'value').annotate(
+        **{f'sum_{field}': Sum(field) for field in STAT_FIELDS}
+    ).order_by('dimension', 'value')
+
+    breakdown = {dimension: [] for dimension, _ in DailyStat.DIMENSION_CHOICES if dimension != 'all'}
+    labels = value_labels()
+    overall = _summarize()
+    for row in totals:
+        summary = _summarize(**{field: row[f'sum_{field}'] for field in STAT_FIELDS})
+        if row['dimension'] == 'all':
+            overall = summary
+        elif row['dimension'] in breakdown:
+            breakdown[row['dimension']].append({
+                'value': row['value'],
+                'label': labels.get(row['dimension'], {}).get(row['value'], row['value'] or '-'),
+                **summary,
+            })
+
+    last_updated = stats.aggregate(last=Max('updated_at'))['last']
+    return {
+        'days': days,
+        'since': since,
+        'updated_at': last_updated,
+        'watermark': watermark(),
+        'overall': overall,
+        'per_day': per_day,
+        'breakdown': breakdown,
+    }
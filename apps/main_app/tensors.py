@@ -0,0 +1,145 @@
+import glob
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from . import derivatives
+from .preprocessing import MODEL_INPUT_SIZE, preprocess_image, to_model_input
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# MODEL KIRISHI TENSORLARI OMBORI (MEMMAP SHARDLAR)
+# ============================================================================
+# Qayta baholash va modellarni solishtirishda har safar JPEG dekodlamaslik
+# uchun 128x128x3 uint8 tensorlar shard fayllarga yig'iladi:
+#   shard_00000.npy  - (N, 128, 128, 3) uint8, np.load(mmap_mode='r') bilan
+#   shard_00000.json - [[uuid, rasm nomi], ...] (qator tartibida)
+# Shardlar "manage.py pack_tensors" bilan yoziladi; JSON oxirida yoziladi,
+# shuning uchun o'quvchilar chala shardni ko'rmaydi.
+
+TENSOR_SHAPE = (MODEL_INPUT_SIZE, MODEL_INPUT_SIZE, 3)
+
+
+class TensorStore:
+    """UUID bo'yicha indekslangan memmap shardlar"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index = None
+        self._shards = {}
+
+    def _shard_paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'shard_*.json')))
+
+    def _load_index(self):
+        index = {}
+        for index_path in self._shard_paths():
+            data_path = index_path[:-len('.json')] + '.npy'
+            with open(index_path) as f:
+                for row, (pk, image_name) in enumerate(json.load(f)):
+                    index[pk] = (data_path, row, image_name)
+        return index
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load_index()
+        return self._index
+
+    def refresh(self):
+        """Yangi shardlar yozilgandan keyin indeksni qayta o'qish"""
+        with self._lock:
+            self._index = None
+            self._shards = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def contains(self, pk, image_name=None):
+        entry = self.index.get(str(pk))
+        return entry is not None and (image_name is None or entry[2] == image_name)
+
+    def _shard(self, data_path):
+        shard = self._shards.get(data_path)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(data_path)
+                if shard is None:
+                    shard = np.load(data_path, mmap_mode='r')
+                    self._shards[data_path] = shard
+        return shard
+
+    def get(self, pk, image_name=None):
+        """Tensor (memmap ko'rinishi, nusxa emas); yo'q yoki rasm almashgan bo'lsa None"""
+        entry = self.index.get(str(pk))
+        if entry is None:
+            return None
+
+        data_path, row, stored_name = entry
+        if image_name is not None and stored_name != image_name:
+            return None
+        return self._shard(data_path)[row]
+
+    def write_shard(self, items):
+        """[(uuid, rasm nomi, tensor), ...] ni yangi shard sifatida yozish"""
+        os.makedirs(self.directory, exist_ok=True)
+        number = len(self._shard_paths())
+        base = os.path.join(self.directory, f'shard_{number:05d}')
+        while os.path.exists(base + '.json'):
+            number += 1
+            base = os.path.join(self.directory, f'shard_{number:05d}')
+
+        tmp_path = base + '.tmp.npy'
+        data = np.lib.format.open_memmap(
+            tmp_path, mode='w+', dtype=np.uint8, shape=(len(items), *TENSOR_SHAPE)
+        )
+        for row, (_, _, tensor) in enumerate(items):
+            data[row] = tensor
+        data.flush()
+        del data
+        os.replace(tmp_path, base + '.npy')
+
+        with open(base + '.json.tmp', 'w') as f:
+            json.dump([[str(pk), image_name] for pk, image_name, _ in items], f)
+        os.replace(base + '.json.tmp', base + '.json')
+
+        self.refresh()
+        return base + '.npy'
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.directory, 'shard_*')):
+            os.remove(path)
+        self.refresh()
+
+
+tensor_store = TensorStore(settings.TENSOR_CACHE_DIR)
+
+
+def load_tensor(record):
+    """uint8 tensor: shard -> yozuv yonidagi .npy; topilmasa None"""
+    tensor = tensor_store.get(record.pk, record.thyroid_image.name)
+    if tensor is None:
+        tensor = derivatives.load_tensor(record)
+    return tensor
+
+
+def load_model_input(record):
+    """
+    Model kirishi (1, 128, 128, 3) float32, 0-1 oralig'ida.
+
+    Saqlangan tensor bo'lsa rasm umuman dekodlanmaydi; aks holda asl rasm
+    qayta ishlanadi (preprocess_image bilan bir xil natija).
+    """
+    tensor = load_tensor(record)
+    if tensor is None:
+        return preprocess_image(record.thyroid_image)
+    return to_model_input(tensor)
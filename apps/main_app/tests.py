@@ -1,3 +1,320 @@
-from django.test import TestCase
+import datetime
+import math
+import shutil
+import tempfile
+import uuid
+from types import SimpleNamespace
 
-# Create your tests here.
+import cv2
+import numpy as np
+from django import forms
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .drift import Sketch, psi
+from .forms import validate_image_header
+from .listing import decode_cursor, encode_cursor
+from .metrics import Histogram
+from .models import ThyroidDiagnosis
+from .preprocessing import INPUT_DTYPE, decode_image_bytes, preprocess_image_bytes, resize_for_model
+from .registry import ModelBundle, registry
+from .reports import _parse_range
+from .services import build_feature_matrix, scale_features
+
+
+# ============================================================================
+# YORDAMCHILAR
+# ============================================================================
+class StubModel:
+    """
+    Deterministik model: rasm kanallari o'rtachasi va belgilarning qat'iy
+    og'irliklar bilan chiziqli kombinatsiyasidan sigmoid. Kirish dtype'i
+    saqlanadi - float64 va float32 yo'llar farqi bashoratda ham ko'rinadi.
+    """
+
+    name = 'stub'
+    feature_weights = np.linspace(-1.0, 1.0, 15)
+
+    def predict(self, images, features):
+        images, features = np.asarray(images), np.asarray(features)
+        channels = images.reshape(len(images), -1, images.shape[-1]).mean(axis=1)
+        score = channels @ np.array([0.5, -0.25, 0.75]) + features @ self.feature_weights / 10
+        return (1 / (1 + np.exp(-score))).reshape(-1, 1)
+
+
+def make_jpeg(width=640, height=480, seed=0):
+    rng = np.random.default_rng(seed)
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode('.jpg', image)[1].tobytes()
+
+
+class StubModelMixin:
+    """Registry'ga StubModel o'rnatish va test tugagach asl bundle'ni qaytarish"""
+
+    scaler_mean = np.zeros(15, dtype=np.float32)
+    scaler_scale = np.ones(15, dtype=np.float32)
+
+    def setUp(self):
+        super().setUp()
+        self._bundle, self._state = registry.bundle, registry.state
+        registry.bundle = ModelBundle(StubModel(), self.scaler_mean, self.scaler_scale, 'stub')
+        registry.state = registry.LOADED
+
+    def tearDown(self):
+        registry.bundle.close()
+        registry.bundle, registry.state = self._bundle, self._state
+        super().tearDown()
+
+
+# ============================================================================
+# TASHXIS FORMASI
+# ============================================================================
+@override_settings(
+    DIAGNOSIS_ASYNC=False,
+    DRIFT_MONITOR_ENABLED=False,
+    PREDICTION_CACHE_ENABLED=False,
+    RESULT_PAGE_CACHE_TIMEOUT=0,
+)
+class HomeFormDiagnoseTests(StubModelMixin, TestCase):
+    """Asosiy sahifa (home.html) formasi yuboradigan maydonlar bilan tashxis"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+        super().tearDown()
+
+    def test_home_form_fields_are_enough(self):
+        # Aynan templates/home.html dagi maydonlar: T3, T4, tugun o'lchami,
+        # qolgan ha/yo'q belgilari va izoh yuborilmaydi
+        response = self.client.post(reverse('diagnose'), {
+            'thyroid_image': SimpleUploadedFile('scan.jpg', make_jpeg(), content_type='image/jpeg'),
+            'age': '45',
+            'gender': 'Ayol',
+            'country': '0',
+            'ethnicity': '0',
+            'family_history': 'Ha',
+            'radiation_exposure': "Yo'q",
+            'tsh_level': '2.5',
+        })
+
+        diagnosis = ThyroidDiagnosis.objects.get()
+        self.assertRedirects(
+            response, reverse('diagnosis_detail', kwargs={'uuid': diagnosis.uuid}),
+            fetch_redirect_response=False
+        )
+        self.assertEqual(diagnosis.t3_level, 0.0)
+        self.assertEqual(diagnosis.t4_level, 0.0)
+        self.assertEqual(diagnosis.nodule_size, 0.0)
+        self.assertTrue(diagnosis.family_history)
+        self.assertFalse(diagnosis.radiation_exposure)
+        self.assertFalse(diagnosis.smoking)
+        self.assertIsNotNone(diagnosis.prediction_value)
+
+    def test_missing_required_field_is_rejected(self):
+        response = self.client.post(reverse('diagnose'), {
+            'thyroid_image': SimpleUploadedFile('scan.jpg', make_jpeg(), content_type='image/jpeg'),
+            'age': '45',
+            'gender': 'Ayol',
+            'country': '0',
+            'ethnicity': '0',
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tsh_level', response.json()['errors'])
+        self.assertFalse(ThyroidDiagnosis.objects.exists())
+
+
+# ============================================================================
+# PREPROCESSING PARITETI (float64 -> float32)
+# ============================================================================
+PATIENT = {
+    'age': 52, 'gender': 'Erkak', 'country': 2, 'ethnicity': 3,
+    'family_history': True, 'radiation_exposure': False,
+    'iodine_deficiency': True, 'smoking': False, 'obesity': True,
+    'diabetes': False, 'tsh_level': 4.7, 't3_level': 135.0,
+    't4_level': 9.2, 'nodule_size': 1.8,
+}
+
+
+class PreprocessingParityTests(StubModelMixin, TestCase):
+    """
+    float32 yo'l eski float64 yo'l bilan bir xil natija berishi kerak
+    (manage.py check_preprocessing bilan bir xil taqqoslash).
+
+    Chegaralar: 0-1 oralig'idagi piksellar uchun float32 yaxlitlash xatosi
+    ~6e-8, shuning uchun kirishlar 1e-6, scaler'dan keyingi belgilar va
+    bashoratlar 1e-5 aniqlikda mos kelishi kerak.
+    """
+
+    INPUT_TOLERANCE = 1e-6
+    PREDICTION_TOLERANCE = 1e-5
+
+    scaler_mean = np.linspace(0.5, 60.0, 15).astype(np.float32)
+    scaler_scale = np.linspace(0.3, 25.0, 15).astype(np.float32)
+
+    def legacy_inputs(self, data):
+        """Oldingi yo'l: float64 rasm, float64 scaler"""
+        image = resize_for_model(decode_image_bytes(data)) / 255.0
+        features = build_feature_matrix([PATIENT]).astype(np.float64)
+        mean = registry.scaler_mean.astype(np.float64)
+        scale = registry.scaler_scale.astype(np.float64)
+        return np.expand_dims(image, axis=0), (features - mean) / scale
+
+    def test_inputs_and_predictions_match(self):
+        for width, height, seed in [(640, 480, 0), (1200, 900, 1), (300, 400, 2)]:
+            with self.subTest(size=(width, height)):
+                data = make_jpeg(width, height, seed)
+                legacy_image, legacy_features = self.legacy_inputs(data)
+                image = preprocess_image_bytes(data)
+                features = scale_features(build_feature_matrix([PATIENT]))
+
+                self.assertEqual(legacy_image.dtype, np.float64)
+                self.assertEqual(image.dtype, INPUT_DTYPE)
+                self.assertEqual(image.shape, legacy_image.shape)
+                self.assertTrue(np.allclose(image, legacy_image, rtol=0, atol=self.INPUT_TOLERANCE))
+                self.assertTrue(np.allclose(features, legacy_features, rtol=0, atol=self.PREDICTION_TOLERANCE))
+
+                model = registry.get_model()
+                expected = model.predict(legacy_image, legacy_features)
+                actual = model.predict(image, features)
+                self.assertTrue(np.allclose(actual, expected, rtol=0, atol=self.PREDICTION_TOLERANCE))
+
+
+# ============================================================================
+# YORDAMCHI FUNKSIYALAR
+# ============================================================================
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        diagnosis = SimpleNamespace(
+            created_at=datetime.datetime(2025, 3, 14, 9, 26, 53, 589793, tzinfo=datetime.timezone.utc),
+            uuid=uuid.uuid4(),
+        )
+        cursor = encode_cursor(diagnosis)
+
+        self.assertNotIn('=', cursor)
+        self.assertEqual(decode_cursor(cursor), (diagnosis.created_at, diagnosis.uuid))
+
+    def test_invalid_cursor(self):
+        for value in ['', None, 'not-base64!', 'YWJj', encode_cursor(SimpleNamespace(
+            created_at=timezone.now(), uuid='not-a-uuid'
+        ))]:
+            with self.subTest(value=value):
+                self.assertIsNone(decode_cursor(value))
+
+
+class RangeHeaderTests(SimpleTestCase):
+
+    def test_valid_ranges(self):
+        cases = [
+            ('bytes=0-99', (0, 99)),
+            ('bytes=100-', (100, 999)),
+            ('bytes=-100', (900, 999)),
+            ('bytes=-5000', (0, 999)),
+            ('bytes=990-5000', (990, 999)),
+            (' bytes=0-0 ', (0, 0)),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(_parse_range(header, 1000), expected)
+
+    def test_unsatisfiable_or_malformed(self):
+        for header in ['bytes=1000-', 'bytes=50-10', 'bytes=-', 'bytes=-0', 'bytes=0-1,5-9', 'items=0-1', '']:
+            with self.subTest(header=header):
+                self.assertIsNone(_parse_range(header, 1000))
+        self.assertIsNone(_parse_range('bytes=0-', 0))
+
+
+class DriftSketchTests(SimpleTestCase):
+
+    def test_merge_equals_single_sketch(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(0.3, 1.2, 500)
+
+        left, right, combined = (Sketch.for_feature('tsh_level') for _ in range(3))
+        for value in values[:200]:
+            left.add(value)
+        for value in values[200:]:
+            right.add(value)
+        for value in values:
+            combined.add(value)
+
+        merged = left.merge(right)
+        self.assertEqual(merged.counts.tolist(), combined.counts.tolist())
+        self.assertEqual(merged.count, 500)
+        self.assertAlmostEqual(merged.mean, float(values.mean()))
+        self.assertAlmostEqual(merged.std, float(values.std()))
+
+    def test_out_of_range_values_use_edge_bins(self):
+        sketch = Sketch.for_feature('prediction_value')
+        for value in [-0.5, 0.0, 0.999, 1.0, 7.0]:
+            sketch.add(value)
+
+        self.assertEqual(sketch.counts[0], 1)
+        self.assertEqual(sketch.counts[1], 1)
+        self.assertEqual(sketch.counts[-2], 1)
+        self.assertEqual(sketch.counts[-1], 2)
+
+    def test_psi(self):
+        expected = np.array([0.25, 0.75])
+        self.assertEqual(psi(expected, expected), 0.0)
+        self.assertAlmostEqual(
+            psi(np.array([0.5, 0.5]), expected),
+            0.25 * math.log(2) + 0.25 * math.log(1.5)
+        )
+        # Bo'sh bin'lar cheksizlik bermaydi
+        self.assertTrue(math.isfinite(psi(np.array([1.0, 0.0]), np.array([0.0, 1.0]))))
+
+
+class HistogramQuantileTests(SimpleTestCase):
+
+    def test_interpolates_within_bucket(self):
+        histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+        for value in [0.5, 1.5, 1.5, 3.0]:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(0.25), 1.0)
+        self.assertEqual(histogram.quantile(1.0), 4.0)
+
+    def test_empty_and_overflow(self):
+        histogram = Histogram(buckets=(1.0, 2.0))
+        self.assertEqual(histogram.quantile(0.99), 0.0)
+
+        histogram.observe(50.0)
+        self.assertEqual(histogram.quantile(0.5), 2.0)
+
+
+class ImageHeaderValidationTests(SimpleTestCase):
+
+    def assertRejected(self, data, code):
+        upload = SimpleUploadedFile('scan.jpg', data, content_type='image/jpeg')
+        with self.assertRaises(forms.ValidationError) as context:
+            validate_image_header(upload)
+        self.assertEqual(context.exception.code, code)
+
+    def test_valid_image(self):
+        upload = SimpleUploadedFile('scan.jpg', make_jpeg(), content_type='image/jpeg')
+        validate_image_header(upload)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_not_an_image(self):
+        self.assertRejected(b'%PDF-1.7 not an image', 'invalid_image')
+        self.assertRejected(b'\xff\xd8\xff' + b'\x00' * 64, 'invalid_image')
+
+    def test_dimensions(self):
+        self.assertRejected(make_jpeg(32, 32), 'image_too_small')
+        with override_settings(IMAGE_MAX_DIMENSION=500):
+            self.assertRejected(make_jpeg(640, 480), 'image_too_large')
+
+    @override_settings(UPLOAD_MAX_SIZE=1024)
+    def test_file_too_large(self):
+        self.assertRejected(make_jpeg(), 'file_too_large')
@@ -0,0 +1,73 @@
+import logging
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# YUKLASH HAJMI CHEGARASI (OQIM DAVOMIDA)
+# ============================================================================
+class SizeLimitUploadHandler(FileUploadHandler):
+    """
+    FILE_UPLOAD_HANDLERS ro'yxatida birinchi turadigan handler.
+
+    Fayl xotiraga yoki vaqtinchalik faylga yozilishidan oldin ishlaydi:
+    so'rov Content-Length'i UPLOAD_MAX_REQUEST_SIZE dan katta bo'lsa fayl
+    qismiga yetganda o'qish to'xtatiladi (fayl baytlari umuman o'qilmaydi),
+    aks holda har bir fayl UPLOAD_MAX_SIZE dan oshgan chunk'da to'xtatiladi.
+    Ikkala holatda ``request.upload_too_large`` belgilanadi - view 413 qaytaradi.
+    CSRF tokeni kabi fayldan oldingi maydonlar odatdagidek o'qiladi.
+    View ``upload_limits`` bilan o'z chegaralarini belgilashi mumkin.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.request_size = 0
+        self.received = 0
+        self.max_file_size, self.max_request_size = self._limits()
+
+    def _limits(self):
+        # resolver_match multipart o'qilishidan (CSRF process_view) oldin belgilanadi
+        match = getattr(self.request, 'resolver_match', None)
+        limits = getattr(match.func, 'upload_limits', None) if match is not None else None
+        return limits or (settings.UPLOAD_MAX_SIZE, settings.UPLOAD_MAX_REQUEST_SIZE)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request_size = content_length or 0
+        return None
+
+    def _reject(self, size):
+        logger.warning("⚠️ Yuklash rad etildi: %s bayt", size)
+        if self.request is not None:
+            self.request.upload_too_large = True
+        raise StopUpload(connection_reset=True)
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.received = 0
+
+        if self.request_size > self.max_request_size:
+            self._reject(self.request_size)
+        if content_length is not None and content_length > self.max_file_size:
+            self._reject(content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_file_size:
+            self._reject(self.received)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Faylni keyingi handler (xotira yoki vaqtinchalik fayl) yaratadi
+        return None
+
+
+def upload_limits(max_file_size, max_request_size):
+    """View uchun alohida chegaralar (masalan, ko'p rasmli yoki ZIP so'rovlar)"""
+    def decorator(view):
+        view.upload_limits = (max_file_size, max_request_size)
+        return view
+    return decorator
@@ -1,6 +1,13 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# ASGI ostida async variantlar (settings.ASYNC_VIEWS)
+if settings.ASYNC_VIEWS:
+    from . import async_views as request_views
+else:
+    request_views = views
+
 urlpatterns = [
     # Asosiy sahifa
     path('', views.home, name='home'),
@@ -9,14 +16,29 @@ urlpatterns = [
     path('about/', views.about, name='about'),
 
     # Tashxis qo'yish
-    path('diagnose/', views.diagnose_thyroid, name='diagnose'),
+    path('diagnose/', request_views.diagnose_thyroid, name='diagnose'),
+    path('diagnose/bulk/', views.diagnose_bulk, name='diagnose_bulk'),
 
     # Tashxis detali (UUID bilan)
-    path('diagnosis/<uuid:uuid>/', views.diagnosis_detail, name='diagnosis_detail'),
+    path('diagnosis/<uuid:uuid>/', request_views.diagnosis_detail, name='diagnosis_detail'),
+
+    # Tashxis holati (asinxron rejim)
+    path('diagnosis/<uuid:uuid>/status/', views.diagnosis_status, name='diagnosis_status'),
+
+    # Hosila rasmlar (thumb, web)
+    path('diagnosis/<uuid:uuid>/image/<str:rendition>/', views.diagnosis_image, name='diagnosis_image'),
 
     # Yuklab olish
-    path('diagnosis/<uuid:uuid>/download/', views.download_diagnosis, name='download_diagnosis'),
+    path('diagnosis/<uuid:uuid>/download/', request_views.download_diagnosis, name='download_diagnosis'),
 
     # Ro'yxat (Admin uchun)
     path('diagnoses/', views.diagnosis_list, name='diagnosis_list'),
+    path('diagnoses/export.csv', views.export_diagnoses, name='export_diagnoses'),
+    path('diagnoses/stats/', views.diagnosis_stats, name='diagnosis_stats'),
+
+    # Model holati
+    path('model/status/', views.model_status, name='model_status'),
+
+    # Drift monitoringi
+    path('model/drift/', views.model_drift, name='model_drift'),
 ]
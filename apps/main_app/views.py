@@ -1,131 +1,114 @@
-import numpy as np
-# import tensorflow as tf
-import cv2
-from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, HttpResponse
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+import logging
+
+from django.shortcuts import render, get_object_or_404, redirect
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.conf import settings
 from django.utils import timezone
-from django.template.loader import render_to_string
-import os
-import json
-
-import keras
+from django.db import transaction
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .models import ThyroidDiagnosis, DiagnosisJob
+from .registry import candidate_registry, registry
+from .access import monitoring_access, require_api_token
+from .cache import prediction_cache
+from .downloads import download_counter
+from .forms import DiagnosisForm
+from .metrics import metrics
+from .preprocessing import preprocess_image
+from .services import diagnose, diagnose_batch
+from .uploads import upload_limits
+from . import bulk, derivatives, drift, exports, jobs, listing, page_cache, reports, stats
+
+logger = logging.getLogger(__name__)
 
-from .models import ThyroidDiagnosis
 
 # ============================================================================
-# MODEL VA SCALER YUKLASH
+# YORDAMCHI FUNKSIYALAR
 # ============================================================================
-MODEL_PATH = os.path.join(settings.BASE_DIR, "../thyroid_model", "thyroid_model_full.h5")
-SCALE_MEAN_PATH = os.path.join(settings.BASE_DIR, "../thyroid_model", "scaler_mean.npy")
-SCALE_SCALE_PATH = os.path.join(settings.BASE_DIR, "../thyroid_model", "scaler_scale.npy")
-
-# Global o'zgaruvchilar
-model = None
-scaler_mean = None
-scaler_scale = None
-
-try:
-    print("=" * 70)
-    print("🚀 MODEL YUKLASH BOSHLANDI")
-    print("=" * 70)
-
-    if os.path.exists(MODEL_PATH):
-        try:
-            model = keras.models.load_model(MODEL_PATH)
-            print(f"✅ Model yuklandi: {MODEL_PATH}")
-        except ValueError as ve:
-            print(f"⚠️ Model arxitektura xatoligi: {ve}")
-            print("🔄 Custom loading orqali yuklashga harakat qilinmoqda...")
-            model = keras.models.load_model(MODEL_PATH)
-            model.compile(
-                optimizer='adam',
-                loss='binary_crossentropy',
-                metrics=['accuracy']
-            )
-            print(f"✅ Model custom loading bilan yuklandi")
-    else:
-        print(f"❌ Model topilmadi: {MODEL_PATH}")
+def validate_diagnosis_request(request):
+    """
+    So'rovni fayl yozish va inference'dan oldin tekshirish: (forma, xatolik javobi).
+
+    Katta fayl SizeLimitUploadHandler tomonidan o'qish paytida to'xtatiladi;
+    rasm faqat sarlavhasi bo'yicha tekshiriladi (dekodlashsiz).
+    """
+    files = request.FILES  # multipart shu yerda o'qiladi (upload handlerlar bilan)
+    if getattr(request, 'upload_too_large', False):
+        return None, JsonResponse({
+            'success': False,
+            'error': f"Rasm {settings.UPLOAD_MAX_SIZE // (1024 * 1024)}MB dan kichik bo'lishi kerak"
+        }, status=413)
 
-    if os.path.exists(SCALE_MEAN_PATH):
-        scaler_mean = np.load(SCALE_MEAN_PATH)
-        print(f"✅ Scaler mean yuklandi: {scaler_mean.shape}")
-    else:
-        print(f"❌ Scaler mean topilmadi: {SCALE_MEAN_PATH}")
+    form = DiagnosisForm(request.POST, files)
+    if not form.is_valid():
+        logger.info("⚠️ So'rov rad etildi: %s", form.errors.as_json())
+        return None, JsonResponse({
+            'success': False,
+            'error': form.error_message(),
+            'errors': form.errors.get_json_data(),
+        }, status=400)
 
-    if os.path.exists(SCALE_SCALE_PATH):
-        scaler_scale = np.load(SCALE_SCALE_PATH)
-        print(f"✅ Scaler scale yuklandi: {scaler_scale.shape}")
-    else:
-        print(f"❌ Scaler scale topilmadi: {SCALE_SCALE_PATH}")
+    uploaded_file = form.cleaned_data['thyroid_image']
+    logger.info("📁 Fayl: %s (%s bytes)", uploaded_file.name, uploaded_file.size)
+    return form, None
 
-    print("=" * 70)
-    print()
 
-except Exception as e:
-    print(f"❌ Model yuklashda xatolik: {e}")
-    import traceback
+def model_unavailable_response():
+    logger.error("❌ Model yuklanmagan!")
+    return JsonResponse({
+        'success': False,
+        'error': 'Model yuklanmagan. Dasturchi bilan bog\'laning.'
+    }, status=500)
 
-    print(traceback.format_exc())
 
+def image_error_response():
+    return JsonResponse({
+        'success': False,
+        'error': 'Rasmni qayta ishlashda xatolik'
+    }, status=400)
 
-# ============================================================================
-# RASM QAYTA ISHLASH
-# ============================================================================
-def preprocess_image(image_path):
-    """Rasmni model uchun tayyorlash"""
-    try:
-        img = cv2.imread(image_path)
-        if img is None:
-            print(f"❌ Rasm o'qilmadi: {image_path}")
-            return None
 
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, (128, 128))
-        img = img / 255.0
-        img = np.expand_dims(img, axis=0)
+def create_pending_diagnosis(uploaded_file, patient, notes):
+    """Yozuvni "Kutilmoqda" holatida saqlab, navbatga qo'yish"""
+    with metrics.span('enqueue'), transaction.atomic():
+        diagnosis_record = ThyroidDiagnosis.objects.create(
+            thyroid_image=uploaded_file,
+            notes=notes,
+            **patient
+        )
+        jobs.enqueue(diagnosis_record)
+        jobs.schedule_derivatives(diagnosis_record)
 
-        print(f"✅ Rasm qayta ishlandi: {img.shape}")
-        return img
+    logger.info("⏳ Navbatga qo'yildi: %s", diagnosis_record.uuid)
+    return diagnosis_record
 
-    except Exception as e:
-        print(f"❌ Rasm qayta ishlashda xatolik: {e}")
-        return None
 
+def infer(uploaded_file, patient):
+    """Rasmni xotiradan qayta ishlash va bashorat (rasm yaroqsiz bo'lsa None)"""
+    with metrics.span('preprocess'):
+        processed_image = preprocess_image(uploaded_file)
 
-# ============================================================================
-# TAVSIYALAR
-# ============================================================================
-def get_recommendations(pred_score, tsh, t3, t4, nodule_size):
-    """Tavsiyalar"""
-    recs = []
-
-    if pred_score > 0.5:
-        recs = [
-            "🚨 Zudlik bilan onkolog va endokrinolog bilan bog'laning",
-            "📋 Biopsiya va CT/MRI tekshiruvlarini o'tkazing",
-            "🔬 To'liq gistologik tahlil qildiring",
-            "💊 Davolanish rejasini tuzib oling"
-        ]
-    else:
-        recs = [
-            "✅ Yaxshi natija, nazoratda bo'ling",
-            "📅 6-12 oyda ultratovush o'tkazing",
-            "👨‍⚕️ Yillik shifokor ko'rigidan o'ting",
-            "🥗 Sog'lom hayot tarzi"
-        ]
+    if processed_image is None:
+        return None
 
-    if tsh > 4.0:
-        recs.append("⚠️ TSH yuqori - Gipotiroidizm")
-    elif tsh < 0.4:
-        recs.append("⚠️ TSH past - Gipertiroidizm")
+    return diagnose(processed_image, patient)
 
-    if nodule_size > 2.0:
-        recs.append("⚠️ Tugun katta - Biopsiya kerak")
 
-    return recs
+def record_outcome(response):
+    """So'rov natijasini metrikalarga yozish"""
+    if response.status_code == 503:
+        outcome = 'rejected'
+    elif response.status_code < 400:
+        outcome = 'success'
+    elif response.status_code < 500:
+        outcome = 'client_error'
+    else:
+        outcome = 'error'
+    metrics.inc('thyroid_diagnosis_requests_total', status=outcome)
+    return response
 
 
 # ============================================================================
@@ -141,180 +124,72 @@ def diagnose_thyroid(request):
     if request.method != 'POST':
         return render(request, 'home.html')
 
-    file_name = None
+    with metrics.span('request'):
+        response = _diagnose_thyroid(request)
 
-    try:
-        print("\n" + "=" * 70)
-        print("🏥 YANGI TASHXIS SO'ROVI")
-        print("=" * 70)
+    return record_outcome(response)
 
-        if model is None:
-            print("❌ Model yuklanmagan!")
-            return JsonResponse({
-                'success': False,
-                'error': 'Model yuklanmagan. Dasturchi bilan bog\'laning.'
-            }, status=500)
-
-        if 'thyroid_image' not in request.FILES:
-            return JsonResponse({
-                'success': False,
-                'error': 'Ultratovush rasmini yuklang'
-            }, status=400)
-
-        uploaded_file = request.FILES['thyroid_image']
-        print(f"📁 Fayl: {uploaded_file.name} ({uploaded_file.size} bytes)")
-
-        if uploaded_file.size > 5 * 1024 * 1024:
-            return JsonResponse({
-                'success': False,
-                'error': 'Rasm 5MB dan kichik bo\'lishi kerak'
-            }, status=400)
-
-        # Faylni saqlash
-        file_name = default_storage.save(
-            f'temp/{uploaded_file.name}',
-            ContentFile(uploaded_file.read())
+
+def _diagnose_thyroid(request):
+    try:
+        logger.info("🏥 Yangi tashxis so'rovi")
+
+        # Arzon tekshiruvlar birinchi: yaroqsiz so'rov diskka ham, modelga ham yetmaydi
+        with metrics.span('validate'):
+            form, error = validate_diagnosis_request(request)
+        if error is not None:
+            return error
+
+        uploaded_file = form.cleaned_data['thyroid_image']
+        patient = form.patient_data()
+        notes = form.cleaned_data['notes']
+
+        if not settings.DIAGNOSIS_ASYNC:
+            with metrics.span('model_load'):
+                model = registry.get_model()
+            if model is None:
+                return model_unavailable_response()
+
+        logger.debug(
+            "Yosh: %s, TSH: %s, Tugun: %s",
+            patient['age'], patient['tsh_level'], patient['nodule_size']
         )
-        file_path = default_storage.path(file_name)
-
-        # Rasmni qayta ishlash
-        processed_image = preprocess_image(file_path)
-
-        if processed_image is None:
-            if file_name:
-                default_storage.delete(file_name)
-            return JsonResponse({
-                'success': False,
-                'error': 'Rasmni qayta ishlashda xatolik'
-            }, status=400)
-
-        # Form ma'lumotlari
-        print("\n📝 Ma'lumotlar:")
-        age = int(request.POST.get('age', 0))
-        gender = request.POST.get('gender', 'Erkak')
-        family_history = request.POST.get('family_history') == 'Ha'
-        radiation_exposure = request.POST.get('radiation_exposure') == 'Ha'
-        iodine_deficiency = request.POST.get('iodine_deficiency') == 'Ha'
-        smoking = request.POST.get('smoking') == 'Ha'
-        obesity = request.POST.get('obesity') == 'Ha'
-        diabetes = request.POST.get('diabetes') == 'Ha'
-        tsh_level = float(request.POST.get('tsh_level', 0))
-        t3_level = float(request.POST.get('t3_level', 0))
-        t4_level = float(request.POST.get('t4_level', 0))
-        nodule_size = float(request.POST.get('nodule_size', 0))
-        country = int(request.POST.get('country', 0))
-        ethnicity = int(request.POST.get('ethnicity', 0))
-        notes = request.POST.get('notes', '')
-
-        # Thyroid Cancer Risk hisoblash
-        if tsh_level > 4.0 or nodule_size > 2.0:
-            thyroid_cancer_risk = 2
-        elif tsh_level > 2.5 or nodule_size > 1.5:
-            thyroid_cancer_risk = 1
-        else:
-            thyroid_cancer_risk = 0
-
-        print(f"   Yosh: {age}, TSH: {tsh_level}, Tugun: {nodule_size}, Risk: {thyroid_cancer_risk}")
-
-        # Features
-        gender_numeric = 1 if gender == 'Erkak' else 0
-        features = np.array([[
-            age, gender_numeric, country, ethnicity, int(family_history),
-            int(radiation_exposure), int(iodine_deficiency), int(smoking), int(obesity),
-            int(diabetes), tsh_level, t3_level, t4_level, nodule_size,
-            thyroid_cancer_risk
-        ]], dtype=np.float32)
-
-        # Scaling
-        if scaler_mean is not None and scaler_scale is not None:
-            features_scaled = (features - scaler_mean) / scaler_scale
-            print(f"✅ Features scaled")
-        else:
-            features_scaled = features
-            print("⚠️ Scaler topilmadi")
-
-        # Bashorat
-        print("\n🔮 Bashorat...")
-        print(f"   Rasm shape: {processed_image.shape}")
-        print(f"   Features shape: {features_scaled.shape}")
-
-        prediction = model.predict([processed_image, features_scaled], verbose=0)
-
-        # Vaqtinchalik faylni o'chirish
-        if file_name:
-            default_storage.delete(file_name)
-
-        # Natija
-        pred_value = float(prediction[0][0])
-        confidence = pred_value * 100 if pred_value > 0.5 else (1 - pred_value) * 100
-
-        print(f"✅ Natija: {pred_value:.4f} ({confidence:.2f}%)")
-
-        if pred_value > 0.5:
-            diagnosis = "Malignant (Xavfli)"
-            diagnosis_detail = "Saraton xavfi - Shifokorga murojaat qiling!"
-            risk_level = "Yuqori"
-            diagnosis_class = "danger"
-        else:
-            diagnosis = "Benign (Xavfsiz)"
-            diagnosis_detail = "Yaxshi sifatli - Nazoratda bo'ling"
-            risk_level = "Past"
-            diagnosis_class = "success"
-
-        recommendations = get_recommendations(pred_value, tsh_level, t3_level, t4_level, nodule_size)
+
+        # Asinxron rejim: natija fon worker'ida hisoblanadi
+        if settings.DIAGNOSIS_ASYNC:
+            diagnosis_record = create_pending_diagnosis(uploaded_file, patient, notes)
+            return redirect('diagnosis_detail', uuid=diagnosis_record.uuid)
+
+        # Rasmni qayta ishlash va bashorat
+        result = infer(uploaded_file, patient)
+        if result is None:
+            return image_error_response()
 
         # ============================================================================
-        # DJANGO MODELGA SAQLASH
+        # DJANGO MODELGA SAQLASH (original fayl faqat bir marta yoziladi)
         # ============================================================================
-        diagnosis_record = ThyroidDiagnosis.objects.create(
-            # Rasm
-            thyroid_image=uploaded_file,
-            # Shaxsiy
-            age=age,
-            gender=gender,
-            country=country,
-            ethnicity=ethnicity,
-            # Tibbiy tarix
-            family_history=family_history,
-            radiation_exposure=radiation_exposure,
-            iodine_deficiency=iodine_deficiency,
-            smoking=smoking,
-            obesity=obesity,
-            diabetes=diabetes,
-            # Laboratoriya
-            tsh_level=tsh_level,
-            t3_level=t3_level,
-            t4_level=t4_level,
-            nodule_size=nodule_size,
-            # Qo'shimcha
-            notes=notes,
-            # AI natija
-            diagnosis=diagnosis,
-            diagnosis_detail=diagnosis_detail,
-            confidence=confidence,
-            risk_level=risk_level,
-            diagnosis_class=diagnosis_class,
-            prediction_value=pred_value,
-            recommendations=recommendations
-        )
+        with metrics.span('db_save'):
+            diagnosis_record = ThyroidDiagnosis.objects.create(
+                thyroid_image=uploaded_file,
+                notes=notes,
+                **patient,
+                **result
+            )
 
-        print(f"✅ Ma'lumotlar saqlandi: {diagnosis_record.uuid}")
-        print("✅ Muvaffaqiyatli!\n")
+        logger.info(
+            "✅ Ma'lumotlar saqlandi: %s (%.4f)",
+            diagnosis_record.uuid, diagnosis_record.prediction_value
+        )
+        jobs.schedule_derivatives(diagnosis_record)
+        jobs.schedule_report(diagnosis_record)
+        jobs.schedule_shadow(diagnosis_record)
+        page_cache.warm(diagnosis_record)
 
         # UUID sahifasiga redirect qilish
-        from django.shortcuts import redirect
         return redirect('diagnosis_detail', uuid=diagnosis_record.uuid)
 
     except Exception as e:
-        print(f"❌ Xatolik: {e}")
-        import traceback
-        print(traceback.format_exc())
-
-        if file_name:
-            try:
-                default_storage.delete(file_name)
-            except:
-                pass
+        logger.exception("❌ Xatolik: %s", e)
 
         return JsonResponse({
             'success': False,
@@ -322,67 +197,288 @@ def diagnose_thyroid(request):
         }, status=500)
 
 
+# Ko'p bemorli API: mashina mijozlari uchun (Bearer token, cookie/sessiyasiz),
+# shu sabab CSRF'siz
+@csrf_exempt
+@require_POST
+@require_api_token('BULK_API_TOKENS')
+@upload_limits(settings.BULK_UPLOAD_MAX_SIZE, settings.BULK_UPLOAD_MAX_SIZE)
+def diagnose_bulk(request):
+    """Bir so'rovda ko'p bemor: bitta forward pass, bitta bulk_create"""
+    with metrics.span('request'):
+        response = _diagnose_bulk(request)
+
+    return record_outcome(response)
+
+
+def bulk_error_response(error, status=400, **extra):
+    return JsonResponse({'success': False, 'error': error, **extra}, status=status)
+
+
+def _diagnose_bulk(request):
+    try:
+        files = request.FILES
+        if getattr(request, 'upload_too_large', False):
+            return bulk_error_response(
+                f"So'rov {settings.BULK_UPLOAD_MAX_SIZE // (1024 * 1024)}MB dan kichik bo'lishi kerak",
+                status=413
+            )
+
+        with metrics.span('validate'):
+            try:
+                rows = bulk.read_rows(request)
+                images = bulk.read_images(request)
+                entries, errors = bulk.validate_rows(rows, images)
+            except bulk.BulkError as e:
+                return bulk_error_response(str(e))
+        if errors:
+            return bulk_error_response("Ma'lumotlarda xatolar bor", errors=errors)
+
+        logger.info("🏥 Bulk tashxis so'rovi: %s bemor (%s fayl)", len(entries), len(files))
+
+        with metrics.span('model_load'):
+            model = registry.get_model()
+        if model is None:
+            return model_unavailable_response()
+
+        patients = [patient for patient, _, _ in entries]
+        with metrics.span('preprocess'):
+            processed_images = bulk.preprocess_all([image for _, _, image in entries])
+
+        failed = [index for index, image in enumerate(processed_images) if image is None]
+        if failed:
+            return bulk_error_response("Rasmni qayta ishlashda xatolik", errors=[
+                {'row': index, 'errors': {'image': ["Rasmni qayta ishlashda xatolik"]}}
+                for index in failed
+            ])
+
+        results = diagnose_batch(processed_images, patients)
+
+        records = [
+            ThyroidDiagnosis(thyroid_image=image, notes=notes, **patient, **result)
+            for (patient, notes, image), result in zip(entries, results)
+        ]
+        with metrics.span('db_save'), transaction.atomic():
+            ThyroidDiagnosis.objects.bulk_create(records)
+            for record in records:
+                jobs.schedule_derivatives(record)
+                jobs.schedule_report(record)
+                jobs.schedule_shadow(record)
+
+        logger.info("✅ Bulk: %s ta tashxis saqlandi", len(records))
+        return JsonResponse({
+            'success': True,
+            'count': len(records),
+            'results': [
+                {
+                    'row': index,
+                    'uuid': str(record.uuid),
+                    'url': request.build_absolute_uri(
+                        reverse('diagnosis_detail', kwargs={'uuid': record.uuid})
+                    ),
+                    'diagnosis': record.diagnosis,
+                    'diagnosis_class': record.diagnosis_class,
+                    'risk_level': record.risk_level,
+                    'confidence': record.confidence,
+                    'prediction_value': record.prediction_value,
+                    'model_version': record.model_version,
+                }
+                for index, record in enumerate(records)
+            ],
+        })
+
+    except Exception as e:
+        logger.exception("❌ Bulk xatolik: %s", e)
+        return bulk_error_response(f'Xatolik: {str(e)}', status=500)
+
+
 def diagnosis_detail(request, uuid):
-    """Tashxis detali"""
-    diagnosis = get_object_or_404(ThyroidDiagnosis, uuid=uuid)
+    """Tashxis detali (tayyor natija - keshdan, DB so'rovisiz)"""
+    entry = page_cache.get_entry(uuid)
+    if entry is None:
+        diagnosis = get_object_or_404(ThyroidDiagnosis, uuid=uuid)
+        job = jobs.job_status(diagnosis) if not diagnosis.diagnosis else None
+        entry = page_cache.render_entry(diagnosis, job)
+
+    return page_cache.page_response(request, entry)
 
-    context = {
-        'success': True,
+
+def get_status_data(diagnosis, job):
+    """Status endpoint javobi"""
+    data = {
         'uuid': str(diagnosis.uuid),
-        'diagnosis': diagnosis.diagnosis,
-        'diagnosis_detail': diagnosis.diagnosis_detail,
-        'confidence': diagnosis.confidence,
-        'risk_level': diagnosis.risk_level,
-        'diagnosis_class': diagnosis.diagnosis_class,
-        'recommendations': diagnosis.recommendations,
-        'patient_data': {
-            'age': diagnosis.age,
-            'gender': diagnosis.gender,
-            'tsh': diagnosis.tsh_level,
-            't3': diagnosis.t3_level,
-            't4': diagnosis.t4_level,
-            'nodule_size': diagnosis.nodule_size
-        },
-        'created_at': diagnosis.created_at
+        **job,
+        'ready': bool(diagnosis.diagnosis),
     }
+    if diagnosis.diagnosis:
+        data.update({
+            'diagnosis': diagnosis.diagnosis,
+            'diagnosis_class': diagnosis.diagnosis_class,
+            'confidence': diagnosis.confidence,
+            'risk_level': diagnosis.risk_level,
+        })
+    return data
+
+
+def diagnosis_status(request, uuid):
+    """Tashxis holati (asinxron rejim uchun)"""
+    diagnosis = get_object_or_404(ThyroidDiagnosis, uuid=uuid)
+    return JsonResponse(get_status_data(diagnosis, jobs.job_status(diagnosis)))
 
-    return render(request, 'diagnosis_result.html', context)
+
+def download_response(request, diagnosis):
+    """Xulosa faylini yuborish (kerak bo'lsa birinchi marta render qilinadi)"""
+    if not diagnosis.diagnosis:
+        return redirect('diagnosis_detail', uuid=diagnosis.uuid)
+
+    reports.ensure_report(diagnosis)
+    response, full_download = reports.serve_report(request, diagnosis)
+
+    # Yuklab olish belgilash
+    if full_download:
+        diagnosis.mark_as_downloaded()
+
+    return response
 
 
 def download_diagnosis(request, uuid):
     """Tashxisni yuklab olish (PDF)"""
     diagnosis = get_object_or_404(ThyroidDiagnosis, uuid=uuid)
+    return download_response(request, diagnosis)
 
-    # Yuklab olish belgilash
-    diagnosis.mark_as_downloaded()
-
-    # HTML ni render qilish
-    html_string = render_to_string('diagnosis_pdf.html', {
-        'diagnosis': diagnosis,
-        'patient_data': {
-            'age': diagnosis.age,
-            'gender': diagnosis.gender,
-            'tsh': diagnosis.tsh_level,
-            't3': diagnosis.t3_level,
-            't4': diagnosis.t4_level,
-            'nodule_size': diagnosis.nodule_size
-        }
-    })
 
-    # PDF yaratish uchun WeasyPrint ishlatiladi (keyin o'rnatish kerak)
-    # Hozircha HTML qaytaramiz
-    response = HttpResponse(html_string, content_type='text/html')
-    response['Content-Disposition'] = f'attachment; filename="tashxis_{uuid}.html"'
+def diagnosis_image(request, uuid, rendition):
+    """Hosila rasm (thumbnail/web) - uzoq muddatli kesh bilan"""
+    if rendition not in derivatives.RENDITIONS:
+        raise Http404
+
+    diagnosis = get_object_or_404(
+        ThyroidDiagnosis.objects.only('uuid', 'thyroid_image', 'derived_at'), uuid=uuid
+    )
+    image = diagnosis.thyroid_image
+    name = derivatives.rendition_name(image.name, rendition)
 
+    try:
+        if not diagnosis.derived_at:
+            derivatives.generate_derivatives(diagnosis)
+        file = image.storage.open(name, 'rb')
+    except FileNotFoundError:
+        # Fayl o'chirilgan - qayta yaratamiz
+        derivatives.generate_derivatives(diagnosis, force=True)
+        file = image.storage.open(name, 'rb')
+    except ValueError:
+        raise Http404
+
+    response = FileResponse(file, content_type='image/jpeg')
+    response['Cache-Control'] = f'public, max-age={settings.DERIVED_IMAGE_MAX_AGE}, immutable'
     return response
 
 
 def diagnosis_list(request):
-    """Barcha tashxislar ro'yxati (Admin panel uchun)"""
-    diagnoses = ThyroidDiagnosis.objects.all()[:50]
-    return render(request, 'diagnosis_list.html', {'diagnoses': diagnoses})
+    """Barcha tashxislar ro'yxati (Admin panel uchun, keyset pagination)"""
+    filters = listing.parse_filters(request.GET)
+    diagnoses, next_cursor, prev_cursor = listing.keyset_page(
+        listing.filter_diagnoses(filters),
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        page_size=settings.DIAGNOSIS_LIST_PAGE_SIZE
+    )
+
+    summary = listing.diagnosis_summary(filters)
+    class_counts = [
+        {'value': value, 'label': label, 'count': summary['by_class'].get(value, 0)}
+        for value, label in ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES
+    ]
+
+    return render(request, 'diagnosis_list.html', {
+        'diagnoses': diagnoses,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
+        'filters': filters,
+        'summary': summary,
+        'class_counts': class_counts,
+        'class_choices': ThyroidDiagnosis.DIAGNOSIS_CLASS_CHOICES,
+        'risk_levels': listing.RISK_LEVELS,
+    })
+
+
+@staff_member_required
+def export_diagnoses(request):
+    """Tashxislarni CSV oqimi sifatida eksport (ro'yxat filtrlari bilan)"""
+    filters = listing.parse_filters(request.GET)
+    rows = exports.export_rows(listing.filter_diagnoses(filters))
+
+    filename = f"diagnoses-{timezone.localdate():%Y%m%d}.csv"
+    response = StreamingHttpResponse(exports.iter_csv(rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    logger.info("📤 Eksport: %s", filters or "barcha yozuvlar")
+    return response
+
+
+@staff_member_required
+def diagnosis_stats(request):
+    """Kunlik statistika (JSON, DailyStat yig'indilaridan)"""
+    days = stats.parse_days(request.GET.get('days'))
+    return JsonResponse(stats.dashboard(days))
 
 
 def about(request):
     """Home page"""
-    return render(request, 'about.html')
\ No newline at end of file
+    return render(request, 'about.html')
+
+
+def _runtime_metrics():
+    """Worker holati: model, navbatlar, kesh"""
+    status = registry.status()
+    cache_stats = prediction_cache.stats()
+    for model_registry in (registry, candidate_registry):
+        if model_registry is not None:
+            yield (
+                'thyroid_model_loaded', 'gauge',
+                {'backend': model_registry.backend, 'model': model_registry.name,
+                 'version': model_registry.version or ''},
+                int(model_registry.is_loaded)
+            )
+    yield 'thyroid_model_load_time_seconds', 'gauge', {}, status['load_time'] or 0
+    yield 'thyroid_batcher_queue_depth', 'gauge', {}, registry.bundle.batcher.queue_depth
+    yield 'thyroid_prediction_cache_hits_total', 'counter', {'tier': 'local'}, cache_stats['hits']
+    yield 'thyroid_prediction_cache_hits_total', 'counter', {'tier': 'shared'}, cache_stats['shared_hits']
+    yield 'thyroid_prediction_cache_misses_total', 'counter', {}, cache_stats['misses']
+    yield 'thyroid_prediction_cache_size', 'gauge', {}, cache_stats['size']
+    yield 'thyroid_download_counter_pending', 'gauge', {}, download_counter.pending
+    yield (
+        'thyroid_job_queue_depth', 'gauge', {},
+        DiagnosisJob.objects.filter(status=DiagnosisJob.STATUS_PENDING).count()
+    )
+
+
+metrics.register_collector(_runtime_metrics)
+
+
+@monitoring_access
+def metrics_view(request):
+    """Prometheus metrikalari (joriy worker jarayoni bo'yicha)"""
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@monitoring_access
+def model_status(request):
+    """Model yuklash holati (monitoring uchun)"""
+    return JsonResponse({
+        **registry.status(),
+        'candidate': {
+            **candidate_registry.status(),
+            'mode': settings.MODEL_CANDIDATE_MODE,
+            'traffic': settings.MODEL_CANDIDATE_TRAFFIC,
+        } if candidate_registry is not None else None,
+        'prediction_cache': prediction_cache.stats(),
+    })
+
+
+@staff_member_required
+def model_drift(request):
+    """Kirish belgilari va bashorat taqsimoti drift'i (PSI/KS, monitoring uchun)"""
+    return JsonResponse(drift.drift_report(
+        days=stats.parse_days(request.GET.get('days')),
+        model_version=request.GET.get('model_version')
+    ))
@@ -123,4 +123,195 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Telegram bot
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
\ No newline at end of file
+TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+
+# Logging
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {levelname} [{process}] {name}: {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'apps': {
+            'handlers': ['console'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+
+# ============================================================================
+# AI INFERENCE SOZLAMALARI
+# ============================================================================
+MODEL_DIR = os.getenv('MODEL_DIR', os.path.join(BASE_DIR, '../thyroid_model'))
+MODEL_PATH = os.path.join(MODEL_DIR, 'thyroid_model_full.h5')
+SCALER_MEAN_PATH = os.path.join(MODEL_DIR, 'scaler_mean.npy')
+SCALER_SCALE_PATH = os.path.join(MODEL_DIR, 'scaler_scale.npy')
+TFLITE_MODEL_PATH = os.path.join(MODEL_DIR, 'thyroid_model.tflite')
+
+# Inference backend: 'keras' (.h5) yoki 'tflite' (manage.py export_model bilan
+# tayyorlangan yengil artefakt)
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'keras')
+
+# Modelni ishga tushishda oldindan yuklash (gunicorn --preload bilan workerlar
+# og'irliklarni copy-on-write orqali bo'lishadi). O'chiq bo'lsa - birinchi
+# tashxisda yuklanadi.
+INFERENCE_WARMUP = os.getenv('INFERENCE_WARMUP', 'False').lower() in ('true', '1', 'yes')
+
+# Mikro-batching: parallel so'rovlar bitta model.predict chaqiruviga yig'iladi
+INFERENCE_BATCHING_ENABLED = os.getenv('INFERENCE_BATCHING_ENABLED', 'True').lower() in ('true', '1', 'yes')
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv('INFERENCE_MAX_BATCH_SIZE', 16))
+INFERENCE_MAX_WAIT_MS = float(os.getenv('INFERENCE_MAX_WAIT_MS', 5))
+
+
+# Bashorat keshi: bir xil rasm + features + model versiyasi uchun modelni
+# qayta chaqirmaslik. PREDICTION_CACHE_BACKEND - CACHES dagi alias (masalan,
+# workerlar orasida umumiy Redis/Memcached), bo'sh bo'lsa faqat jarayon ichidagi LRU.
+PREDICTION_CACHE_ENABLED = os.getenv('PREDICTION_CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes')
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', 1024))
+PREDICTION_CACHE_BACKEND = os.getenv('PREDICTION_CACHE_BACKEND') or None
+PREDICTION_CACHE_TIMEOUT = int(os.getenv('PREDICTION_CACHE_TIMEOUT', 24 * 60 * 60))
+
+# Katta JPEG rasmlarni 1/2, 1/4, 1/8 o'lchamda dekodlash (tezroq, kam xotira)
+IMAGE_REDUCED_DECODE = os.getenv('IMAGE_REDUCED_DECODE', 'True').lower() in ('true', '1', 'yes')
+
+# Asinxron tashxis: POST yozuvni "Kutilmoqda" holatida saqlaydi va vazifani
+# lokal worker pool'ga (DB navbati) qo'yadi
+DIAGNOSIS_ASYNC = os.getenv('DIAGNOSIS_ASYNC', 'False').lower() in ('true', '1', 'yes')
+DIAGNOSIS_JOB_WORKERS = int(os.getenv('DIAGNOSIS_JOB_WORKERS', 2))
+DIAGNOSIS_JOB_TIMEOUT = int(os.getenv('DIAGNOSIS_JOB_TIMEOUT', 300))
+DIAGNOSIS_JOB_MAX_ATTEMPTS = int(os.getenv('DIAGNOSIS_JOB_MAX_ATTEMPTS', 3))
+
+# ASGI (uvicorn/daphne) ostida async view'lar: OpenCV va predict cheklangan
+# thread pool'da bajariladi, navbat to'lsa 503 + Retry-After qaytariladi
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() in ('true', '1', 'yes')
+INFERENCE_EXECUTOR_WORKERS = int(os.getenv('INFERENCE_EXECUTOR_WORKERS', os.cpu_count() or 1))
+INFERENCE_EXECUTOR_QUEUE = int(os.getenv('INFERENCE_EXECUTOR_QUEUE', 16))
+INFERENCE_RETRY_AFTER = int(os.getenv('INFERENCE_RETRY_AFTER', 2))
+
+# PDF xulosalar: tashxisdan keyin fon rejimida bir marta render qilinadi va
+# MEDIA/reports ichida saqlanadi. Shablon tubdan o'zgarganda (masalan, statik
+# CSS) REPORT_TEMPLATE_VERSION ni oshirish barcha xulosalarni yangilaydi.
+REPORT_PREGENERATE = os.getenv('REPORT_PREGENERATE', 'True').lower() in ('true', '1', 'yes')
+REPORT_TEMPLATE_VERSION = os.getenv('REPORT_TEMPLATE_VERSION', '1')
+
+# Yuklab olish hisoblagichi: har doim atomik F() bilan. Buferlangan rejimda
+# hisoblar worker xotirasida yig'iladi va har FLUSH_INTERVAL soniyada (yoki
+# MAX_PENDING ta yozuv yig'ilganda) bitta UPDATE bilan yoziladi.
+DOWNLOAD_COUNTER_BUFFERED = os.getenv('DOWNLOAD_COUNTER_BUFFERED', 'False').lower() in ('true', '1', 'yes')
+DOWNLOAD_COUNTER_FLUSH_INTERVAL = float(os.getenv('DOWNLOAD_COUNTER_FLUSH_INTERVAL', 10))
+DOWNLOAD_COUNTER_MAX_PENDING = int(os.getenv('DOWNLOAD_COUNTER_MAX_PENDING', 500))
+
+# Tashxislar ro'yxati: sahifa hajmi va statistika paneli keshi
+DIAGNOSIS_LIST_PAGE_SIZE = int(os.getenv('DIAGNOSIS_LIST_PAGE_SIZE', 50))
+DIAGNOSIS_SUMMARY_CACHE_TIMEOUT = int(os.getenv('DIAGNOSIS_SUMMARY_CACHE_TIMEOUT', 60))
+DIAGNOSIS_SUMMARY_DAYS = int(os.getenv('DIAGNOSIS_SUMMARY_DAYS', 14))
+
+# Admin: jadval shu hajmdan katta bo'lsa filtrsiz ro'yxat uchun pg_class
+# bahosi ishlatiladi; filtrli COUNT shu millisekunddan oshsa EXPLAIN bahosi
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000))
+ADMIN_COUNT_TIMEOUT_MS = int(os.getenv('ADMIN_COUNT_TIMEOUT_MS', 200))
+
+# Hosila rasmlar (thumbnail, web nusxa, 128x128 model kirishi): yuklashdan
+# keyin fon rejimida bir marta yaratiladi va uzoq muddat keshlanadi
+DERIVED_IMAGES_ENABLED = os.getenv('DERIVED_IMAGES_ENABLED', 'True').lower() in ('true', '1', 'yes')
+DERIVED_IMAGE_MAX_AGE = int(os.getenv('DERIVED_IMAGE_MAX_AGE', 365 * 24 * 60 * 60))
+
+# Model kirishi tensorlari shardlari (manage.py pack_tensors): qayta baholash
+# rasmlarni dekodlamasdan np.memmap orqali o'qiydi
+TENSOR_CACHE_DIR = os.getenv('TENSOR_CACHE_DIR', os.path.join(BASE_DIR, '../tensor_cache'))
+
+# Nomzod model (yangi versiyani jonli trafikda sinash). MODEL_CANDIDATE_DIR -
+# asosiy model bilan bir xil fayl nomlari joylashgan katalog.
+#   off    - nomzod ishlatilmaydi
+#   shadow - javob asosiy modeldan, nomzod fon rejimida baholaydi (kechikishsiz)
+#   split  - so'rovlarning MODEL_CANDIDATE_TRAFFIC ulushi (0-1) nomzodga
+MODEL_CANDIDATE_DIR = os.getenv('MODEL_CANDIDATE_DIR', '')
+MODEL_CANDIDATE_MODE = os.getenv('MODEL_CANDIDATE_MODE', 'off')
+MODEL_CANDIDATE_TRAFFIC = float(os.getenv('MODEL_CANDIDATE_TRAFFIC', 0.1))
+
+# Modelni qayta yuklash: workerlar model katalogini (va reload.trigger
+# faylini) har MODEL_RELOAD_INTERVAL soniyada tekshiradi; yangi model
+# oxirgi MODEL_RELOAD_CANARY_SAMPLES ta tashxisda tekshirilgach almashtiriladi.
+# MODEL_RELOAD_MAX_DIFF berilsa, saqlangan bashoratlardan katta farq rad etiladi.
+MODEL_RELOAD_WATCH = os.getenv('MODEL_RELOAD_WATCH', 'False').lower() in ('true', '1', 'yes')
+MODEL_RELOAD_INTERVAL = float(os.getenv('MODEL_RELOAD_INTERVAL', 10))
+MODEL_RELOAD_CANARY_SAMPLES = int(os.getenv('MODEL_RELOAD_CANARY_SAMPLES', 8))
+MODEL_RELOAD_MAX_DIFF = float(os.getenv('MODEL_RELOAD_MAX_DIFF') or 0) or None
+
+# Yuklashni erta rad etish: fayl hajmi upload handler'da o'qish davomida
+# tekshiriladi (chegaradan oshsa qolgan baytlar o'qilmaydi), rasm faqat
+# sarlavhasi bo'yicha (format, o'lcham) tekshiriladi. Chegaradagi fayllar
+# xotirada qoladi - vaqtinchalik faylga yozilmaydi.
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 5 * 1024 * 1024))
+UPLOAD_MAX_REQUEST_SIZE = int(os.getenv('UPLOAD_MAX_REQUEST_SIZE', UPLOAD_MAX_SIZE + 256 * 1024))
+IMAGE_MIN_DIMENSION = int(os.getenv('IMAGE_MIN_DIMENSION', 64))
+IMAGE_MAX_DIMENSION = int(os.getenv('IMAGE_MAX_DIMENSION', 8192))
+
+FILE_UPLOAD_MAX_MEMORY_SIZE = UPLOAD_MAX_REQUEST_SIZE
+FILE_UPLOAD_HANDLERS = [
+    'apps.main_app.uploads.SizeLimitUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Ko'p bemorli API (POST diagnose/bulk/): bir so'rovdagi qatorlar soni,
+# butun so'rov (yoki ZIP arxiv) hajmi va rasmlarni parallel o'qish oqimlari.
+# API faqat BULK_API_TOKENS (vergul bilan) dagi Bearer token bilan ishlaydi;
+# ro'yxat bo'sh bo'lsa endpoint o'chirilgan
+BULK_API_TOKENS = [token.strip() for token in os.getenv('BULK_API_TOKENS', '').split(',') if token.strip()]
+BULK_DIAGNOSIS_MAX_ROWS = int(os.getenv('BULK_DIAGNOSIS_MAX_ROWS', 64))
+BULK_UPLOAD_MAX_SIZE = int(os.getenv('BULK_UPLOAD_MAX_SIZE', 25 * 1024 * 1024))
+BULK_PREPROCESS_WORKERS = int(os.getenv('BULK_PREPROCESS_WORKERS', os.cpu_count() or 1))
+
+# Eksport (diagnoses/export.csv va manage.py export_diagnoses): queryset
+# shu hajmdagi bo'laklarda o'qiladi (PostgreSQL'da server kursori).
+# Parquet/Arrow fayllar uchun pyarrow o'rnatilgan bo'lishi kerak.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Monitoring endpointlari (metrics/, model/status/): staff sessiyasi,
+# MONITORING_TOKENS (vergul bilan) dagi Bearer token yoki
+# MONITORING_ALLOWED_IPS (vergul bilan; manzil yoki tarmoq, masalan
+# 10.0.0.0/8) dagi so'rovlar uchun ochiq
+MONITORING_TOKENS = [token.strip() for token in os.getenv('MONITORING_TOKENS', '').split(',') if token.strip()]
+MONITORING_ALLOWED_IPS = [
+    network.strip() for network in os.getenv('MONITORING_ALLOWED_IPS', '').split(',') if network.strip()
+]
+
+# Kunlik yig'ma statistika (DailyStat): bitta jarayonda - cron orqali
+# manage.py rollup_daily_stats yoki rollup_daily_stats --loop (har
+# STATS_ROLLUP_INTERVAL soniyada) - yangilanadi: yangi yozuvlar qo'shiladi,
+# o'zgargan yozuvlar (yuklab olish, asinxron natija) kunlari qayta hisoblanadi.
+STATS_ROLLUP_INTERVAL = int(os.getenv('STATS_ROLLUP_INTERVAL', 60))
+STATS_DASHBOARD_DAYS = int(os.getenv('STATS_DASHBOARD_DAYS', 30))
+
+# Drift monitoringi: tashxislardagi TSH/T3/T4/tugun (scaler z-fazosida) va
+# bashorat qiymati gistogrammalari worker xotirasida yig'ilib, har
+# DRIFT_FLUSH_INTERVAL soniyada kunlik DriftSketch qatorlariga qo'shiladi.
+# Hisobot oxirgi DRIFT_WINDOW_DAYS kunni mos yozuv bilan solishtiradi
+# (PSI: < WARNING - barqaror, >= ALERT - drift; kamida DRIFT_MIN_SAMPLES ta).
+DRIFT_MONITOR_ENABLED = os.getenv('DRIFT_MONITOR_ENABLED', 'True').lower() in ('true', '1', 'yes')
+DRIFT_FLUSH_INTERVAL = int(os.getenv('DRIFT_FLUSH_INTERVAL', 10))
+DRIFT_WINDOW_DAYS = int(os.getenv('DRIFT_WINDOW_DAYS', 7))
+DRIFT_MIN_SAMPLES = int(os.getenv('DRIFT_MIN_SAMPLES', 100))
+DRIFT_PSI_WARNING = float(os.getenv('DRIFT_PSI_WARNING', 0.1))
+DRIFT_PSI_ALERT = float(os.getenv('DRIFT_PSI_ALERT', 0.25))
+
+# Natija sahifasi (diagnosis_detail) mazmuni uuid + til bo'yicha default
+# cache'da shuncha soniya saqlanadi (0 - o'chirilgan); yozuv saqlanganda
+# o'chiriladi. LocMemCache har bir jarayonda alohida - bir nechta worker
+# bo'lsa umumiy (Redis/Memcached) cache tavsiya etiladi, aks holda boshqa
+# jarayondagi o'zgarish shu muddat ichida ko'rinmasligi mumkin.
+RESULT_PAGE_CACHE_TIMEOUT = int(os.getenv('RESULT_PAGE_CACHE_TIMEOUT', 60 * 60))
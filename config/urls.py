@@ -6,14 +6,17 @@ from django.conf.urls.i18n import i18n_patterns
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.main_app import views as main_views
+
 # Admin custom
 admin.site.site_title = "Admin"
 admin.site.site_header = "Tames.Uz"
 admin.site.index_title = "Dashboard"
 
-# Til almashtirgich URL (i18n patternsdan tashqarida)
+# Til almashtirgich va metrikalar URL (i18n patternsdan tashqarida)
 urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
+    path('metrics/', main_views.metrics_view, name='metrics'),
 ]
 
 # Ko'p tillik URL'lar